@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Directory layout of the app fleet
+
+The fleet started out flat, apps/app01 ... apps/app100, which is fine for a
+hundred apps but not for ten thousand: every lookup and listing goes through
+one huge directory, and two-digit names sort app100 before app11. A fleet
+can instead be laid out in buckets:
+  - flat        apps/app01                 (the default)
+  - bucketed    apps/b00/app00001          bucket = num // bucket_size
+  - hashed      apps/3f/app00001           bucket = first byte of sha1(name)
+Bucketed keeps neighbouring apps together and the listing in number order;
+hashed spreads sparse or clustered numbers evenly.
+
+The layout of a tree is recorded in apps/.layout.json, so every script
+agrees on it. Without that file $GLOVEN_LAYOUT ("bucketed", "hashed:6",
+"bucketed:5:1000" as mode[:width[:bucket_size]]) applies, and otherwise the
+flat two-digit layout. The ID width is part of each app's name and package id
+(org.gloven.app00001), so it is chosen when a fleet is created and never
+changed by migrate.
+
+Usage:
+    app_layout.py show
+    app_layout.py list
+    app_layout.py path <app_number>
+    app_layout.py migrate --mode bucketed|hashed|flat [--bucket-size 1000]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+APPS_DIR = Path("apps")
+LAYOUT_FILE = ".layout.json"
+LAYOUT_ENV = "GLOVEN_LAYOUT"
+MODES = ("flat", "bucketed", "hashed")
+
+APP_NAME_RE = re.compile(r'^app(\d+)$')
+# apps/appNN/... or apps/<bucket>/appNN/...
+APP_PATH_RE = re.compile(r'^apps/(?:[^/]+/)?(app\d+)/(.*)$')
+
+Layout = namedtuple("Layout", ["mode", "width", "bucket_size"])
+
+FLAT = Layout("flat", 2, 0)
+DEFAULT_WIDTH = 5
+DEFAULT_BUCKET_SIZE = 1000
+
+def parse_spec(spec):
+    """'bucketed:5:1000' -> Layout; omitted fields take the defaults"""
+    mode, *rest = spec.split(":")
+    if mode not in MODES:
+        raise ValueError(f"unknown layout {mode!r} (expected one of {', '.join(MODES)})")
+    if mode == "flat":
+        width = int(rest[0]) if rest else FLAT.width
+        return Layout(mode, width, 0)
+    width = int(rest[0]) if rest else DEFAULT_WIDTH
+    bucket_size = int(rest[1]) if len(rest) > 1 else DEFAULT_BUCKET_SIZE
+    if mode == "bucketed" and bucket_size < 1:
+        raise ValueError("bucket size must be at least 1")
+    return Layout(mode, width, bucket_size if mode == "bucketed" else 0)
+
+_layouts = {}
+
+def load_layout(apps_dir=APPS_DIR):
+    """Layout of a tree: apps/.layout.json, else $GLOVEN_LAYOUT, else flat"""
+    key = os.path.abspath(apps_dir)
+    layout = _layouts.get(key)
+    if layout is None:
+        try:
+            with open(Path(apps_dir) / LAYOUT_FILE, 'r') as f:
+                layout = Layout(**json.load(f))
+        except FileNotFoundError:
+            spec = os.environ.get(LAYOUT_ENV)
+            layout = parse_spec(spec) if spec else FLAT
+        _layouts[key] = layout
+    return layout
+
+def save_layout(layout, apps_dir=APPS_DIR):
+    """Record the layout of a tree atomically"""
+    apps_dir = Path(apps_dir)
+    apps_dir.mkdir(parents=True, exist_ok=True)
+    path = apps_dir / LAYOUT_FILE
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(layout._asdict(), f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+    _layouts[os.path.abspath(apps_dir)] = layout
+
+def app_name(num, layout=None):
+    """Name of app number num (app01, app00001, ...)"""
+    layout = layout or load_layout()
+    return f"app{num:0{layout.width}d}"
+
+def app_number(name):
+    """App number of an app name, or None if it is not one"""
+    match = APP_NAME_RE.match(name)
+    return int(match.group(1)) if match else None
+
+def bucket(name, layout):
+    """Bucket directory of an app, or None in the flat layout"""
+    if layout.mode == "bucketed":
+        buckets = (10 ** layout.width - 1) // layout.bucket_size
+        return f"b{app_number(name) // layout.bucket_size:0{len(str(buckets))}d}"
+    if layout.mode == "hashed":
+        return hashlib.sha1(name.encode()).hexdigest()[:2]
+    return None
+
+def app_dir(name, apps_dir=APPS_DIR, layout=None):
+    """Directory of an app by name"""
+    layout = layout or load_layout(apps_dir)
+    shard = bucket(name, layout)
+    return Path(apps_dir) / shard / name if shard else Path(apps_dir) / name
+
+def split_app_path(path):
+    """'apps/b00/app00001/lib/main.dart' -> ('app00001', 'lib/main.dart'), or None"""
+    match = APP_PATH_RE.match(path)
+    return match.groups() if match else None
+
+def _app_entries(directory):
+    """App directories directly under directory, in number order"""
+    try:
+        with os.scandir(directory) as entries:
+            apps = [(app_number(e.name), e.path) for e in entries
+                    if APP_NAME_RE.match(e.name) and e.is_dir()]
+    except FileNotFoundError:
+        return []
+    return [Path(path) for _, path in sorted(apps)]
+
+def iter_app_dirs(apps_dir=APPS_DIR, layout=None):
+    """Yield every app directory of a tree, one directory listing at a time
+
+    Flat and bucketed trees come out in number order; hashed trees in
+    number order within each bucket.
+    """
+    layout = layout or load_layout(apps_dir)
+    if layout.mode == "flat":
+        yield from _app_entries(apps_dir)
+        return
+    try:
+        with os.scandir(apps_dir) as entries:
+            # b9 before b10 when numbers outgrow the ID width
+            buckets = sorted((len(e.name), e.name, e.path) for e in entries
+                             if e.is_dir() and not e.name.startswith("."))
+    except FileNotFoundError:
+        return
+    for _, _, path in buckets:
+        yield from _app_entries(path)
+
+def list_app_dirs(apps_dir=APPS_DIR, layout=None):
+    """Every app directory of a tree (see iter_app_dirs)"""
+    return list(iter_app_dirs(apps_dir, layout))
+
+def migrate(layout, apps_dir=APPS_DIR):
+    """Move every app of a tree into a new layout; returns the number moved"""
+    apps_dir = Path(apps_dir)
+    current = load_layout(apps_dir)
+    if layout.width != current.width:
+        raise ValueError(f"ID width is part of every app's package id; "
+                         f"the tree uses {current.width} digits")
+    moved = 0
+    for source in list_app_dirs(apps_dir, current):
+        target = app_dir(source.name, apps_dir, layout)
+        if source == target:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(source, target)
+        moved += 1
+        if source.parent != apps_dir and not any(source.parent.iterdir()):
+            source.parent.rmdir()
+    save_layout(layout, apps_dir)
+    return moved
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or change the app directory layout")
+    parser.add_argument("command", choices=("show", "list", "path", "migrate"))
+    parser.add_argument("app_number", nargs="?", type=int, help="App number for path")
+    parser.add_argument("--apps-dir", default=str(APPS_DIR))
+    parser.add_argument("--mode", choices=MODES, help="Layout to migrate to")
+    parser.add_argument("--bucket-size", type=int, default=DEFAULT_BUCKET_SIZE,
+                        help="Apps per bucket in the bucketed layout (default: %(default)s)")
+    args = parser.parse_args()
+
+    layout = load_layout(args.apps_dir)
+    if args.command == "show":
+        count = sum(1 for _ in iter_app_dirs(args.apps_dir, layout))
+        print(f"{layout.mode}, {layout.width}-digit IDs"
+              + (f", {layout.bucket_size} apps per bucket" if layout.mode == "bucketed" else "")
+              + f": {count} apps in {args.apps_dir}")
+    elif args.command == "list":
+        # One app directory per line, for shell loops
+        for path in iter_app_dirs(args.apps_dir, layout):
+            print(path.as_posix())
+    elif args.command == "path":
+        if args.app_number is None:
+            parser.error("path needs an app number")
+        # One line the shell scripts read as "NAME DIR"
+        name = app_name(args.app_number, layout)
+        print(name, app_dir(name, args.apps_dir, layout).as_posix())
+    else:
+        if args.mode is None:
+            parser.error("migrate needs --mode")
+        new_layout = Layout(args.mode, layout.width, args.bucket_size if args.mode == "bucketed" else 0)
+        try:
+            moved = migrate(new_layout, args.apps_dir)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ Moved {moved} apps into the {args.mode} layout")
+
+if __name__ == "__main__":
+    main()
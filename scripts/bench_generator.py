@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pure-Python generator stages on synthetic catalogs
+
+Synthetic catalogs in the shape of ALL_GAMES (num, name, type, instructions,
+cycling through the real catalog's games) are generated at several sizes
+into a scratch directory, on tmpfs (/dev/shm) when available. `flutter
+create` is stubbed by stamping each app from a seed app's pubspec.yaml,
+build.gradle.kts and launcher icons. Then every app goes through the
+stages of create_complete_game_app that do not need Flutter:
+  - stub_create      seed files written with the app's name
+  - pubspec          pub_workspace.update_app_pubspec
+  - gradle_patch     update_build_gradle
+  - template_sync    template_sync.sync_app
+  - render           screens and main.dart rendered in memory
+  - write            rendered files written
+After that the whole fleet is indexed by fleet_inventory, cold and then
+warm.
+
+Each size runs in a fresh process, so peak RSS is per size. The report is
+JSON with throughput (apps/s), peak RSS and per-stage medians. --compare
+prints the change against an earlier report. --layout lays the synthetic
+fleet out like app_layout.py would (e.g. bucketed:5:1000).
+
+Usage:
+    bench_generator.py [--sizes 100,1000,10000] [--layout SPEC] [--out bench.json] [--compare old.json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app_layout
+import create_complete_game_app as generator
+import fleet_inventory
+import fleet_walk
+import game_catalog
+import pub_workspace
+import template_sync
+from update_build_gradle import update_build_gradle
+
+REPO_DIR = Path(__file__).parent.parent
+TEMPLATE_LIB = REPO_DIR / template_sync.TEMPLATE_LIB
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_SEED_APP = REPO_DIR / "apps" / "app01"
+SEED_FILES = ("pubspec.yaml", fleet_inventory.BUILD_GRADLE)
+APP_STAGES = ("stub_create", "pubspec", "gradle_patch", "template_sync", "render", "write")
+
+def synthetic_catalog(size):
+    """size game dicts cycling through the real catalog, with unique names"""
+    games = game_catalog.game_dicts()
+    catalog = []
+    for num, game in zip(range(1, size + 1), itertools.cycle(games)):
+        lap = (num - 1) // len(games)
+        catalog.append({
+            "num": num,
+            "name": game["name"] if lap == 0 else f"{game['name']} {lap + 1}",
+            "type": game["type"],
+            "instructions": list(game["instructions"]),
+        })
+    return catalog
+
+def load_seed(seed_app):
+    """{relative path: bytes} of the files an app is stamped from"""
+    seed_app = Path(seed_app)
+    files = {rel: (seed_app / rel).read_bytes() for rel in SEED_FILES}
+    for rel in fleet_inventory.icon_files(seed_app):
+        files[rel] = (seed_app / rel).read_bytes()
+    return files
+
+def stub_create(app_dir, app_name, seed, seed_name):
+    """Stand-in for `flutter create`: write the seed files renamed"""
+    old, new = seed_name.encode(), app_name.encode()
+    for rel, data in seed.items():
+        dest = app_dir / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data.replace(old, new) if not rel.endswith(".png") else data)
+
+def generate_app(game, seed, seed_name, timings, hashes):
+    """Run every benchmarked stage for one app, appending seconds to timings"""
+    app_name = app_layout.app_name(game["num"])
+    app_dir = app_layout.app_dir(app_name)
+
+    def timed(stage, func, *args):
+        started = time.perf_counter()
+        value = func(*args)
+        timings[stage].append(time.perf_counter() - started)
+        return value
+
+    timed("stub_create", stub_create, app_dir, app_name, seed, seed_name)
+    timed("pubspec", pub_workspace.update_app_pubspec, app_dir / "pubspec.yaml")
+    timed("gradle_patch", update_build_gradle, app_dir / fleet_inventory.BUILD_GRADLE,
+          f"org.gloven.{app_name}")
+    timed("template_sync", template_sync.sync_app, app_dir, TEMPLATE_LIB,
+          template_sync.SHARED_SUBDIRS, False, hashes)
+
+    def render():
+        files = {f"screens/{name}": code for name, code in generator.render_game_screens(
+            game["name"], game["type"], game["instructions"], game["num"]).items()}
+        files["main.dart"] = generator.render_main_dart(game["name"], game["type"], game["instructions"])
+        return files
+
+    def write(files):
+        for rel, code in files.items():
+            template_sync.write_text_if_changed(app_dir / "lib" / rel, code)
+
+    timed("write", write, timed("render", render))
+
+def run_size(size, seed_app):
+    """Benchmark one catalog size in the current directory; returns its report"""
+    seed = load_seed(seed_app)
+    catalog = synthetic_catalog(size)
+    timings = {stage: [] for stage in APP_STAGES}
+    hashes = fleet_walk.HashCache(Path(".file_hashes.json"))
+
+    started = time.perf_counter()
+    for game in catalog:
+        generate_app(game, seed, Path(seed_app).name, timings, hashes)
+    generation = time.perf_counter() - started
+
+    index_path = Path(".fleet_inventory.json")
+    started = time.perf_counter()
+    fleet_inventory.refresh_index("apps", index_path, rebuild=True)
+    cold_scan = time.perf_counter() - started
+    started = time.perf_counter()
+    fleet_inventory.refresh_index("apps", index_path)
+    warm_scan = time.perf_counter() - started
+
+    return {
+        "apps": size,
+        "apps_per_s": round(size / generation, 1),
+        "generation_s": round(generation, 3),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "stages": {
+            stage: {
+                "median_ms": round(statistics.median(values) * 1000, 4),
+                "total_s": round(sum(values), 3),
+            }
+            for stage, values in timings.items()
+        },
+        "inventory": {"cold_s": round(cold_scan, 3), "warm_s": round(warm_scan, 3)},
+    }
+
+def scratch_root():
+    """tmpfs if available, so disk speed does not dominate"""
+    shm = Path("/dev/shm")
+    return shm if shm.is_dir() and os.access(shm, os.W_OK) else None
+
+def run_isolated(size, seed_app, target_root=None, layout=None):
+    """Benchmark one size in a fresh process and scratch directory"""
+    work = Path(tempfile.mkdtemp(prefix=f"gloven-bench-{size}-", dir=target_root or scratch_root()))
+    env = dict(os.environ)
+    env.pop(app_layout.LAYOUT_ENV, None)
+    if layout:
+        env[app_layout.LAYOUT_ENV] = layout
+    try:
+        result = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--single", str(size),
+             "--seed-app", str(Path(seed_app).resolve())],
+            cwd=work, capture_output=True, text=True, env=env
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{size} apps failed:\n{result.stderr[-2000:]}")
+        report = json.loads(result.stdout)
+        report["target"] = str(work.parent)
+        return report
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _change(before, after):
+    return f"{(after - before) / before:+.1%}" if before else "n/a"
+
+def compare(old, new):
+    """Lines describing the change from an old report to a new one"""
+    old_sizes = {r["apps"]: r for r in old["results"]}
+    lines = [f"Compared with {old.get('commit') or 'previous run'}:"]
+    for result in new["results"]:
+        before = old_sizes.get(result["apps"])
+        if before is None:
+            continue
+        lines.append(f"  {result['apps']:>6} apps: {result['apps_per_s']} apps/s "
+                     f"({_change(before['apps_per_s'], result['apps_per_s'])}), "
+                     f"peak RSS {_change(before['peak_rss_kb'], result['peak_rss_kb'])}")
+        for stage, stats in result["stages"].items():
+            if stage in before["stages"]:
+                lines.append(f"         {stage:<14} median {stats['median_ms']:.3f}ms "
+                             f"({_change(before['stages'][stage]['median_ms'], stats['median_ms'])})")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generator on synthetic catalogs")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated catalog sizes (default: %(default)s)")
+    parser.add_argument("--seed-app", default=str(DEFAULT_SEED_APP),
+                        help="App whose pubspec, build.gradle.kts and icons stand in for flutter create")
+    parser.add_argument("--target", help="Scratch directory root (default: /dev/shm or the temp dir)")
+    parser.add_argument("--layout", type=str, help="App layout spec, e.g. bucketed:5:1000 (default: flat)")
+    parser.add_argument("--out", help="Also write the JSON report to this file")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        json.dump(run_size(args.single, args.seed_app), sys.stdout)
+        return
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "layout": args.layout or "flat",
+        "results": [],
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"⏱️  {size} apps...", file=sys.stderr, flush=True)
+        report["results"].append(run_isolated(size, args.seed_app, args.target, args.layout))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n")
+    if args.compare:
+        for line in compare(json.loads(Path(args.compare).read_text()), report):
+            print(line, file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Content-addressed blob store for the generated app trees
+
+Most files under apps/ (ios/macos/windows/linux/web scaffolding, launcher
+icons, template sources) are byte-identical across app01..app100. The store
+keeps every unique file once under .blobstore/objects/ and records each app
+as a manifest of relative path -> sha256. App trees are materialized from
+their manifest with reflinks (copy-on-write) where the filesystem supports
+them, falling back to hardlinks or plain copies.
+
+Hardlinked files share their inode with the blob, so anything that rewrites
+a file in place would write through into the store. The fleet's own writers
+(template sync, gradle and pubspec patches, key.properties) replace files
+through a temp file and rename (template_sync.atomic_write_bytes), and
+build_fleet.py and pub_resolve.py detach an app before flutter rewrites its
+pubspec.lock. Run `detach` on an app before editing it any other way (an
+IDE, a manual pub get), and `verify` to catch blobs that were modified anyway.
+
+Usage:
+    blob_store.py ingest [app_dir ...]
+    blob_store.py materialize <app_name> [dest_dir]
+    blob_store.py detach <app_name> ...
+    blob_store.py verify
+    blob_store.py gc [--dry-run]
+    blob_store.py stats
+"""
+
+import errno
+import json
+import os
+import shutil
+import stat
+import sys
+from pathlib import Path
+
+import app_layout
+import fleet_walk
+
+STORE_DIR = Path(".blobstore")
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+# Build outputs and tool caches are never part of an app's manifest
+IGNORED_DIRS = fleet_walk.IGNORED_DIRS
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)) used for reflinks on btrfs/xfs
+FICLONE = 0x40049409
+
+hash_file = fleet_walk.hash_file
+
+def blob_path(store, digest):
+    """Path of a blob inside the store"""
+    return Path(store) / "objects" / digest[:2] / digest[2:]
+
+def manifest_path(store, app_name):
+    """Path of an app manifest inside the store"""
+    return Path(store) / "manifests" / f"{app_name}.json"
+
+def iter_app_files(app_dir):
+    """Yield (relative_path, absolute_path) for every tracked file of an app"""
+    app_dir = Path(app_dir)
+    for rel, _ in fleet_walk.walk(app_dir, ignored=IGNORED_DIRS):
+        yield rel, app_dir / rel
+
+def put_blob(store, path, digest=None):
+    """Copy a file into the store (if missing) and return its digest"""
+    digest = digest or hash_file(path)
+    target = blob_path(store, digest)
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        shutil.copyfile(path, tmp)
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, target)
+    return digest
+
+def _reflink(src, dest):
+    """Clone src into dest with FICLONE; raise OSError if unsupported"""
+    import fcntl
+    with open(src, 'rb') as s, open(dest, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.unlink(dest)
+            raise
+
+def link_blob(blob, dest, link_mode="auto", executable=False):
+    """Materialize a blob at dest using the requested link mode"""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+
+    if link_mode in ("auto", "reflink"):
+        try:
+            _reflink(blob, dest)
+            os.chmod(dest, 0o755 if executable else 0o644)
+            return "reflink"
+        except (OSError, ImportError):
+            if link_mode == "reflink":
+                link_mode = "copy"
+
+    if link_mode in ("auto", "hardlink") and not executable:
+        try:
+            os.link(blob, dest)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+
+    shutil.copyfile(blob, dest)
+    os.chmod(dest, 0o755 if executable else 0o644)
+    return "copy"
+
+def load_manifest(store, app_name):
+    """Load an app manifest, or None if the app was never ingested"""
+    path = manifest_path(store, app_name)
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def write_manifest(store, manifest):
+    """Write an app manifest atomically"""
+    path = manifest_path(store, manifest["app"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def ingest_app(app_dir, store=STORE_DIR, link_mode="auto", hashes=None):
+    """Add an app tree to the store and relink its files to the blobs
+
+    With a fleet_walk.HashCache, files already linked to their blob are not
+    read again.
+    """
+    app_dir = Path(app_dir)
+    files = {}
+    for rel, st in fleet_walk.walk(app_dir, ignored=IGNORED_DIRS):
+        path = app_dir / rel
+        executable = bool(st.st_mode & stat.S_IXUSR)
+        digest = put_blob(store, path, hashes.digest(path, st) if hashes else None)
+        files[rel] = {"sha256": digest, "size": st.st_size, "exec": executable}
+        if link_mode != "copy":
+            blob = blob_path(store, digest)
+            try:
+                if os.path.samefile(blob, path):
+                    continue
+            except OSError:
+                pass
+            link_blob(blob, path, link_mode, executable)
+
+    manifest = {"app": app_dir.name, "files": files}
+    write_manifest(store, manifest)
+    return manifest
+
+def materialize_app(app_name, dest_dir=None, store=STORE_DIR, link_mode="auto"):
+    """Recreate an app tree from its manifest; returns link-mode counts"""
+    manifest = load_manifest(store, app_name)
+    if manifest is None:
+        raise FileNotFoundError(f"No manifest for {app_name} in {store}")
+    dest_dir = Path(dest_dir or app_layout.app_dir(app_name))
+    counts = {}
+    for rel, entry in manifest["files"].items():
+        blob = blob_path(store, entry["sha256"])
+        dest = dest_dir / rel
+        if dest.exists() and not dest.is_symlink():
+            try:
+                if os.path.samefile(blob, dest):
+                    counts["unchanged"] = counts.get("unchanged", 0) + 1
+                    continue
+            except OSError:
+                pass
+        used = link_blob(blob, dest, link_mode, entry.get("exec", False))
+        counts[used] = counts.get(used, 0) + 1
+    return counts
+
+def detach_app(app_dir):
+    """Give every hardlinked file of an app its own private copy"""
+    detached = 0
+    for _, path in iter_app_files(app_dir):
+        st = path.stat()
+        if st.st_nlink > 1:
+            tmp = path.with_name(f".{path.name}.detach")
+            shutil.copyfile(path, tmp)
+            os.chmod(tmp, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+            os.replace(tmp, path)
+            detached += 1
+    return detached
+
+def iter_manifests(store=STORE_DIR):
+    """Yield every manifest in the store"""
+    manifests_dir = Path(store) / "manifests"
+    if not manifests_dir.exists():
+        return
+    for path in sorted(manifests_dir.glob("*.json")):
+        with open(path, 'r') as f:
+            yield json.load(f)
+
+def verify(store=STORE_DIR, apps_root=Path("apps")):
+    """Compare manifests with the store and the app trees"""
+    problems = []
+    checked = {}
+    for manifest in iter_manifests(store):
+        app_dir = app_layout.app_dir(manifest["app"], apps_root)
+        for rel, entry in manifest["files"].items():
+            digest = entry["sha256"]
+            blob = blob_path(store, digest)
+            if digest not in checked:
+                if not blob.exists():
+                    checked[digest] = "missing"
+                elif hash_file(blob) != digest:
+                    checked[digest] = "corrupt"
+                else:
+                    checked[digest] = "ok"
+            if checked[digest] != "ok":
+                problems.append((manifest["app"], rel, f"blob {checked[digest]}"))
+                continue
+            app_file = app_dir / rel
+            if not app_file.exists():
+                problems.append((manifest["app"], rel, "missing from app tree"))
+            elif not os.path.samefile(blob, app_file) and hash_file(app_file) != digest:
+                problems.append((manifest["app"], rel, "differs from manifest"))
+    return problems
+
+def gc(store=STORE_DIR, dry_run=False):
+    """Delete blobs no manifest references; returns (count, bytes)"""
+    referenced = set()
+    for manifest in iter_manifests(store):
+        referenced.update(entry["sha256"] for entry in manifest["files"].values())
+
+    removed = 0
+    freed = 0
+    objects_dir = Path(store) / "objects"
+    if not objects_dir.exists():
+        return removed, freed
+    for path in objects_dir.glob("*/*"):
+        digest = path.parent.name + path.name
+        if path.name.endswith(".tmp") or digest not in referenced:
+            freed += path.stat().st_size
+            removed += 1
+            if not dry_run:
+                path.unlink()
+    return removed, freed
+
+def stats(store=STORE_DIR):
+    """Return logical vs stored size of all manifests"""
+    logical = 0
+    files = 0
+    unique = {}
+    apps = 0
+    for manifest in iter_manifests(store):
+        apps += 1
+        for entry in manifest["files"].values():
+            files += 1
+            logical += entry["size"]
+            unique[entry["sha256"]] = entry["size"]
+    return {
+        "apps": apps,
+        "files": files,
+        "unique_blobs": len(unique),
+        "logical_bytes": logical,
+        "stored_bytes": sum(unique.values()),
+    }
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = sys.argv[2:]
+
+    if command == "ingest":
+        app_dirs = [Path(a) for a in args] or app_layout.list_app_dirs()
+        with fleet_walk.HashCache() as hashes:
+            for app_dir in app_dirs:
+                manifest = ingest_app(app_dir, hashes=hashes)
+                print(f"✅ {app_dir.name}: {len(manifest['files'])} files")
+        s = stats()
+        print(f"Stored {s['unique_blobs']} unique blobs for {s['files']} files")
+    elif command == "materialize":
+        if not args:
+            print("Usage: blob_store.py materialize <app_name> [dest_dir]")
+            sys.exit(1)
+        counts = materialize_app(args[0], args[1] if len(args) > 1 else None)
+        print(f"✅ {args[0]} materialized: {counts}")
+    elif command == "detach":
+        if not args:
+            print("Usage: blob_store.py detach <app_name> ...")
+            sys.exit(1)
+        for name in args:
+            detached = detach_app(app_layout.app_dir(name))
+            print(f"✅ {name}: {detached} files detached")
+    elif command == "verify":
+        problems = verify()
+        for app, rel, reason in problems:
+            print(f"❌ {app}/{rel}: {reason}")
+        print("✅ Store verified" if not problems else f"❌ {len(problems)} problems")
+        sys.exit(1 if problems else 0)
+    elif command == "gc":
+        dry_run = "--dry-run" in args
+        removed, freed = gc(dry_run=dry_run)
+        verb = "Would remove" if dry_run else "Removed"
+        print(f"{verb} {removed} blobs ({freed / 1024 / 1024:.1f} MB)")
+    elif command == "stats":
+        s = stats()
+        saved = 1 - s["stored_bytes"] / s["logical_bytes"] if s["logical_bytes"] else 0
+        print(f"Apps: {s['apps']}")
+        print(f"Files: {s['files']} ({s['unique_blobs']} unique)")
+        print(f"Logical size: {s['logical_bytes'] / 1024 / 1024:.1f} MB")
+        print(f"Stored size: {s['stored_bytes'] / 1024 / 1024:.1f} MB ({saved:.0%} saved)")
+    else:
+        print(f"Unknown command: {command}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Memory-aware admission control for concurrent Gradle builds
+
+Every app's android/gradle.properties sets org.gradle.jvmargs, and a release
+build can grow its Gradle daemon up to -Xmx plus metaspace and code cache.
+Before a build starts, its projected footprint (those limits plus the flutter
+tool and Dart compiler) is checked against a budget taken from
+/proc/meminfo MemAvailable minus a reserve. A build is also held back while
+the host itself is low on memory. One build is always admitted when nothing
+is running, so an oversized build still makes progress on its own.
+
+All builds share one GRADLE_USER_HOME whose gradle.properties (which takes
+precedence over the per-project file) can cap the daemon heap and makes idle
+daemons exit soon after the fleet is done. With identical JVM args and a
+shared home, Gradle hands each new build an idle daemon left by a finished
+one, so the number of daemons never exceeds the number of build slots.
+
+Usage:
+    build_admission.py [app_dir ...] [--gradle-heap 3G]
+"""
+
+import argparse
+import os
+import re
+import threading
+from pathlib import Path
+
+import app_layout
+
+MEMINFO = Path("/proc/meminfo")
+GRADLE_PROPERTIES = Path("android/gradle.properties")
+SHARED_GRADLE_HOME = Path(os.environ.get("GLOVEN_CACHE_DIR", Path.home() / ".cache" / "gloven")) / "gradle"
+
+GIB = 1024 ** 3
+RESERVE_BYTES = 2 * GIB
+# flutter tool, Dart frontend_server and gen_snapshot running beside Gradle
+TOOL_OVERHEAD_BYTES = 3 * GIB // 2
+DAEMON_IDLE_TIMEOUT_MS = 10 * 60 * 1000
+
+# JVM defaults when gradle.properties leaves a limit unset
+DEFAULT_HEAP = 512 * 1024 ** 2
+DEFAULT_METASPACE = 384 * 1024 ** 2
+DEFAULT_CODE_CACHE = 240 * 1024 ** 2
+
+SIZE_RE = re.compile(r'^(\d+)([kmgt]?)$', re.IGNORECASE)
+UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+def parse_size(text):
+    """JVM-style size ("8G", "512m", "1024k") -> bytes"""
+    match = SIZE_RE.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(match.group(1)) * UNITS[match.group(2).lower()]
+
+def format_size(size):
+    for unit, scale in (("G", GIB), ("M", 1024 ** 2), ("K", 1024)):
+        if size >= scale:
+            return f"{size / scale:.1f}{unit}"
+    return f"{size}B"
+
+def read_meminfo(path=MEMINFO):
+    """/proc/meminfo as {field: bytes}"""
+    info = {}
+    with open(path, 'r') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            parts = value.split()
+            if parts and parts[0].isdigit():
+                info[name] = int(parts[0]) * (1024 if parts[1:] == ["kB"] else 1)
+    return info
+
+def mem_available(path=MEMINFO):
+    """MemAvailable in bytes"""
+    return read_meminfo(path)["MemAvailable"]
+
+def read_jvm_args(properties_path):
+    """org.gradle.jvmargs from a gradle.properties file, or None"""
+    try:
+        with open(properties_path, 'r') as f:
+            for line in f:
+                name, sep, value = line.partition('=')
+                if sep and name.strip() == "org.gradle.jvmargs":
+                    return value.strip()
+    except FileNotFoundError:
+        pass
+    return None
+
+def jvm_memory(jvm_args):
+    """Upper bound of a JVM's footprint from its heap, metaspace and code cache limits"""
+    limits = {"-Xmx": DEFAULT_HEAP, "-XX:MaxMetaspaceSize=": DEFAULT_METASPACE,
+              "-XX:ReservedCodeCacheSize=": DEFAULT_CODE_CACHE}
+    for arg in (jvm_args or "").split():
+        for prefix in limits:
+            if arg.startswith(prefix):
+                limits[prefix] = parse_size(arg[len(prefix):])
+    return sum(limits.values())
+
+def projected_build_memory(app_dir, jvm_args=None):
+    """Projected peak memory of one app build
+
+    jvm_args overrides the app's own org.gradle.jvmargs (as the shared
+    GRADLE_USER_HOME does at build time).
+    """
+    if jvm_args is None:
+        jvm_args = read_jvm_args(Path(app_dir) / GRADLE_PROPERTIES)
+    return jvm_memory(jvm_args) + TOOL_OVERHEAD_BYTES
+
+def heap_jvm_args(heap, metaspace="1G"):
+    """Daemon JVM args for a capped heap"""
+    return (f"-Xmx{heap} -XX:MaxMetaspaceSize={metaspace} "
+            "-XX:ReservedCodeCacheSize=512m -XX:+HeapDumpOnOutOfMemoryError")
+
+def prepare_gradle_home(path=SHARED_GRADLE_HOME, jvm_args=None, idle_timeout_ms=DAEMON_IDLE_TIMEOUT_MS):
+    """Create the shared GRADLE_USER_HOME and its gradle.properties; returns the path"""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    lines = [f"org.gradle.daemon.idletimeout={idle_timeout_ms}"]
+    if jvm_args:
+        lines.append(f"org.gradle.jvmargs={jvm_args}")
+    content = "\n".join(lines) + "\n"
+    properties = path / "gradle.properties"
+    if not properties.exists() or properties.read_text() != content:
+        properties.write_text(content)
+    return path
+
+class AdmissionController:
+    """Admit builds while their projected memory fits the budget
+
+    need(item) returns the projected bytes of a job. max_slots caps the
+    number of concurrent builds, and with it the number of Gradle daemons.
+    """
+
+    def __init__(self, need, max_slots, budget=None, reserve=RESERVE_BYTES, meminfo=MEMINFO):
+        self.need = need
+        self.max_slots = max(1, max_slots)
+        self.reserve = reserve
+        self.meminfo = meminfo
+        self.budget = budget if budget is not None else max(0, mem_available(meminfo) - reserve)
+        self.running = {}
+        self.peak_slots = 0
+        self.deferred = 0
+        self._lock = threading.Lock()
+
+    @property
+    def committed(self):
+        return sum(self.running.values())
+
+    def try_acquire(self, item):
+        """Reserve memory for a job; False if it has to wait"""
+        need = self.need(item)
+        with self._lock:
+            if self.running:
+                if (len(self.running) >= self.max_slots
+                        or self.committed + need > self.budget
+                        or mem_available(self.meminfo) < self.reserve):
+                    self.deferred += 1
+                    return False
+            self.running[id(item)] = need
+            self.peak_slots = max(self.peak_slots, len(self.running))
+            return True
+
+    def release(self, item):
+        with self._lock:
+            self.running.pop(id(item), None)
+
+def plan_slots(needs, workers, budget):
+    """How many builds of the largest projected size fit the budget (at least 1)"""
+    largest = max(needs, default=0)
+    fit = int(budget // largest) if largest else workers
+    return max(1, min(workers, fit))
+
+def main():
+    parser = argparse.ArgumentParser(description="Show projected build memory and build slots")
+    parser.add_argument("apps", nargs="*", help="App directories (default: every app)")
+    parser.add_argument("--gradle-heap", help="Cap the Gradle daemon heap, e.g. 3G")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    app_dirs = [Path(a) for a in args.apps] or app_layout.list_app_dirs()
+    jvm_args = heap_jvm_args(args.gradle_heap) if args.gradle_heap else None
+    needs = [projected_build_memory(d, jvm_args) for d in app_dirs]
+    info = read_meminfo()
+    budget = max(0, info["MemAvailable"] - RESERVE_BYTES)
+
+    print(f"MemTotal {format_size(info['MemTotal'])}, MemAvailable {format_size(info['MemAvailable'])}, "
+          f"budget {format_size(budget)}")
+    if needs:
+        print(f"Projected per build: {format_size(max(needs))} ({len(app_dirs)} apps)")
+    print(f"Build slots: {plan_slots(needs, args.workers, budget)} of {args.workers} workers")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Input-keyed cache of release AABs
+
+The key of a build is a sha256 over everything that ends up in the bundle:
+the app's lib/, assets/, pubspec.yaml and pubspec.lock, its android/ tree
+(minus files Flutter regenerates on every build), the keystore, the Flutter
+version and the build name/number. A build whose key is already cached is
+restored from the cache instead of running Gradle.
+
+Entries live in $GLOVEN_CACHE_DIR/aab (default ~/.cache/gloven/aab) next to
+an index.json holding their size and last use plus hit/miss counters. The
+cache is bounded by size and evicts the least recently used entries first.
+The index is guarded by a file lock, so parallel builds can share a cache.
+
+Machines that cannot share a directory (CI shards) each start from a copy of
+one fleet-wide cache, `export` the entries they built or hit since a point
+in time into a small cache of their own, and one final `merge` folds those
+back into the fleet cache and trims it to size.
+
+Usage:
+    build_cache.py stats
+    build_cache.py evict [--max-size 10G]
+    build_cache.py clear
+    build_cache.py export <dest_dir> --since <unix_time>
+    build_cache.py merge <cache_dir ...> [--max-size 10G]
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import blob_store
+import build_admission
+import fleet_walk
+import flutter_skeleton
+
+CACHE_DIR = Path(os.environ.get("GLOVEN_CACHE_DIR", Path.home() / ".cache" / "gloven")) / "aab"
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+
+KEY_VERSION = 1
+KEY_PATHS = ("lib", "assets", "pubspec.yaml", "pubspec.lock", "android")
+
+# Written by flutter/gradle during a build, so they must not change the key
+GENERATED_NAMES = {
+    "local.properties",
+    "gradlew",
+    "gradlew.bat",
+    "gradle-wrapper.jar",
+    "GeneratedPluginRegistrant.java",
+}
+
+def flutter_version():
+    """Installed Flutter version, or None if it cannot be determined"""
+    try:
+        return flutter_skeleton.flutter_sdk_version()
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError, KeyError):
+        return None
+
+def _input_stats(app_dir):
+    return sorted(((rel, st) for rel, st in fleet_walk.walk(app_dir, KEY_PATHS)
+                   if rel.rsplit("/", 1)[-1] not in GENERATED_NAMES), key=lambda item: item[0])
+
+def _digest(path, hashes, st=None):
+    return hashes.digest(path, st) if hashes else fleet_walk.hash_file(path)
+
+def input_files(app_dir):
+    """Sorted relative paths of the files a build key covers"""
+    return [rel for rel, _ in _input_stats(app_dir)]
+
+def cache_key(app_dir, flutter_version, build_name, build_number, extra_files=(), hashes=None):
+    """Digest of every input of an app's release build
+
+    With a fleet_walk.HashCache, unchanged files are not read again.
+    """
+    app_dir = Path(app_dir)
+    digest = hashlib.sha256()
+    header = {
+        "version": KEY_VERSION,
+        "flutter": flutter_version,
+        "build_name": build_name,
+        "build_number": build_number,
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode())
+    for rel, st in _input_stats(app_dir):
+        digest.update(f"\0{rel}\0{_digest(app_dir / rel, hashes, st)}".encode())
+    for path in extra_files:
+        digest.update(f"\0extra\0{_digest(path, hashes) if Path(path).exists() else ''}".encode())
+    return digest.hexdigest()
+
+class BuildCache:
+    """Size-bounded LRU cache of built AABs keyed by cache_key()"""
+
+    def __init__(self, root=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, key):
+        return self.objects / f"{key}.aab"
+
+    @contextmanager
+    def _index(self):
+        """Load the index under an exclusive lock and save it on exit"""
+        with open(self.root / ".lock", 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.index_path, 'r') as f:
+                    index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                index = {"entries": {}, "stats": {}}
+            yield index
+            tmp = self.index_path.with_suffix(".json.tmp")
+            with open(tmp, 'w') as f:
+                json.dump(index, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def _count(index, name, n=1):
+        index["stats"][name] = index["stats"].get(name, 0) + n
+
+    def get(self, key, dest):
+        """Restore a cached bundle to dest; returns True on a hit"""
+        with self._index() as index:
+            entry = index["entries"].get(key)
+            path = self.object_path(key)
+            if entry is None or not path.exists():
+                index["entries"].pop(key, None)
+                self._count(index, "misses")
+                return False
+            entry["last_used"] = time.time()
+            self._count(index, "hits")
+            blob_store.link_blob(path, dest)
+        return True
+
+    def put(self, key, src, app=None):
+        """Store a freshly built bundle, then evict down to the size cap"""
+        path = self.object_path(key)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, path)
+        with self._index() as index:
+            index["entries"][key] = {
+                "app": app,
+                "size": path.stat().st_size,
+                "created": time.time(),
+                "last_used": time.time(),
+            }
+            self._count(index, "stores")
+            self._evict(index, self.max_bytes)
+
+    def _evict(self, index, max_bytes):
+        entries = index["entries"]
+        total = sum(e["size"] for e in entries.values())
+        evicted = 0
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= max_bytes:
+                break
+            total -= entries.pop(key)["size"]
+            self.object_path(key).unlink(missing_ok=True)
+            evicted += 1
+        if evicted:
+            self._count(index, "evictions", evicted)
+        return evicted
+
+    def evict(self, max_bytes=None):
+        """Evict least recently used entries until the cache fits; returns the count"""
+        with self._index() as index:
+            return self._evict(index, self.max_bytes if max_bytes is None else max_bytes)
+
+    def export(self, dest, since):
+        """Copy the entries used since a time into a new cache at dest; returns the count
+
+        Bundles are copied only for entries created since then. Entries that
+        were only hit carry just their new last use, for a merge into a cache
+        that already has the bundle.
+        """
+        with self._index() as index:
+            entries = {key: dict(entry) for key, entry in index["entries"].items()
+                       if entry["last_used"] >= since}
+        target = BuildCache(dest, self.max_bytes)
+        for key, entry in entries.items():
+            if entry["created"] >= since:
+                blob_store.link_blob(self.object_path(key), target.object_path(key), "hardlink")
+        with target._index() as target_index:
+            target_index["entries"].update(entries)
+        return len(entries)
+
+    def merge(self, other):
+        """Fold another cache's entries into this one, then evict down to the size cap
+
+        An entry both caches have keeps its latest use. Returns the number of
+        bundles added.
+        """
+        other = BuildCache(other)
+        with other._index() as theirs:
+            incoming = theirs["entries"]
+        added = 0
+        with self._index() as index:
+            entries = index["entries"]
+            for key, entry in incoming.items():
+                if key in entries and self.object_path(key).exists():
+                    entries[key]["last_used"] = max(entries[key]["last_used"], entry["last_used"])
+                elif other.object_path(key).exists():
+                    blob_store.link_blob(other.object_path(key), self.object_path(key), "hardlink")
+                    entries[key] = entry
+                    added += 1
+            self._evict(index, self.max_bytes)
+        return added
+
+    def clear(self):
+        with self._index() as index:
+            for key in index["entries"]:
+                self.object_path(key).unlink(missing_ok=True)
+            index["entries"] = {}
+
+    def stats(self):
+        """Entry count, total size and lifetime counters"""
+        with self._index() as index:
+            entries = index["entries"]
+            counters = dict(index["stats"])
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        return {
+            "entries": len(entries),
+            "bytes": sum(e["size"] for e in entries.values()),
+            "max_bytes": self.max_bytes,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "stores": counters.get("stores", 0),
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": round(counters.get("hits", 0) / lookups, 3) if lookups else None,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the AAB build cache")
+    parser.add_argument("command", choices=("stats", "evict", "clear", "export", "merge"))
+    parser.add_argument("paths", nargs="*", help="Destination for export, caches to fold in for merge")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    parser.add_argument("--max-size", type=build_admission.parse_size, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--since", type=float, help="Export entries used at or after this Unix time")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    cache = BuildCache(args.cache_dir, args.max_size)
+    if args.command == "export":
+        if len(args.paths) != 1 or args.since is None:
+            parser.error("export needs one destination and --since")
+        print(f"📤 Exported {cache.export(args.paths[0], args.since)} entries to {args.paths[0]}")
+        return
+    if args.command == "merge":
+        if not args.paths:
+            parser.error("merge needs at least one cache directory")
+        added = sum(cache.merge(path) for path in args.paths)
+        print(f"📥 Merged {len(args.paths)} caches, {added} new bundles")
+    elif args.command == "evict":
+        print(f"🗑️  Evicted {cache.evict()} entries")
+    elif args.command == "clear":
+        cache.clear()
+        print("🗑️  Cache cleared")
+
+    stats = cache.stats()
+    if args.json:
+        json.dump(stats, sys.stdout, indent=2)
+        print()
+    else:
+        rate = f"{stats['hit_rate']:.0%}" if stats["hit_rate"] is not None else "n/a"
+        print(f"{stats['entries']} entries, {build_admission.format_size(stats['bytes'])} "
+              f"of {build_admission.format_size(stats['max_bytes'])}")
+        print(f"{stats['hits']} hits, {stats['misses']} misses ({rate}), "
+              f"{stats['stores']} stores, {stats['evictions']} evictions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Build release AABs for many apps in parallel
+
+Every app is built in its own worker process: signing is set up (key.properties
+from the environment, build.gradle.kts patched through update_build_gradle),
+then `flutter pub get` and `flutter build appbundle` run with their output in
+build_logs/<app>.log. Finished bundles are collected into signed_aabs/.
+
+Before anything is built, every app's inputs are hashed and looked up in the
+AAB cache (see build_cache.py); hits are restored straight into signed_aabs/
+and only the misses are built, then stored in the cache.
+
+A build only starts when its projected memory fits (see build_admission.py),
+and all builds share one GRADLE_USER_HOME so Gradle daemons are reused across
+apps instead of one being left behind per app.
+
+Progress is shown as a live status table on a terminal and as one line per
+finished app otherwise. The outcome of every app is recorded in
+.build_fleet_state.json after it finishes, so `--resume` continues an
+interrupted or failed run without rebuilding apps that already succeeded.
+
+The flutter executable is taken from $FLUTTER (default: flutter on PATH),
+which lets the whole pipeline run against a stub.
+
+Environment:
+    KEY_ALIAS, KEY_PASSWORD, STORE_PASSWORD   signing credentials
+    KEYSTORE_PATH                             keystore (default: gloven-keystore.jks)
+
+Usage:
+    build_fleet.py [all | app01 7 42 ...] [--workers N] [--resume]
+                   [--build-name 1.0.0] [--build-number N]
+                   [--gradle-heap 3G] [--memory-budget 24G] [--max-daemons N]
+                   [--no-cache] [--cache-size 10G] [--durations FILE] [--resolve-once]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app_layout
+import blob_store
+import build_admission
+import build_cache
+import core_package
+import fleet_walk
+import flutter_skeleton
+import generation_engine
+import gradle_kts
+import plan_affected_apps
+import plan_shards
+import pub_resolve
+import pub_workspace
+import template_sync
+import tracing
+import update_build_gradle
+
+APPS_DIR = Path("apps")
+LOG_DIR = Path("build_logs")
+OUTPUT_DIR = Path("signed_aabs")
+STATE_FILE = Path(".build_fleet_state.json")
+KEYSTORE_PATH = Path("gloven-keystore.jks")
+
+AAB_PATH = Path("build/app/outputs/bundle/release/app-release.aab")
+LOG_TAIL_LINES = 15
+MAX_FAILED_ROWS = 10
+
+def signing_from_env():
+    """Signing settings from the environment, or None if incomplete"""
+    keys = {
+        "keyAlias": os.environ.get("KEY_ALIAS"),
+        "keyPassword": os.environ.get("KEY_PASSWORD"),
+        "storePassword": os.environ.get("STORE_PASSWORD"),
+    }
+    if not all(keys.values()):
+        return None
+    keystore = Path(os.environ.get("KEYSTORE_PATH", KEYSTORE_PATH)).resolve()
+    return {**keys, "storeFile": str(keystore)}
+
+def write_key_properties(app_dir, signing):
+    """Write android/key.properties for the release signing config"""
+    path = Path(app_dir) / "android" / "key.properties"
+    lines = [f"{name}={value}" for name, value in signing.items()]
+    template_sync.atomic_write_bytes(path, ("\n".join(lines) + "\n").encode())
+    path.chmod(0o600)
+
+def prepare_signing(app_dir, signing):
+    """key.properties plus the build.gradle.kts signing setup"""
+    app_dir = Path(app_dir)
+    if signing is not None:
+        write_key_properties(app_dir, signing)
+    build_file = app_dir / "android" / "app" / "build.gradle.kts"
+    if build_file.exists():
+        package = f"{update_build_gradle.PACKAGE_PREFIX}.{app_dir.name}"
+        update_build_gradle.update_build_gradle(build_file, package)
+
+def _tail(path, lines=LOG_TAIL_LINES):
+    try:
+        return "\n".join(Path(path).read_text(errors="replace").splitlines()[-lines:])
+    except FileNotFoundError:
+        return ""
+
+def build_app(job):
+    """Build one app in a worker process; returns a summary dict or raises"""
+    app_dir = Path(job["app_dir"])
+    with tracing.span("build", app=app_dir.name):
+        return _build_app(job, app_dir)
+
+def _build_app(job, app_dir):
+    log_path = Path(job["log_dir"]) / f"{app_dir.name}.log"
+    started = time.monotonic()
+
+    try:
+        with tracing.span("signing"):
+            prepare_signing(app_dir, job["signing"])
+    except (OSError, gradle_kts.GradleParseError) as e:
+        raise RuntimeError(f"signing setup failed: {e}")
+
+    env = dict(os.environ)
+    if job["gradle_home"]:
+        env["GRADLE_USER_HOME"] = job["gradle_home"]
+
+    # pub get rewrites pubspec.lock in place; keep that out of the blob store
+    with tracing.span("detach"):
+        blob_store.detach_app(app_dir)
+
+    flutter = flutter_skeleton.flutter_executable()
+    commands = [
+        ("flutter_build", [flutter, "build", "appbundle", "--release",
+                           f"--build-name={job['build_name']}", f"--build-number={job['build_number']}"]),
+    ]
+    if job["pub_get"]:
+        commands.insert(0, ("pub_get", [flutter, "pub", "get"]))
+    with open(log_path, "w") as log:
+        for stage, cmd in commands:
+            log.write(f"$ {' '.join(cmd)}\n")
+            log.flush()
+            try:
+                with tracing.span(stage):
+                    code = subprocess.run(cmd, cwd=app_dir, env=env, stdout=log,
+                                          stderr=subprocess.STDOUT).returncode
+            except FileNotFoundError:
+                raise RuntimeError(f"{cmd[0]} not found")
+            if code != 0:
+                raise RuntimeError(f"`{' '.join(cmd[1:3])}` exited with {code}, see {log_path}")
+
+    aab = app_dir / AAB_PATH
+    if not aab.exists():
+        raise RuntimeError(f"no bundle at {aab}, see {log_path}")
+    dest = Path(job["output_dir"]) / f"{app_dir.name}-release.aab"
+    with tracing.span("aab_copy"):
+        blob_store.link_blob(aab, dest, "copy")
+    if job["cache_key"]:
+        with tracing.span("cache_put"):
+            build_cache.BuildCache(job["cache_dir"], job["cache_max_bytes"]).put(job["cache_key"], aab, app_dir.name)
+    return {"aab": str(dest), "seconds": round(time.monotonic() - started, 1), "cached": False}
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"apps": {}}
+
+def save_state(state, path=STATE_FILE):
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def completed_apps(state, build_number):
+    """Apps that already built successfully for this build number"""
+    done = set()
+    for app, entry in state.get("apps", {}).items():
+        if (entry.get("status") == "ok" and entry.get("build_number") == build_number
+                and Path(entry.get("aab", "")).exists()):
+            done.add(app)
+    return done
+
+class StatusBoard:
+    """Live table of running and finished builds"""
+
+    def __init__(self, apps, live):
+        self.apps = list(apps)
+        self.live = live
+        self.status = {app: "queued" for app in apps}
+        self.started = {}
+        self.detail = {}
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._drawn = 0
+        self._thread = None
+
+    def start(self, app):
+        with self.lock:
+            self.status[app] = "building"
+            self.started[app] = time.monotonic()
+        self.refresh()
+
+    def finish(self, result, done, total):
+        with self.lock:
+            self.status[result.key] = "ok" if result.ok else "failed"
+            self.detail[result.key] = f"{result.elapsed:.0f}s" if result.ok else result.error.splitlines()[0]
+        if not self.live:
+            status = "✅" if result.ok else "❌"
+            line = f"[{done}/{total}] {status} {result.key} ({result.elapsed:.1f}s)"
+            if not result.ok:
+                line += f": {self.detail[result.key][:100]}"
+            print(line, flush=True)
+        self.refresh()
+
+    def _render(self):
+        now = time.monotonic()
+        counts = {}
+        for status in self.status.values():
+            counts[status] = counts.get(status, 0) + 1
+        lines = ["  ".join(f"{name}: {counts.get(name, 0)}" for name in ("queued", "building", "ok", "failed"))]
+        failed = [app for app in self.apps if self.status[app] == "failed"]
+        for app in self.apps:
+            if self.status[app] == "building":
+                lines.append(f"  🔨 {app:<10} {now - self.started[app]:6.0f}s")
+        for app in failed[-MAX_FAILED_ROWS:]:
+            lines.append(f"  ❌ {app:<10} {self.detail[app][:70]}")
+        return lines
+
+    def refresh(self):
+        if not self.live:
+            return
+        with self.lock:
+            lines = self._render()
+            if self._drawn:
+                sys.stdout.write(f"\x1b[{self._drawn}F\x1b[J")
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+            self._drawn = len(lines)
+
+    def __enter__(self):
+        if self.live:
+            def tick():
+                while not self._stop.wait(1.0):
+                    self.refresh()
+            self._thread = threading.Thread(target=tick, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.refresh()
+
+def _record(state, state_path, result, build_number):
+    state["apps"][result.key] = {
+        "status": "ok" if result.ok else "failed",
+        "build_number": build_number,
+        "seconds": round(result.elapsed, 1),
+        **({"aab": result.value["aab"], "cached": result.value["cached"]}
+           if result.ok else {"error": result.error}),
+    }
+    save_state(state, state_path)
+
+def restore_cached(jobs, cache, flutter_version):
+    """Look every job up in the cache; returns (hits as JobResults, jobs left to build)"""
+    hits, misses = [], []
+    # Workspace members share the root lockfile
+    shared_lock = [pub_workspace.ROOT_PUBSPEC.with_suffix(".lock")] if pub_workspace.is_workspace_root() else []
+    # Apps using the shared runtime compile its sources into their bundle
+    core_files = core_package.package_files() if core_package.CORE_DIR.exists() else []
+    # Unchanged input files are not read again
+    with fleet_walk.HashCache() as hashes:
+        for job in jobs:
+            app_dir = Path(job["app_dir"])
+            started = time.monotonic()
+            try:
+                prepare_signing(app_dir, job["signing"])
+            except (OSError, gradle_kts.GradleParseError):
+                misses.append(job)  # the worker reports the error
+                continue
+            extra = [job["signing"]["storeFile"]] if job["signing"] else []
+            extra += shared_lock + (core_files if core_package.uses_core(app_dir) else [])
+            job["cache_key"] = build_cache.cache_key(
+                app_dir, flutter_version, job["build_name"], job["build_number"], extra, hashes)
+            dest = Path(job["output_dir"]) / f"{app_dir.name}-release.aab"
+            if cache.get(job["cache_key"], dest):
+                value = {"aab": str(dest), "seconds": 0.0, "cached": True}
+                hits.append(generation_engine.JobResult(app_dir.name, True, value, None, 0,
+                                                        time.monotonic() - started))
+            else:
+                misses.append(job)
+    return hits, misses
+
+def resolve_shared(jobs):
+    """Resolve dependencies once per pub_resolve group; returns the resolved app dirs"""
+    if pub_workspace.is_workspace_root():
+        try:
+            pub_resolve.resolve_workspace()
+        except RuntimeError as e:
+            print(f"⚠️  Workspace resolution failed, apps run pub get themselves: {e}")
+            return set()
+        print(f"📦 Resolved {len(jobs)} apps with one workspace pub get")
+        return {job["app_dir"] for job in jobs}
+    apps = [pub_resolve.load_app(job["app_dir"]) for job in jobs]
+    groups = pub_resolve.group_apps(apps)
+    resolved = set()
+    for key, (_, error) in pub_resolve.resolve_groups(groups).items():
+        if error:
+            print(f"⚠️  Shared resolution failed for {len(groups[key])} apps, they run pub get themselves")
+        else:
+            resolved.update(str(app["dir"]) for app in groups[key])
+    print(f"📦 Resolved {len(resolved)} apps with {len(groups)} pub get runs")
+    return resolved
+
+def build_fleet(apps, workers=None, build_name="1.0.0", build_number=1, resume=False,
+                apps_dir=APPS_DIR, log_dir=LOG_DIR, output_dir=OUTPUT_DIR,
+                state_path=STATE_FILE, live=False, gradle_heap=None, memory_budget=None,
+                max_daemons=None, gradle_home=build_admission.SHARED_GRADLE_HOME,
+                cache_dir=build_cache.CACHE_DIR, cache_max_bytes=build_cache.DEFAULT_MAX_BYTES,
+                durations_path=None, resolve_once=False):
+    """Build apps on a process pool under memory admission; returns {app: JobResult}"""
+    log_dir, output_dir = Path(log_dir), Path(output_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    state = load_state(state_path) if resume else {"apps": {}}
+    skipped = completed_apps(state, build_number) if resume else set()
+    todo = [app for app in apps if app not in skipped]
+    if skipped:
+        print(f"⏭️  Resuming: {len(skipped & set(apps))} apps already built")
+
+    signing = signing_from_env()
+    if signing is None:
+        print("⚠️  KEY_ALIAS/KEY_PASSWORD/STORE_PASSWORD not set, keeping existing key.properties")
+
+    jvm_args = build_admission.heap_jvm_args(gradle_heap) if gradle_heap else None
+    if gradle_home:
+        gradle_home = str(build_admission.prepare_gradle_home(gradle_home, jvm_args))
+
+    cache = None
+    if cache_dir:
+        flutter_version = build_cache.flutter_version()
+        if flutter_version is None:
+            print("⚠️  Could not determine the Flutter version, build cache disabled")
+        else:
+            cache = build_cache.BuildCache(cache_dir, cache_max_bytes)
+
+    jobs = [{
+        "app_dir": str(app_layout.app_dir(app, apps_dir)),
+        "memory": build_admission.projected_build_memory(app_layout.app_dir(app, apps_dir), jvm_args),
+        "gradle_home": gradle_home,
+        "log_dir": str(log_dir),
+        "output_dir": str(output_dir),
+        "signing": signing,
+        "build_name": build_name,
+        "build_number": build_number,
+        "cache_dir": str(cache_dir) if cache else None,
+        "cache_max_bytes": cache_max_bytes,
+        "cache_key": None,
+        "pub_get": True,
+    } for app in todo]
+    app_of = lambda job: Path(job["app_dir"]).name
+
+    if resolve_once and jobs:
+        resolved = resolve_shared(jobs)
+        for job in jobs:
+            job["pub_get"] = job["app_dir"] not in resolved
+
+    results = {}
+    if cache is not None:
+        hits, jobs = restore_cached(jobs, cache, flutter_version)
+        for result in hits:
+            results[result.key] = result
+            _record(state, state_path, result, build_number)
+        print(f"📦 Build cache: {len(hits)} restored, {len(jobs)} to build")
+
+    durations = plan_shards.load_durations(durations_path) if durations_path else None
+
+    workers = workers or generation_engine.default_workers()
+    admission = build_admission.AdmissionController(
+        lambda job: job["memory"], min(workers, max_daemons or workers), budget=memory_budget)
+    if jobs:
+        largest = max(job["memory"] for job in jobs)
+        print(f"🧠 Memory budget {build_admission.format_size(admission.budget)}, "
+              f"~{build_admission.format_size(largest)} per build, "
+              f"up to {build_admission.plan_slots([largest], admission.max_slots, admission.budget)} "
+              f"concurrent builds")
+
+    with StatusBoard([app_of(job) for job in jobs], live) as board:
+        for done, result in enumerate(generation_engine.run_jobs(
+                build_app, jobs, workers=workers, retries=0, key=app_of,
+                on_submit=lambda job: board.start(app_of(job)), admission=admission), 1):
+            results[result.key] = result
+            _record(state, state_path, result, build_number)
+            if durations is not None and result.ok:
+                plan_shards.record_duration(durations, result.key, result.elapsed)
+                plan_shards.save_durations(durations, durations_path)
+            board.finish(result, done, len(jobs))
+    if jobs:
+        print(f"🧠 Peak concurrent builds: {admission.peak_slots} "
+              f"({admission.deferred} admission deferrals)")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Build release AABs for the app fleet")
+    parser.add_argument("apps", nargs="*", default=["all"], help='"all" or app names/numbers')
+    parser.add_argument("--workers", type=int, default=None, help="Parallel builds (default: one per core)")
+    parser.add_argument("--resume", action="store_true", help="Skip apps that already built successfully")
+    parser.add_argument("--build-name", default="1.0.0")
+    parser.add_argument("--build-number", type=int, default=1)
+    parser.add_argument("--apps-dir", default=str(APPS_DIR))
+    parser.add_argument("--gradle-heap", help="Cap every Gradle daemon heap, e.g. 3G (default: per-app gradle.properties)")
+    parser.add_argument("--memory-budget", type=build_admission.parse_size,
+                        help="Memory available to builds (default: MemAvailable minus a reserve)")
+    parser.add_argument("--max-daemons", type=int, default=None, help="Cap on concurrent builds/Gradle daemons")
+    parser.add_argument("--no-cache", action="store_true", help="Always build, ignoring the AAB cache")
+    parser.add_argument("--cache-dir", default=str(build_cache.CACHE_DIR))
+    parser.add_argument("--cache-size", type=build_admission.parse_size, default=build_cache.DEFAULT_MAX_BYTES,
+                        help="AAB cache size cap (default: 10G)")
+    parser.add_argument("--durations", help="Record build durations for plan_shards.py in this file")
+    parser.add_argument("--resolve-once", action="store_true",
+                        help="Run pub get once per dependency group instead of once per app")
+    parser.add_argument("--no-live", action="store_true", help="Print one line per app instead of a live table")
+    parser.add_argument("--trace", help="Record per-stage spans into this directory (see tracing.py)")
+    args = parser.parse_args()
+    if args.trace:
+        tracing.start(args.trace)
+
+    known = [app for app in plan_affected_apps.all_apps(args.apps_dir)
+             if (app_layout.app_dir(app, args.apps_dir) / "android").is_dir()]
+    if args.apps == ["all"]:
+        apps = known
+    else:
+        apps = plan_affected_apps.parse_app_list(" ".join(args.apps), known)
+    if not apps:
+        print("❌ No apps to build")
+        sys.exit(1)
+
+    workers = args.workers or generation_engine.default_workers()
+    print(f"🚀 Building {len(apps)} apps with {workers} workers (logs in {LOG_DIR}/)")
+    started = time.monotonic()
+    results = build_fleet(apps, workers, args.build_name, args.build_number, args.resume,
+                          apps_dir=args.apps_dir, live=sys.stdout.isatty() and not args.no_live,
+                          gradle_heap=args.gradle_heap, memory_budget=args.memory_budget,
+                          max_daemons=args.max_daemons,
+                          cache_dir=None if args.no_cache else args.cache_dir,
+                          cache_max_bytes=args.cache_size, durations_path=args.durations,
+                          resolve_once=args.resolve_once)
+
+    failed = sorted(app for app, result in results.items() if not result.ok)
+    cached = sum(1 for result in results.values() if result.ok and result.value["cached"])
+    built = len(results) - len(failed) - cached
+    print(f"\n✅ Built {built} apps ({cached} from cache) in {time.monotonic() - started:.0f}s, "
+          f"bundles in {OUTPUT_DIR}/")
+    if args.trace:
+        tracing.report(args.trace)
+    if failed:
+        print(f"❌ {len(failed)} failed: {', '.join(failed)}")
+        for app in failed:
+            print(f"\n--- {app} ({LOG_DIR / f'{app}.log'}) ---\n{_tail(LOG_DIR / f'{app}.log')}")
+        print("\nRe-run with --resume to retry only the failed apps")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Per-app input fingerprints for incremental regeneration
+
+An app's fingerprint covers its game dict from ALL_GAMES, the hashes of every
+file under templates/game_base and the generator sources. The fingerprints
+of the last successful run are kept in .build_state.json so only apps whose
+inputs changed need to be generated again.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import app_layout
+
+STATE_FILE = Path(".build_state.json")
+TEMPLATE_DIR = Path("templates/game_base")
+
+SCRIPTS_DIR = Path(__file__).parent
+GENERATOR_SOURCES = [
+    SCRIPTS_DIR / "create_complete_game_app.py",
+    SCRIPTS_DIR / "update_build_gradle.py",
+    SCRIPTS_DIR / "flutter_skeleton.py",
+    SCRIPTS_DIR / "gradle_kts.py",
+    SCRIPTS_DIR / "dart_templates.py",
+    SCRIPTS_DIR / "template_sync.py",
+    SCRIPTS_DIR / "pub_workspace.py",
+    SCRIPTS_DIR / "core_package.py",
+]
+
+def hash_bytes(data):
+    """Return the sha256 hex digest of some bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_tree(root):
+    """Hash every file under root into a single digest (path + content)"""
+    digest = hashlib.sha256()
+    root = Path(root)
+    if not root.exists():
+        return digest.hexdigest()
+    for dirpath, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(dirpath) / name
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(b'\0')
+            digest.update(hash_bytes(path.read_bytes()).encode())
+    return digest.hexdigest()
+
+def hash_sources(paths):
+    """Hash the generator source files"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).name.encode())
+        digest.update(b'\0')
+        digest.update(Path(path).read_bytes() if Path(path).exists() else b'')
+    return digest.hexdigest()
+
+def shared_inputs_digest(template_dir=TEMPLATE_DIR, sources=GENERATOR_SOURCES):
+    """Digest of the inputs every app shares (templates + generator)"""
+    return hash_bytes(f"{hash_tree(template_dir)}:{hash_sources(sources)}".encode())
+
+def app_fingerprint(game, shared_digest):
+    """Fingerprint one app from its game dict and the shared inputs"""
+    game_json = json.dumps(game, sort_keys=True, separators=(',', ':'))
+    return hash_bytes(f"{shared_digest}:{game_json}".encode())
+
+def load_state(path=STATE_FILE):
+    """Load the recorded fingerprints"""
+    if not Path(path).exists():
+        return {"apps": {}}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_state(state, path=STATE_FILE):
+    """Write the recorded fingerprints atomically"""
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def app_name(game):
+    """Directory name of the app generated for a game"""
+    return app_layout.app_name(game['num'])
+
+def stale_games(games, state, shared_digest, apps_root=Path("apps")):
+    """Return [(game, fingerprint)] for apps that need regenerating"""
+    stale = []
+    recorded = state.get("apps", {})
+    for game in games:
+        name = app_name(game)
+        fingerprint = app_fingerprint(game, shared_digest)
+        entry = recorded.get(name)
+        if (entry is None or entry.get("fingerprint") != fingerprint
+                or not app_layout.app_dir(name, apps_root).exists()):
+            stale.append((game, fingerprint))
+    return stale
+
+def record_app(state, game, fingerprint):
+    """Record a successful generation of one app"""
+    state.setdefault("apps", {})[app_name(game)] = {
+        "fingerprint": fingerprint,
+        "name": game["name"],
+    }
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Shared gloven_core package for the common game runtime
+
+models/, providers/ and utils/ of templates/game_base/lib are the same in
+every app. In shared-core mode they are emitted once as a versioned local
+path package, packages/gloven_core, and apps depend on it through a path
+dependency and `package:gloven_core/...` imports instead of carrying their
+own copies. A fix to the runtime is then a re-sync of one package rather
+than a regeneration of the fleet, and the analyzer and compiler see one
+library instead of a hundred.
+
+Bump CORE_VERSION when the runtime's API changes.
+
+Usage:
+    core_package.py [--workspace] [--dir packages/gloven_core]
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+import pub_workspace
+import template_sync
+
+CORE_NAME = "gloven_core"
+CORE_VERSION = "1.0.0"
+CORE_DIR = pub_workspace.PACKAGES_DIR / CORE_NAME
+CORE_IMPORT = f"package:{CORE_NAME}/"
+CORE_SUBDIRS = template_sync.SHARED_SUBDIRS
+# Hosted packages the runtime itself imports
+CORE_DEPENDENCIES = ("provider", "shared_preferences", "audioplayers", "vibration")
+
+def import_prefix(shared_core, relative=""):
+    """Prefix of core imports in generated code ("../", "" or package:gloven_core/)"""
+    return CORE_IMPORT if shared_core else relative
+
+def app_dependency(app_dir, core_dir=CORE_DIR):
+    """{"gloven_core": {"path": ...}} for an app's dependencies block"""
+    return {CORE_NAME: {"path": Path(os.path.relpath(core_dir, app_dir)).as_posix()}}
+
+def render_pubspec(workspace=False):
+    """pubspec.yaml of the core package"""
+    template_deps = pub_workspace.template_dependencies()
+    lines = [
+        f"name: {CORE_NAME}",
+        "description: Settings, sound and vibration runtime shared by all Gloven games",
+        f"version: {CORE_VERSION}",
+        "publish_to: 'none'",
+        "",
+        "environment:",
+        f"  sdk: {pub_workspace.template_sdk()}",
+        *(["resolution: workspace"] if workspace else []),
+        "",
+        "dependencies:",
+        "  flutter:",
+        "    sdk: flutter",
+        *(f"  {name}: {template_deps[name]}" for name in CORE_DEPENDENCIES),
+    ]
+    return "\n".join(lines) + "\n"
+
+def write_package(core_dir=CORE_DIR, workspace=False, template_lib=template_sync.TEMPLATE_LIB):
+    """Create or refresh the core package from the template; returns sync outcome counts"""
+    core_dir = Path(core_dir)
+    counts = template_sync.sync_app(core_dir, template_lib, CORE_SUBDIRS)
+    if template_sync.write_text_if_changed(core_dir / "pubspec.yaml", render_pubspec(workspace)):
+        counts["pubspec"] = 1
+    if workspace:
+        pub_workspace.drop_member_resolution(core_dir)
+    return counts
+
+def uses_core(app_dir):
+    """Whether an app depends on the core package"""
+    pubspec = Path(app_dir) / "pubspec.yaml"
+    return pubspec.exists() and f"\n  {CORE_NAME}:" in pubspec.read_text()
+
+def package_files(core_dir=CORE_DIR):
+    """Files of the core package that end up in every app build"""
+    core_dir = Path(core_dir)
+    return [core_dir / "pubspec.yaml"] + sorted((core_dir / "lib").rglob("*.dart"))
+
+def remove_app_copies(app_dir, template_lib=template_sync.TEMPLATE_LIB):
+    """Delete an app's own copies of the core files; returns the number removed"""
+    removed = 0
+    for _, dest in template_sync.sync_pairs(app_dir, template_lib, CORE_SUBDIRS):
+        if dest.exists():
+            dest.unlink()
+            removed += 1
+    for subdir in CORE_SUBDIRS:
+        path = Path(app_dir) / "lib" / subdir
+        if path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or refresh the shared gloven_core package")
+    parser.add_argument("--dir", default=str(CORE_DIR))
+    parser.add_argument("--workspace", action="store_true",
+                        help="Declare the package a member of the root pub workspace")
+    args = parser.parse_args()
+
+    counts = write_package(args.dir, args.workspace or pub_workspace.is_workspace_root())
+    print(f"✅ {CORE_NAME} {CORE_VERSION} at {args.dir}: "
+          + ", ".join(f"{v} {k}" for k, v in sorted(counts.items())))
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,22 @@
 #!/bin/bash
 # Script to create a Flutter app template with org.gloven package
+# GLOVEN_PLATFORMS=android creates only the platforms the workflows ship
+# The app's name and directory follow the fleet layout (see app_layout.py)
 
 APP_NUMBER=$1
-APP_NAME="app$(printf "%02d" $APP_NUMBER)"
-PACKAGE_NAME="org.gloven.${APP_NAME}"
-APP_DIR="apps/${APP_NAME}"
 
 if [ -z "$APP_NUMBER" ]; then
-    echo "Usage: $0 <app_number>"
+    echo "Usage: [GLOVEN_PLATFORMS=all|android] $0 <app_number>"
     exit 1
 fi
 
-echo "Creating Flutter app: $APP_NAME with package: $PACKAGE_NAME"
+read APP_NAME APP_DIR < <(python3 "$(dirname $0)/app_layout.py" path "$APP_NUMBER") || exit 1
+PACKAGE_NAME="org.gloven.${APP_NAME}"
 
-# Create Flutter app
-flutter create --org org.gloven --project-name $APP_NAME $APP_DIR
+echo "Creating Flutter app: $APP_NAME with package: $PACKAGE_NAME"
 
-# Wait for files to be created
-sleep 2
+# Create Flutter app from the cached `flutter create` skeleton
+timeout "${STAGE_TIMEOUT_CREATE:-600}" python3 "$(dirname $0)/flutter_skeleton.py" "$APP_DIR" "$APP_NAME" org.gloven --platforms "${GLOVEN_PLATFORMS:-all}" || exit 1
 
 # Update pubspec.yaml - fix description
 python3 -c "
@@ -44,8 +43,9 @@ with open(file_path, 'w') as f:
 "
 
 # Update Android package name and signing in build.gradle.kts (Kotlin DSL)
-if [ -f "$APP_DIR/android/app/build.gradle.kts" ]; then
-    python3 "$(dirname $0)/update_build_gradle.py" "$APP_DIR/android/app/build.gradle.kts" "$PACKAGE_NAME"
+# Batch callers set SKIP_GRADLE_PATCH=1 and run `update_build_gradle.py --batch` once
+if [ -f "$APP_DIR/android/app/build.gradle.kts" ] && [ "${SKIP_GRADLE_PATCH:-0}" != "1" ]; then
+    timeout "${STAGE_TIMEOUT_PATCH:-60}" python3 "$(dirname $0)/update_build_gradle.py" "$APP_DIR/android/app/build.gradle.kts" "$PACKAGE_NAME"
 fi
 
 # Update AndroidManifest.xml package (if needed)
@@ -9,12 +9,14 @@ import subprocess
 import json
 from pathlib import Path
 
+import app_layout
+
 def create_complete_game(app_num, game_name, game_type, instructions, game_logic_template):
     """Create a complete game with all features"""
     
-    app_name = f"app{app_num:02d}"
+    app_name = app_layout.app_name(app_num)
     package_name = f"org.gloven.{app_name}"
-    app_dir = Path(f"apps/{app_name}")
+    app_dir = app_layout.app_dir(app_name)
     
     print(f"Creating game {app_num}/100: {game_name}...")
     
@@ -4,332 +4,156 @@ Create a complete game app with all features and unique game logic
 """
 
 import os
-import shutil
 import subprocess
 from pathlib import Path
 import json
+import sys
 
-def create_complete_game_app(app_num, game_name, game_type, instructions):
-    """Create a complete game app with unique implementation"""
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app_layout
+import blob_store
+import core_package
+import dart_templates
+import fleet_walk
+import flutter_skeleton
+import pub_workspace
+import template_sync
+import tracing
+from update_build_gradle import update_build_gradle
+
+# File hashes for this (worker) process: template sources are read once, not once per app
+_hashes = fleet_walk.HashCache()
+
+def create_complete_game_app(app_num, game_name, game_type, instructions, store_dir=None,
+                             workspace=False, shared_core=False,
+                             platforms=flutter_skeleton.DEFAULT_PROFILE):
+    """Create a complete game app with unique implementation
+    
+    If store_dir is given, the finished tree is ingested into that
+    content-addressed blob store (see blob_store.py). With workspace, the
+    app is set up as a member of the root pub workspace (see pub_workspace.py).
+    With shared_core, the app imports the common runtime from the
+    gloven_core package (see core_package.py) instead of carrying a copy.
+    platforms is the flutter_skeleton platform profile the app keeps.
+    """
     
-    app_name = f"app{app_num:02d}"
+    app_name = app_layout.app_name(app_num)
     package_name = f"org.gloven.{app_name}"
-    app_dir = Path(f"apps/{app_name}")
+    app_dir = app_layout.app_dir(app_name)
     
     print(f"Creating {app_num}/100: {game_name}...")
     
-    # Step 1: Create Flutter app structure (if not exists)
-    if not app_dir.exists():
-        subprocess.run(
-            ["flutter", "create", "--org", "org.gloven", "--project-name", app_name, str(app_dir)],
-            check=True,
-            capture_output=True
-        )
-    
-    # Step 2: Update pubspec.yaml with game dependencies
-    pubspec_path = app_dir / "pubspec.yaml"
-    if pubspec_path.exists():
-        content = pubspec_path.read_text()
-        if "audioplayers" not in content:
-            # Add dependencies
-            deps_section = """
-dependencies:
-  provider: ^6.1.1
-  shared_preferences: ^2.2.2
-  audioplayers: ^5.2.1
-  vibration: ^1.8.4
-"""
-            # Insert after existing dependencies
-            lines = content.split('\n')
-            new_lines = []
-            in_deps = False
-            for line in lines:
-                if line.strip().startswith('dependencies:'):
-                    in_deps = True
-                    new_lines.append(line)
-                elif in_deps and line.strip() and not line.startswith(' ') and not line.startswith('\t'):
-                    # End of dependencies
-                    new_lines.append(deps_section.strip())
-                    in_deps = False
-                    new_lines.append(line)
-                else:
-                    new_lines.append(line)
-            pubspec_path.write_text('\n'.join(new_lines))
-    
-    # Step 3: Create game structure
-    lib_dir = app_dir / "lib"
-    lib_dir.mkdir(exist_ok=True)
-    
-    models_dir = lib_dir / "models"
-    providers_dir = lib_dir / "providers"
-    screens_dir = lib_dir / "screens"
-    utils_dir = lib_dir / "utils"
-    
-    for d in [models_dir, providers_dir, screens_dir, utils_dir]:
-        d.mkdir(exist_ok=True)
-    
-    # Step 4: Copy template files
-    template_dir = Path("templates/game_base/lib")
-    if template_dir.exists():
-        # Copy models
-        for file in (template_dir / "models").glob("*.dart"):
-            shutil.copy(file, models_dir / file.name)
-        # Copy providers
-        for file in (template_dir / "providers").glob("*.dart"):
-            shutil.copy(file, providers_dir / file.name)
-        # Copy utils
-        for file in (template_dir / "utils").glob("*.dart"):
-            shutil.copy(file, utils_dir / file.name)
-    
-    # Step 5: Generate game-specific screens
-    generate_game_screens(app_dir, game_name, game_type, instructions, app_num)
-    
-    # Step 6: Update main.dart
-    generate_main_dart(app_dir, game_name, game_type, instructions)
-    
-    # Step 7: Update Android package name
-    subprocess.run(
-        ["python3", "scripts/update_build_gradle.py", 
-         str(app_dir / "android" / "app" / "build.gradle.kts"), package_name],
-        check=False
-    )
+    with tracing.span("app", app=app_name):
+        # Files linked into the blob store must not be rewritten in place
+        if store_dir and app_dir.exists():
+            with tracing.span("blob_detach"):
+                blob_store.detach_app(app_dir)
+        
+        # Step 1: Create Flutter app structure (if not exists) from the cached skeleton,
+        # or drop the platforms an existing app no longer ships
+        if not app_dir.exists():
+            with tracing.span("flutter_create"):
+                flutter_skeleton.create_app(app_dir, app_name, "org.gloven", platforms)
+        else:
+            with tracing.span("platform_prune"):
+                flutter_skeleton.prune_app(app_dir, platforms)
+        
+        # Step 2: Update pubspec.yaml with game dependencies
+        pubspec_path = app_dir / "pubspec.yaml"
+        if pubspec_path.exists():
+            with tracing.span("pubspec"):
+                dependencies = pub_workspace.template_dependencies()
+                if shared_core:
+                    dependencies.update(core_package.app_dependency(app_dir))
+                pub_workspace.update_app_pubspec(pubspec_path, dependencies, workspace)
+                if workspace:
+                    pub_workspace.drop_member_resolution(app_dir)
+        
+        # Step 3: Create game structure
+        lib_dir = app_dir / "lib"
+        lib_dir.mkdir(exist_ok=True)
+        
+        models_dir = lib_dir / "models"
+        providers_dir = lib_dir / "providers"
+        screens_dir = lib_dir / "screens"
+        utils_dir = lib_dir / "utils"
+        
+        for d in [screens_dir] if shared_core else [models_dir, providers_dir, screens_dir, utils_dir]:
+            d.mkdir(exist_ok=True)
+        
+        # Step 4: Sync shared template files (unchanged files are skipped),
+        # or drop them when the app uses the shared core package
+        template_dir = Path("templates/game_base/lib")
+        with tracing.span("template_sync"):
+            if shared_core:
+                core_package.remove_app_copies(app_dir, template_dir)
+            elif template_dir.exists():
+                template_sync.sync_app(app_dir, template_dir, ("models", "providers", "utils"),
+                                       hashes=_hashes)
+        
+        # Step 5: Generate game-specific screens
+        generate_game_screens(app_dir, game_name, game_type, instructions, app_num, shared_core)
+        
+        # Step 6: Update main.dart
+        with tracing.span("main_dart"):
+            generate_main_dart(app_dir, game_name, game_type, instructions, shared_core)
+        
+        # Step 7: Update Android package name (in-process tree edit, no subprocess)
+        build_gradle = app_dir / "android" / "app" / "build.gradle.kts"
+        if build_gradle.exists():
+            with tracing.span("build_gradle"):
+                update_build_gradle(build_gradle, package_name)
+        
+        # Step 8: Deduplicate the tree into the shared blob store
+        if store_dir:
+            with tracing.span("blob_ingest"):
+                blob_store.ingest_app(app_dir, store_dir, hashes=_hashes)
     
     print(f"✅ {game_name} created")
     return True
 
-def generate_game_screens(app_dir, game_name, game_type, instructions, app_num):
+def render_game_screens(game_name, game_type, instructions, app_num, shared_core=False):
+    """Render all screens of one app in memory (file name -> Dart source)"""
+    return {
+        "tutorial_screen.dart": generate_tutorial_screen(game_name, game_type, instructions),
+        "game_screen.dart": generate_game_screen(game_name, game_type, app_num, shared_core),
+        "home_screen.dart": generate_home_screen(game_name, game_type, shared_core),
+        "settings_screen.dart": generate_settings_screen(shared_core),
+    }
+
+def generate_game_screens(app_dir, game_name, game_type, instructions, app_num, shared_core=False):
     """Generate game-specific screens"""
     screens_dir = app_dir / "lib" / "screens"
-    
-    # Generate tutorial screen
-    tutorial_code = generate_tutorial_screen(game_name, game_type, instructions)
-    (screens_dir / "tutorial_screen.dart").write_text(tutorial_code)
-    
-    # Generate game screen with unique logic
-    game_code = generate_game_screen(game_name, game_type, app_num)
-    (screens_dir / "game_screen.dart").write_text(game_code)
-    
-    # Generate home screen
-    home_code = generate_home_screen(game_name, game_type)
-    (screens_dir / "home_screen.dart").write_text(home_code)
-    
-    # Generate settings screen (copy from template)
-    settings_code = generate_settings_screen()
-    (screens_dir / "settings_screen.dart").write_text(settings_code)
+    with tracing.span("render_screens"):
+        screens = render_game_screens(game_name, game_type, instructions, app_num, shared_core)
+    with tracing.span("write_screens"):
+        for file_name, code in screens.items():
+            template_sync.write_text_if_changed(screens_dir / file_name, code)
 
 def generate_tutorial_screen(game_name, game_type, instructions):
     """Generate tutorial screen code"""
     instructions_list = ',\n        '.join([f'"{inst}"' for inst in instructions])
-    game_type_upper = game_type.upper()
-    return f'''import 'package:flutter/material.dart';
-
-class TutorialScreen extends StatelessWidget {{
-  const TutorialScreen({{super.key}});
-
-  @override
-  Widget build(BuildContext context) {{
-    return Scaffold(
-      appBar: AppBar(
-        title: Text('How to Play: {game_name}'),
-      ),
-      body: SingleChildScrollView(
-        padding: const EdgeInsets.all(16),
-        child: Column(
-          crossAxisAlignment: CrossAxisAlignment.start,
-          children: [
-            Text(
-              'Game Type: {game_type_upper}',
-              style: Theme.of(context).textTheme.titleLarge,
-            ),
-            const SizedBox(height: 24),
-            const Text(
-              'Instructions:',
-              style: TextStyle(fontSize: 20, fontWeight: FontWeight.bold),
-            ),
-            const SizedBox(height: 16),
-            ...{instructions_list}.asMap().entries.map((entry) {{
-              return Padding(
-                padding: const EdgeInsets.only(bottom: 12),
-                child: Row(
-                  crossAxisAlignment: CrossAxisAlignment.start,
-                  children: [
-                    Container(
-                      width: 24,
-                      height: 24,
-                      decoration: BoxDecoration(
-                        color: Theme.of(context).primaryColor,
-                        shape: BoxShape.circle,
-                      ),
-                      child: Center(
-                        child: Text(
-                          '${{entry.key + 1}}',
-                          style: const TextStyle(
-                            color: Colors.white,
-                            fontSize: 12,
-                            fontWeight: FontWeight.bold,
-                          ),
-                        ),
-                      ),
-                    ),
-                    const SizedBox(width: 12),
-                    Expanded(
-                      child: Text(
-                        entry.value,
-                        style: const TextStyle(fontSize: 16),
-                      ),
-                    ),
-                  ],
-                ),
-              );
-            }}),
-            const SizedBox(height: 24),
-            SizedBox(
-              width: double.infinity,
-              child: ElevatedButton(
-                onPressed: () => Navigator.pop(context),
-                child: const Text('Got it! Let\\'s Play'),
-              ),
-            ),
-          ],
-        ),
-      ),
-    );
-  }}
-}}
-'''
+    return dart_templates.render(
+        "tutorial_screen",
+        game_name=game_name,
+        game_type_upper=game_type.upper(),
+        instructions_list=instructions_list,
+    )
 
-def generate_game_screen(game_name, game_type, app_num):
+def generate_game_screen(game_name, game_type, app_num, shared_core=False):
     """Generate game screen with unique logic"""
-    # This will be customized based on game type and name
-    return f'''import 'package:flutter/material.dart';
-import 'package:provider/provider.dart';
-import '../providers/settings_provider.dart';
-import '../utils/sound_manager.dart';
-import '../utils/vibration_manager.dart';
-import 'dart:math';
-import 'dart:async';
-
-class GameScreen extends StatefulWidget {{
-  const GameScreen({{super.key}});
-
-  @override
-  State<GameScreen> createState() => _GameScreenState();
-}}
-
-class _GameScreenState extends State<GameScreen> {{
-  int _score = 0;
-  int _bestScore = 0;
-  bool _gameActive = false;
-  String _gameStatus = 'Tap to Start';
-  
-  // Game-specific variables
-  {get_game_state_vars(game_name, game_type)}
-  
-  @override
-  void initState() {{
-    super.initState();
-    _loadBestScore();
-    {get_game_init_logic(game_name, game_type)}
-  }}
-  
-  Future<void> _loadBestScore() async {{
-    // Load from SharedPreferences
-    setState(() => _bestScore = 0);
-  }}
-  
-  Future<void> _saveBestScore() async {{
-    if (_score > _bestScore) {{
-      setState(() => _bestScore = _score);
-    }}
-  }}
-  
-  void _startGame() {{
-    setState(() {{
-      _gameActive = true;
-      _score = 0;
-      _gameStatus = 'Playing...';
-    }});
-    {get_game_start_logic(game_name, game_type)}
-    SoundManager.playSound('success', context);
-    VibrationManager.vibrate(context, duration: 100);
-  }}
-  
-  void _gameAction() async {{
-    if (!_gameActive) {{
-      _startGame();
-      return;
-    }}
-    
-    try {{
-      final settings = Provider.of<SettingsProvider>(context, listen: false);
-      {get_game_action_logic(game_name, game_type)}
-      
-      await SoundManager.playSound('tap', context);
-      await VibrationManager.vibrate(context, duration: 50);
-    }} catch (e) {{
-      debugPrint('Game error: $e');
-    }}
-  }}
-  
-  {get_game_specific_methods(game_name, game_type)}
-  
-  @override
-  Widget build(BuildContext context) {{
-    return Scaffold(
-      appBar: AppBar(
-        title: Text('{game_name}'),
-        leading: IconButton(
-          icon: const Icon(Icons.arrow_back),
-          onPressed: () => Navigator.pop(context),
-        ),
-      ),
-      body: SafeArea(
-        child: Column(
-          children: [
-            Container(
-              padding: const EdgeInsets.all(16),
-              child: Row(
-                mainAxisAlignment: MainAxisAlignment.spaceAround,
-                children: [
-                  _scoreCard('Score', _score),
-                  _scoreCard('Best', _bestScore),
-                ],
-              ),
-            ),
-            Expanded(
-              child: Center(
-                child: Column(
-                  mainAxisAlignment: MainAxisAlignment.center,
-                  children: [
-                    Text(
-                      _gameStatus,
-                      style: Theme.of(context).textTheme.headlineMedium,
-                    ),
-                    const SizedBox(height: 48),
-                    {get_game_ui(game_name, game_type)}
-                  ],
-                ),
-              ),
-            ),
-          ],
-        ),
-      ),
-    );
-  }}
-  
-  Widget _scoreCard(String label, int value) {{
-    return Column(
-      children: [
-        Text(label),
-        Text(
-          '$value',
-          style: const TextStyle(fontSize: 24, fontWeight: FontWeight.bold),
-        ),
-      ],
-    );
-  }}
-}}
-'''
+    return dart_templates.render(
+        "game_screen",
+        core=core_package.import_prefix(shared_core, "../"),
+        game_name=game_name,
+        state_vars=get_game_state_vars(game_name, game_type),
+        init_logic=get_game_init_logic(game_name, game_type),
+        start_logic=get_game_start_logic(game_name, game_type),
+        action_logic=get_game_action_logic(game_name, game_type),
+        methods=get_game_specific_methods(game_name, game_type),
+        ui=get_game_ui(game_name, game_type),
+    )
 
 def get_game_state_vars(game_name, game_type):
     """Get game-specific state variables"""
@@ -504,242 +328,57 @@ def get_game_ui(game_name, game_type):
                     ),
                     """)
 
-def generate_home_screen(game_name, game_type):
+def generate_home_screen(game_name, game_type, shared_core=False):
     """Generate home screen"""
-    return f'''import 'package:flutter/material.dart';
-import 'package:provider/provider.dart';
-import '../providers/settings_provider.dart';
-import '../utils/sound_manager.dart';
-import '../utils/vibration_manager.dart';
-import 'game_screen.dart';
-import 'settings_screen.dart';
-import 'tutorial_screen.dart';
-
-class HomeScreen extends StatelessWidget {{
-  const HomeScreen({{super.key}});
-
-  @override
-  Widget build(BuildContext context) {{
-    final settingsProvider = Provider.of<SettingsProvider>(context);
-    
-    return Scaffold(
-      appBar: AppBar(
-        title: Text('{game_name}'),
-        actions: [
-          IconButton(
-            icon: const Icon(Icons.settings),
-            onPressed: () async {{
-              await SoundManager.playSound('tap', context);
-              await VibrationManager.vibrate(context);
-              Navigator.push(
-                context,
-                MaterialPageRoute(builder: (_) => const SettingsScreen()),
-              );
-            }},
-          ),
-        ],
-      ),
-      body: Center(
-        child: Column(
-          mainAxisAlignment: MainAxisAlignment.center,
-          children: [
-            const Icon(
-              Icons.sports_esports,
-              size: 100,
-              color: Colors.blue,
-            ),
-            const SizedBox(height: 24),
-            Text(
-              '{game_name}',
-              style: const TextStyle(fontSize: 32, fontWeight: FontWeight.bold),
-            ),
-            const SizedBox(height: 48),
-            ElevatedButton.icon(
-              onPressed: () async {{
-                await SoundManager.playSound('tap', context);
-                await VibrationManager.vibrate(context);
-                Navigator.push(
-                  context,
-                  MaterialPageRoute(builder: (_) => const GameScreen()),
-                );
-              }},
-              icon: const Icon(Icons.play_arrow),
-              label: const Text('Play Game'),
-              style: ElevatedButton.styleFrom(
-                padding: const EdgeInsets.symmetric(horizontal: 32, vertical: 16),
-              ),
-            ),
-            const SizedBox(height: 16),
-            OutlinedButton.icon(
-              onPressed: () async {{
-                await SoundManager.playSound('tap', context);
-                await VibrationManager.vibrate(context);
-                Navigator.push(
-                  context,
-                  MaterialPageRoute(builder: (_) => const TutorialScreen()),
-                );
-              }},
-              icon: const Icon(Icons.help_outline),
-              label: const Text('How to Play'),
-              style: OutlinedButton.styleFrom(
-                padding: const EdgeInsets.symmetric(horizontal: 32, vertical: 16),
-              ),
-            ),
-            const SizedBox(height: 32),
-            Text(
-              'Difficulty: ${{settingsProvider.difficulty.toUpperCase()}}',
-              style: Theme.of(context).textTheme.titleMedium,
-            ),
-          ],
-        ),
-      ),
-    );
-  }}
-}}
-'''
+    return dart_templates.render("home_screen", game_name=game_name,
+                                 core=core_package.import_prefix(shared_core, "../"))
 
-def generate_settings_screen():
+def generate_settings_screen(shared_core=False):
     """Generate settings screen"""
-    return '''import 'package:flutter/material.dart';
-import 'package:provider/provider.dart';
-import '../providers/settings_provider.dart';
+    return dart_templates.render("settings_screen", core=core_package.import_prefix(shared_core, "../"))
 
-class SettingsScreen extends StatelessWidget {
-  const SettingsScreen({super.key});
+def render_main_dart(game_name, game_type, instructions, shared_core=False):
+    """Render main.dart in memory"""
+    return dart_templates.render("main", game_name=game_name, core=core_package.import_prefix(shared_core))
 
-  @override
-  Widget build(BuildContext context) {
-    final settingsProvider = Provider.of<SettingsProvider>(context);
-    
-    return Scaffold(
-      appBar: AppBar(
-        title: const Text('Settings'),
-      ),
-      body: ListView(
-        padding: const EdgeInsets.all(16),
-        children: [
-          Card(
-            child: SwitchListTile(
-              title: const Text('Dark Mode'),
-              subtitle: const Text('Toggle dark theme'),
-              value: settingsProvider.darkMode,
-              onChanged: (_) => settingsProvider.toggleDarkMode(),
-            ),
-          ),
-          const SizedBox(height: 8),
-          Card(
-            child: SwitchListTile(
-              title: const Text('Sound'),
-              subtitle: const Text('Enable/disable sound effects'),
-              value: settingsProvider.soundEnabled,
-              onChanged: (_) => settingsProvider.toggleSound(),
-            ),
-          ),
-          const SizedBox(height: 8),
-          Card(
-            child: SwitchListTile(
-              title: const Text('Vibration'),
-              subtitle: const Text('Enable/disable vibration'),
-              value: settingsProvider.vibrationEnabled,
-              onChanged: (_) => settingsProvider.toggleVibration(),
-            ),
-          ),
-          const SizedBox(height: 8),
-          Card(
-            child: Padding(
-              padding: const EdgeInsets.all(16),
-              child: Column(
-                crossAxisAlignment: CrossAxisAlignment.start,
-                children: [
-                  const Text(
-                    'Difficulty Level',
-                    style: TextStyle(fontSize: 16, fontWeight: FontWeight.bold),
-                  ),
-                  const SizedBox(height: 8),
-                  SegmentedButton<String>(
-                    segments: const [
-                      ButtonSegment(value: 'easy', label: Text('Easy')),
-                      ButtonSegment(value: 'medium', label: Text('Medium')),
-                      ButtonSegment(value: 'hard', label: Text('Hard')),
-                    ],
-                    selected: {settingsProvider.difficulty},
-                    onSelectionChanged: (Set<String> newSelection) {
-                      settingsProvider.setDifficulty(newSelection.first);
-                    },
-                  ),
-                ],
-              ),
-            ),
-          ),
-        ],
-      ),
-    );
-  }
-}
-'''
-
-def generate_main_dart(app_dir, game_name, game_type, instructions):
+def generate_main_dart(app_dir, game_name, game_type, instructions, shared_core=False):
     """Generate main.dart"""
-    main_code = f'''import 'package:flutter/material.dart';
-import 'package:provider/provider.dart';
-import 'providers/settings_provider.dart';
-import 'screens/home_screen.dart';
-import 'utils/sound_manager.dart';
-
-void main() async {{
-  WidgetsFlutterBinding.ensureInitialized();
-  await SoundManager.initialize();
-  
-  runApp(
-    ChangeNotifierProvider(
-      create: (_) => SettingsProvider()..loadSettings(),
-      child: const GameApp(),
-    ),
-  );
-}}
-
-class GameApp extends StatelessWidget {{
-  const GameApp({{super.key}});
-
-  @override
-  Widget build(BuildContext context) {{
-    return Consumer<SettingsProvider>(
-      builder: (context, settingsProvider, _) {{
-        return MaterialApp(
-          title: '{game_name}',
-          debugShowCheckedModeBanner: false,
-          theme: ThemeData(
-            colorScheme: ColorScheme.fromSeed(seedColor: Colors.blue),
-            useMaterial3: true,
-          ),
-          darkTheme: ThemeData(
-            colorScheme: ColorScheme.fromSeed(
-              seedColor: Colors.blue,
-              brightness: Brightness.dark,
-            ),
-            useMaterial3: true,
-          ),
-          themeMode: settingsProvider.darkMode ? ThemeMode.dark : ThemeMode.light,
-          home: const HomeScreen(),
-        );
-      }},
-    );
-  }}
-}}
-'''
-    (app_dir / "lib" / "main.dart").write_text(main_code)
+    template_sync.write_text_if_changed(app_dir / "lib" / "main.dart",
+                                        render_main_dart(game_name, game_type, instructions, shared_core))
 
 # Main execution
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 5:
-        print("Usage: create_complete_game_app.py <app_num> <game_name> <game_type> <instructions_json>")
+    args = sys.argv[1:]
+    store_dir = None
+    if "--store" in args:
+        i = args.index("--store")
+        store_dir = args[i + 1] if i + 1 < len(args) else str(blob_store.STORE_DIR)
+        del args[i:i + 2]
+    workspace = "--workspace" in args
+    if workspace:
+        args.remove("--workspace")
+    shared_core = "--shared-core" in args
+    if shared_core:
+        args.remove("--shared-core")
+    platforms = flutter_skeleton.DEFAULT_PROFILE
+    if "--platforms" in args:
+        i = args.index("--platforms")
+        platforms = args[i + 1] if i + 1 < len(args) else "android"
+        del args[i:i + 2]
+    if platforms == flutter_skeleton.DEFAULT_PROFILE:
+        flutter_skeleton.check_default_profile()
+    if len(args) != 4 or platforms not in flutter_skeleton.PLATFORM_PROFILES:
+        print("Usage: create_complete_game_app.py <app_num> <game_name> <game_type> <instructions_json> "
+              "[--store DIR] [--workspace] [--shared-core] [--platforms PROFILE]")
         sys.exit(1)
     
-    app_num = int(sys.argv[1])
-    game_name = sys.argv[2]
-    game_type = sys.argv[3]
-    instructions = json.loads(sys.argv[4])
+    app_num = int(args[0])
+    game_name = args[1]
+    game_type = args[2]
+    instructions = json.loads(args[3])
     
-    create_complete_game_app(app_num, game_name, game_type, instructions)
+    if shared_core:
+        core_package.write_package(workspace=workspace)
+    create_complete_game_app(app_num, game_name, game_type, instructions, store_dir, workspace, shared_core,
+                             platforms)
 
@@ -1,24 +1,27 @@
 #!/bin/bash
 # Script to create a Flutter game app with all required features
+# The app's name and directory follow the fleet layout (see app_layout.py)
 
 APP_NUMBER=$1
 GAME_NAME=$2
 GAME_TYPE=$3
-PACKAGE_NAME="org.gloven.app$(printf "%02d" $APP_NUMBER)"
-APP_DIR="apps/app$(printf "%02d" $APP_NUMBER)"
 
 if [ -z "$APP_NUMBER" ] || [ -z "$GAME_NAME" ] || [ -z "$GAME_TYPE" ]; then
     echo "Usage: $0 <app_number> <game_name> <game_type>"
     exit 1
 fi
 
+read APP_NAME APP_DIR < <(python3 "$(dirname $0)/app_layout.py" path "$APP_NUMBER") || exit 1
+PACKAGE_NAME="org.gloven.${APP_NAME}"
+
 echo "Creating game: $GAME_NAME ($GAME_TYPE) - $PACKAGE_NAME"
 
 # Remove existing app if it exists
 rm -rf $APP_DIR
 
 # Create Flutter app
-flutter create --org org.gloven --project-name app$(printf "%02d" $APP_NUMBER) $APP_DIR
+mkdir -p "$(dirname "$APP_DIR")"
+flutter create --org org.gloven --project-name $APP_NAME $APP_DIR
 
 # Wait for files
 sleep 2
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compiled templates for Dart code generation
+
+Each templates/game_base/codegen/*.dart.tmpl file is parsed once into a
+render function whose keyword arguments are the template's {{slot}} names.
+Rendered output is memoized on the slot values, so rendering the same screen
+for many apps is a dictionary lookup after the first call.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "game_base" / "codegen"
+TEMPLATE_SUFFIX = ".dart.tmpl"
+
+SLOT_RE = re.compile(r'\{\{(\w+)\}\}')
+
+def compile_template(source, name="<template>"):
+    """Compile template text into render(**slots) -> str"""
+    parts = SLOT_RE.split(source)
+    literals = parts[0::2]
+    slots = parts[1::2]
+
+    pieces = []
+    for i, literal in enumerate(literals):
+        if literal:
+            pieces.append(repr(literal))
+        if i < len(slots):
+            pieces.append(slots[i])
+    params = ", ".join(sorted(set(slots)))
+    signature = f"*, {params}" if params else ""
+    body = " + ".join(pieces) if pieces else "''"
+    code = f"def render({signature}):\n    return {body}\n"
+
+    namespace = {}
+    exec(compile(code, f"<{name}>", "exec"), namespace)
+    render = namespace["render"]
+    render.slots = tuple(sorted(set(slots)))
+    return render
+
+@lru_cache(maxsize=None)
+def load(name):
+    """Compiled render function for templates/game_base/codegen/<name>.dart.tmpl"""
+    path = TEMPLATE_DIR / f"{name}{TEMPLATE_SUFFIX}"
+    return compile_template(path.read_text(), path.name)
+
+@lru_cache(maxsize=4096)
+def _render_cached(name, slot_items):
+    return load(name)(**dict(slot_items))
+
+def render(name, **slots):
+    """Render a template; identical slot values return the memoized output"""
+    return _render_cached(name, tuple(sorted(slots.items())))
+
+def template_names():
+    """Names of all available templates"""
+    return sorted(p.name[:-len(TEMPLATE_SUFFIX)] for p in TEMPLATE_DIR.glob(f"*{TEMPLATE_SUFFIX}"))
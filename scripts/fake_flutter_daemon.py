@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Scripted stand-in for `flutter daemon`
+
+Speaks the same line protocol as the real daemon (see flutter_daemon.py), so
+the client can be exercised without a Flutter SDK. It prints a plain log
+line and daemon.connected on startup, then answers:
+  - daemon.version                 the protocol version
+  - daemon.getSupportedPlatforms   the platform directories of projectRoot
+  - device.getDevices              one fake device
+  - daemon.shutdown                and exits
+  - fake.stats                     {"requests": n, "max_outstanding": n}
+Platform lookups emit an app.progress event each and are answered after a
+delay that varies with the request id, so responses come back out of order.
+Unknown methods and missing projects are answered with an error.
+
+Usage:
+    fake_flutter_daemon.py [--delay SECONDS]
+    flutter_daemon.py --daemon "python3 scripts/fake_flutter_daemon.py" platforms
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+PROTOCOL_VERSION = "0.6.1"
+PLATFORMS = ("android", "ios", "linux", "macos", "web", "windows")
+DEVICES = [{"id": "fake-device", "name": "Fake Device", "platform": "android-arm64"}]
+
+class FakeDaemon:
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def send(self, message):
+        with self.lock:
+            sys.stdout.write(json.dumps([message]) + "\n")
+            sys.stdout.flush()
+
+    def reply(self, request_id, result=None, error=None):
+        message = {"id": request_id}
+        if error is not None:
+            message["error"] = error
+        else:
+            message["result"] = result
+        self.send(message)
+
+    def supported_platforms(self, request_id, params):
+        root = params.get("projectRoot", "")
+        self.send({"event": "app.progress", "params": {"id": str(request_id), "projectRoot": root,
+                                                       "message": "Checking platforms"}})
+        # Later requests may finish first; the client matches replies by id
+        time.sleep(self.delay * (request_id * 7 % 5))
+        # No longer outstanding once the reply is on its way
+        with self.lock:
+            self.outstanding -= 1
+        if not os.path.isdir(root):
+            self.reply(request_id, error=f"{root} is not a Flutter project")
+        else:
+            platforms = [p for p in PLATFORMS if os.path.isdir(os.path.join(root, p))]
+            self.reply(request_id, {"platforms": platforms})
+
+    def handle(self, message):
+        request_id = message.get("id")
+        method = message.get("method")
+        with self.lock:
+            self.requests += 1
+        if method == "daemon.getSupportedPlatforms":
+            with self.lock:
+                self.outstanding += 1
+                self.max_outstanding = max(self.max_outstanding, self.outstanding)
+            threading.Thread(target=self.supported_platforms,
+                             args=(request_id, message.get("params", {})), daemon=True).start()
+        elif method == "daemon.version":
+            self.reply(request_id, PROTOCOL_VERSION)
+        elif method == "device.getDevices":
+            self.reply(request_id, DEVICES)
+        elif method == "fake.stats":
+            with self.lock:
+                stats = {"requests": self.requests, "max_outstanding": self.max_outstanding}
+            self.reply(request_id, stats)
+        elif method == "daemon.shutdown":
+            self.reply(request_id)
+            return False
+        else:
+            self.reply(request_id, error=f"Unknown method {method!r}")
+        return True
+
+    def run(self):
+        # Real daemons print plain text around the protocol lines
+        print("Starting fake flutter daemon...", flush=True)
+        self.send({"event": "daemon.connected", "params": {"version": PROTOCOL_VERSION, "pid": os.getpid()}})
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            for message in json.loads(line):
+                if not self.handle(message):
+                    return
+
+def main():
+    parser = argparse.ArgumentParser(description="Scripted stand-in for flutter daemon")
+    parser.add_argument("--delay", type=float, default=0.01,
+                        help="Base delay of platform lookups in seconds (default: %(default)s)")
+    args = parser.parse_args()
+    FakeDaemon(args.delay).run()
+
+if __name__ == "__main__":
+    main()
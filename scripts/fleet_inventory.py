@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Persistent inventory index of the app fleet
+
+Package id, title, launcher icons, dependency versions and hashes of the
+metadata files are cached per app in .fleet_inventory.json. An entry is
+reused as long as the mtime and size of every file it was built from are
+unchanged, so reading fleet metadata costs a handful of stat() calls per app
+instead of re-reading and regex-scanning the tree. Apps are checked on the
+fleet_walk thread pool.
+
+Usage:
+    fleet_inventory.py [--json] [--query KEY=VALUE ...] [--rebuild]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import app_layout
+import fleet_walk
+
+INDEX_FILE = Path(".fleet_inventory.json")
+INDEX_VERSION = 1
+PACKAGE_PREFIX = "org.gloven"
+
+BUILD_GRADLE = "android/app/build.gradle.kts"
+PUBSPEC = "pubspec.yaml"
+PUBSPEC_LOCK = "pubspec.lock"
+RES_DIR = "android/app/src/main/res"
+
+NAMESPACE_RE = re.compile(r'namespace\s*=\s*"([^"]+)"')
+APPLICATION_ID_RE = re.compile(r'applicationId\s*=\s*"([^"]+)"')
+DESCRIPTION_RE = re.compile(r'description:\s*(.+)')
+DEPENDENCY_SECTIONS = ("dependencies", "dev_dependencies", "dependency_overrides")
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def icon_files(app_dir):
+    """Relative paths of mipmap-*/ic_launcher.png launcher icons"""
+    # Plain os.path: this runs for every app on every refresh
+    icons = []
+    try:
+        with os.scandir(os.path.join(app_dir, RES_DIR)) as entries:
+            for entry in entries:
+                if entry.name.startswith("mipmap-") and entry.is_dir():
+                    if os.path.exists(os.path.join(entry.path, "ic_launcher.png")):
+                        icons.append(f"{RES_DIR}/{entry.name}/ic_launcher.png")
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return sorted(icons)
+
+def source_signature(app_dir):
+    """mtime/size of every file an inventory entry is derived from"""
+    app_dir = os.fspath(app_dir)
+    signature = {rel: _stat_key(os.path.join(app_dir, rel))
+                 for rel in (BUILD_GRADLE, PUBSPEC, PUBSPEC_LOCK, RES_DIR)}
+    for rel in icon_files(app_dir):
+        signature[rel] = _stat_key(os.path.join(app_dir, rel))
+    return signature
+
+def parse_dependencies(pubspec_text, section_names=DEPENDENCY_SECTIONS):
+    """Map section -> {package: constraint} from a pubspec (top-level scalars only)"""
+    sections = {}
+    current = None
+    for line in pubspec_text.split('\n'):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        if not line.startswith((' ', '\t')):
+            key = line.split(':', 1)[0].strip()
+            current = key if key in section_names else None
+            if current:
+                sections.setdefault(current, {})
+            continue
+        if current is None:
+            continue
+        indent = len(line) - len(line.lstrip())
+        name, _, value = line.strip().partition(':')
+        value = value.split('#', 1)[0].strip().strip('"\'')
+        if indent <= 2:
+            sections[current][name] = value or None
+        elif name in ("sdk", "path", "git", "version"):
+            last = next(reversed(sections[current]), None)
+            if last and sections[current][last] is None:
+                sections[current][last] = f"{name}:{value}"
+    return sections
+
+def _hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def scan_app(app_dir):
+    """Read an app's metadata from disk"""
+    app_dir = Path(app_dir)
+    app_name = app_dir.name
+    package_name = f"{PACKAGE_PREFIX}.{app_name}"
+    file_hashes = {}
+
+    build_gradle = app_dir / BUILD_GRADLE
+    if build_gradle.exists():
+        content = build_gradle.read_text()
+        file_hashes[BUILD_GRADLE] = hashlib.sha256(content.encode()).hexdigest()
+        match = NAMESPACE_RE.search(content) or APPLICATION_ID_RE.search(content)
+        if match:
+            package_name = match.group(1)
+
+    app_title = app_name
+    dependencies = {}
+    pubspec = app_dir / PUBSPEC
+    if pubspec.exists():
+        content = pubspec.read_text()
+        file_hashes[PUBSPEC] = hashlib.sha256(content.encode()).hexdigest()
+        match = DESCRIPTION_RE.search(content)
+        if match:
+            app_title = match.group(1).strip()
+        dependencies = parse_dependencies(content)
+
+    lock = app_dir / PUBSPEC_LOCK
+    if lock.exists():
+        file_hashes[PUBSPEC_LOCK] = _hash(lock)
+
+    icon_paths = icon_files(app_dir)
+    for rel in icon_paths:
+        file_hashes[rel] = _hash(app_dir / rel)
+
+    return {
+        'app_name': app_name,
+        'package_name': package_name,
+        'app_title': app_title,
+        'icon_count': len(icon_paths),
+        'icon_paths': icon_paths,
+        'dependencies': dependencies,
+        'file_hashes': file_hashes,
+    }
+
+def list_app_dirs(apps_dir="apps"):
+    """App directories in number order, wherever the layout puts them"""
+    return app_layout.list_app_dirs(apps_dir)
+
+def load_index(path=INDEX_FILE):
+    """Load the cached index (empty if missing or from an older format)"""
+    try:
+        with open(path, 'r') as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": INDEX_VERSION, "apps": {}}
+    if index.get("version") != INDEX_VERSION:
+        return {"version": INDEX_VERSION, "apps": {}}
+    return index
+
+def save_index(index, path=INDEX_FILE):
+    """Write the index atomically"""
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(index, f, sort_keys=True, separators=(',', ':'))
+    os.replace(tmp, path)
+
+def refresh_index(apps_dir="apps", path=INDEX_FILE, rebuild=False, workers=None):
+    """Bring the index up to date; returns (index, number_of_rescanned_apps)"""
+    index = {"version": INDEX_VERSION, "apps": {}} if rebuild else load_index(path)
+    cached = index["apps"]
+
+    def check(app_dir):
+        """(entry, rescanned) for one app"""
+        signature = source_signature(app_dir)
+        entry = cached.get(app_dir.name)
+        if entry is not None and entry.get("signature") == signature:
+            return entry, False
+        entry = scan_app(app_dir)
+        entry["signature"] = signature
+        return entry, True
+
+    fresh = {}
+    rescanned = 0
+    for app_dir, (entry, changed) in fleet_walk.map_roots(check, app_layout.iter_app_dirs(apps_dir), workers):
+        fresh[app_dir.name] = entry
+        rescanned += changed
+
+    if rescanned or set(fresh) != set(cached):
+        index["apps"] = fresh
+        save_index(index, path)
+    return index, rescanned
+
+def _lookup(entry, dotted_key):
+    value = entry
+    for part in dotted_key.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def query(index, filters):
+    """Entries matching every KEY=VALUE (or bare KEY existence) filter"""
+    results = []
+    for name, entry in index["apps"].items():
+        matched = True
+        for flt in filters:
+            key, sep, wanted = flt.partition('=')
+            value = _lookup(entry, key)
+            if value is None or (sep and str(value) != wanted):
+                matched = False
+                break
+        if matched:
+            results.append((app_layout.app_number(name), name, entry))
+    return [entry for _, _, entry in sorted(results, key=lambda r: r[:2])]
+
+def public_entry(entry):
+    """An index entry without its internal invalidation signature"""
+    return {k: v for k, v in entry.items() if k != "signature"}
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the fleet inventory index")
+    parser.add_argument("--json", action="store_true", help="Print matching entries as JSON")
+    parser.add_argument("--query", action="append", default=[], metavar="KEY=VALUE",
+                        help="Filter on a (dotted) field, e.g. dependencies.dependencies.vibration=^3.1.5")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cached index")
+    parser.add_argument("--apps-dir", default="apps")
+    args = parser.parse_args()
+
+    index, rescanned = refresh_index(args.apps_dir, rebuild=args.rebuild)
+    entries = [public_entry(e) for e in query(index, args.query)]
+    if args.json:
+        json.dump(entries, sys.stdout, indent=2)
+        print()
+    else:
+        for entry in entries:
+            print(f"{entry['app_name']:<10} {entry['package_name']:<35} {entry['app_title']}")
+        print(f"\n{len(entries)} apps ({rescanned} rescanned)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Shared tree walker for fleet-wide scans
+
+Inventory, build keys, the blob store and the drift report all need "every
+file of every app", and each used to re-walk the ~13k files of apps/ with
+os.walk() or Path.glob() and re-hash what it found. walk() goes through the
+tree with os.scandir, which gets file types from the directory listing,
+skips build outputs and tool caches (build/, .dart_tool/, .gradle/, ...)
+and yields (relative_path, stat) for every regular file as it goes.
+walk_fleet() walks many app roots on a thread pool and hands back one app
+at a time, in order.
+
+Content hashes come from a HashCache keyed on (device, inode, mtime, size),
+stored in $GLOVEN_CACHE_DIR/file_hashes.json, so a file is read again only
+after it changed. Files modified in the last second are hashed but not
+cached, since a second write within the same mtime tick would go unnoticed.
+
+Usage:
+    fleet_walk.py [app_dir ...] [--hash] [--workers N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import app_layout
+
+CACHE_ROOT = Path(os.environ.get("GLOVEN_CACHE_DIR", Path.home() / ".cache" / "gloven"))
+HASH_CACHE_FILE = CACHE_ROOT / "file_hashes.json"
+HASH_CACHE_VERSION = 1
+
+# Build outputs and tool caches are not part of an app's sources
+IGNORED_DIRS = frozenset({"build", ".dart_tool", ".gradle", ".idea", ".cxx"})
+
+# mtimes this close to now may still change without changing the mtime
+RACY_NS = 1_000_000_000
+
+def default_workers():
+    """Threads for walking; scans are I/O and syscall bound"""
+    return min(32, (os.cpu_count() or 1) * 4)
+
+def walk(root, subpaths=None, ignored=IGNORED_DIRS):
+    """Yield (relative_path, stat) for every regular file under root
+
+    subpaths limits the walk to some files or directories of root (e.g.
+    ("lib", "pubspec.yaml")). Directories are listed in name order and
+    symlinks are skipped.
+    """
+    root = os.fspath(root)
+    stack = []
+    for sub in reversed(subpaths or ("",)):
+        path = os.path.join(root, sub) if sub else root
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            stack.append((path, f"{sub}/" if sub else ""))
+        elif stat.S_ISREG(st.st_mode):
+            yield sub, st
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in ignored:
+                    subdirs.append((entry.path, f"{prefix}{entry.name}/"))
+            elif entry.is_file(follow_symlinks=False):
+                yield f"{prefix}{entry.name}", entry.stat(follow_symlinks=False)
+        stack.extend(reversed(subdirs))
+
+def hash_file(path):
+    """Return the sha256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class HashCache:
+    """sha256 of files, reused while inode, mtime and size are unchanged"""
+
+    def __init__(self, path=HASH_CACHE_FILE):
+        self.path = Path(path)
+        self._entries = None
+        self._added = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data.get("entries", {}) if data.get("version") == HASH_CACHE_VERSION else {}
+
+    def _load(self):
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+        return self._entries
+
+    def digest(self, path, st=None):
+        """sha256 of a file, from the cache when its stat still matches"""
+        entries = self._entries if self._entries is not None else self._load()
+        st = st or os.stat(path)
+        key = f"{st.st_dev}:{st.st_ino}"
+        cached = entries.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            with self._lock:
+                self.hits += 1
+            return cached[2]
+        digest = hash_file(path)
+        with self._lock:
+            self.misses += 1
+            if time.time_ns() - st.st_mtime_ns > RACY_NS:
+                entries[key] = self._added[key] = [st.st_mtime_ns, st.st_size, digest]
+        return digest
+
+    def save(self):
+        """Merge new hashes into the cache file (other processes may have added some)"""
+        with self._lock:
+            if not self._added:
+                return
+            entries = self._read()
+            entries.update(self._added)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = Path(f"{self.path}.{os.getpid()}.tmp")
+            with open(tmp, 'w') as f:
+                json.dump({"version": HASH_CACHE_VERSION, "entries": entries}, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+            self._added = {}
+
+def map_roots(func, roots, workers=None):
+    """Yield (root, func(root)) for every root, in order, from a thread pool
+
+    At most a few roots per worker are in flight, so results are consumed
+    as they come instead of piling up for the whole fleet.
+    """
+    workers = workers or default_workers()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for root in roots:
+            in_flight.append((root, pool.submit(func, root)))
+            if len(in_flight) >= workers * 2:
+                done_root, future = in_flight.popleft()
+                yield done_root, future.result()
+        while in_flight:
+            done_root, future = in_flight.popleft()
+            yield done_root, future.result()
+
+def walk_fleet(roots=None, hashes=None, subpaths=None, ignored=IGNORED_DIRS, workers=None):
+    """Yield (root, [(relative_path, stat, digest), ...]) per app root
+
+    roots defaults to every app of apps/. digest is None unless a HashCache
+    is given.
+    """
+    def scan(root):
+        return [(rel, st, hashes.digest(os.path.join(root, rel), st) if hashes else None)
+                for rel, st in walk(root, subpaths, ignored)]
+
+    return map_roots(scan, app_layout.iter_app_dirs() if roots is None else roots, workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk the app fleet and summarize its files")
+    parser.add_argument("apps", nargs="*", help="App directories (default: every app)")
+    parser.add_argument("--hash", action="store_true", help="Hash every file through the hash cache")
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    apps = files = size = 0
+    unique = {}
+    with HashCache() as hashes:
+        for _, entries in walk_fleet([Path(a) for a in args.apps] or None,
+                                     hashes if args.hash else None, workers=args.workers):
+            apps += 1
+            for _, st, digest in entries:
+                files += 1
+                size += st.st_size
+                if digest:
+                    unique[digest] = st.st_size
+    elapsed = time.perf_counter() - started
+
+    print(f"📦 {apps} apps, {files} files, {size / 1024 ** 2:.1f} MB in {elapsed:.2f}s")
+    if args.hash:
+        print(f"   {len(unique)} unique contents, {(size - sum(unique.values())) / 1024 ** 2:.1f} MB duplicated; "
+              f"hash cache {hashes.hits} hits, {hashes.misses} misses")
+
+if __name__ == "__main__":
+    main()
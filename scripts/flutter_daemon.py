@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Client for a long-lived `flutter daemon` session
+
+`flutter daemon` speaks JSON-RPC over stdin/stdout: every message is a
+one-element JSON list on its own line. Requests carry an id that the
+matching response echoes; events (daemon.connected, daemon.logMessage,
+app.progress, device.added, ...) arrive unsolicited. One tool process is
+started per session, so queued operations for many apps pay the tool's
+startup once instead of once per app.
+
+Requests are answered with futures, and a reader thread matches responses
+by id and hands every event to the subscribers, so progress from many
+in-flight operations comes back to the caller multiplexed on one stream.
+The command is injectable, so a scripted fake daemon (fake_flutter_daemon.py)
+can stand in for Flutter.
+
+Only what the daemon protocol offers can be batched (daemon.*, device.*,
+emulator.*); create, pub and build are not daemon methods.
+
+Usage:
+    flutter_daemon.py version
+    flutter_daemon.py platforms [app_dir ...]
+    flutter_daemon.py devices
+"""
+
+import argparse
+import itertools
+import json
+import subprocess
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from pathlib import Path
+
+import app_layout
+import flutter_skeleton
+
+CONNECT_TIMEOUT = 120
+CALL_TIMEOUT = 60
+SHUTDOWN_TIMEOUT = 10
+DEFAULT_IN_FLIGHT = 16
+
+class DaemonError(RuntimeError):
+    """The daemon answered a request with an error, or went away"""
+
+def encode(message):
+    """One protocol line for a request"""
+    return json.dumps([message], separators=(',', ':')) + "\n"
+
+def decode(line):
+    """Messages on one stdout line; [] for plain log output"""
+    line = line.strip()
+    if not (line.startswith("[{") and line.endswith("}]")):
+        return []
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return []
+
+class FlutterDaemon:
+    """One `flutter daemon` process shared by many requests"""
+
+    def __init__(self, command=None, cwd=None):
+        self.command = command or [flutter_skeleton.flutter_executable(), "daemon"]
+        self.cwd = cwd
+        self.process = None
+        self.protocol_version = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._connected = threading.Event()
+        self._reader = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self, timeout=CONNECT_TIMEOUT):
+        """Launch the daemon and wait for daemon.connected"""
+        self.process = subprocess.Popen(
+            self.command, cwd=self.cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, bufsize=1
+        )
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+        connected = self._connected.wait(timeout)
+        if self.protocol_version is None:
+            self.close()
+            reason = "exited before connecting" if connected else f"did not connect within {timeout}s"
+            raise DaemonError(f"flutter daemon {reason}")
+        return self
+
+    def subscribe(self, callback):
+        """Call callback(event, params) for every event; returns an unsubscribe function"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def request(self, method, params=None):
+        """Send a request; returns a Future of its result"""
+        future = Future()
+        request_id = next(self._ids)
+        message = {"id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        with self._lock:
+            if self.process is None or self.process.poll() is not None:
+                raise DaemonError("flutter daemon is not running")
+            self._pending[request_id] = future
+        try:
+            with self._write_lock:
+                self.process.stdin.write(encode(message))
+                self.process.stdin.flush()
+        except OSError as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise DaemonError(f"flutter daemon went away: {e}") from e
+        return future
+
+    def call(self, method, params=None, timeout=CALL_TIMEOUT):
+        """Send a request and wait for its result"""
+        return self.request(method, params).result(timeout)
+
+    def run_batch(self, method, params_list, max_in_flight=DEFAULT_IN_FLIGHT):
+        """Issue one request per params with at most max_in_flight outstanding
+
+        Yields (params, result, error) as responses arrive.
+        """
+        queue = deque(params_list)
+        in_flight = {}
+        while queue or in_flight:
+            while queue and len(in_flight) < max_in_flight:
+                params = queue.popleft()
+                in_flight[self.request(method, params)] = params
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                params = in_flight.pop(future)
+                error = future.exception()
+                yield params, None if error else future.result(), error
+
+    def close(self, timeout=SHUTDOWN_TIMEOUT):
+        """Ask the daemon to shut down, killing it if it does not"""
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            try:
+                self.request("daemon.shutdown")
+                self.process.stdin.close()
+                self.process.wait(timeout)
+            except (DaemonError, OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        if self._reader:
+            self._reader.join(timeout)
+        self._fail_pending(DaemonError("flutter daemon exited"))
+
+    def _read(self):
+        for line in self.process.stdout:
+            for message in decode(line):
+                if "event" in message:
+                    self._dispatch(message["event"], message.get("params", {}))
+                elif "id" in message:
+                    self._resolve(message)
+        self._connected.set()
+        self._fail_pending(DaemonError(f"flutter daemon exited with {self.process.wait()}"))
+
+    def _dispatch(self, event, params):
+        if event == "daemon.connected":
+            self.protocol_version = params.get("version")
+            self._connected.set()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(event, params)
+
+    def _resolve(self, message):
+        with self._lock:
+            future = self._pending.pop(message["id"], None)
+        if future is None:
+            return
+        if "error" in message:
+            future.set_exception(DaemonError(f"{message['error']}"))
+        else:
+            future.set_result(message.get("result"))
+
+    def _fail_pending(self, error):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+def supported_platforms(daemon, app_dirs, max_in_flight=DEFAULT_IN_FLIGHT):
+    """{app: [platform, ...] or DaemonError} over one session"""
+    params = [{"projectRoot": str(Path(d).resolve())} for d in app_dirs]
+    names = {p["projectRoot"]: Path(d).name for p, d in zip(params, app_dirs)}
+    results = {}
+    for request, result, error in daemon.run_batch("daemon.getSupportedPlatforms", params, max_in_flight):
+        results[names[request["projectRoot"]]] = error or sorted(result.get("platforms", []))
+    # app9 before app10; directories that are not apps go first, by name
+    return dict(sorted(results.items(), key=lambda item: (app_layout.app_number(item[0]) or 0, item[0])))
+
+def run_command(args, daemon):
+    """Run one CLI command over a daemon session"""
+    with daemon:
+        if args.verbose:
+            daemon.subscribe(lambda event, params: print(f"   {event}: {json.dumps(params)[:200]}",
+                                                         file=sys.stderr))
+        if args.command == "version":
+            print(f"flutter daemon protocol {daemon.call('daemon.version')}")
+        elif args.command == "devices":
+            for device in daemon.call("device.getDevices"):
+                print(f"{device.get('id')}: {device.get('name')} ({device.get('platform')})")
+        else:
+            app_dirs = [Path(a) for a in args.apps] or app_layout.list_app_dirs()
+            failed = 0
+            for app, platforms in supported_platforms(daemon, app_dirs).items():
+                if isinstance(platforms, DaemonError):
+                    failed += 1
+                    print(f"❌ {app}: {platforms}")
+                else:
+                    print(f"{app}: {', '.join(platforms)}")
+            sys.exit(1 if failed else 0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a single flutter daemon session")
+    parser.add_argument("command", choices=("version", "platforms", "devices"))
+    parser.add_argument("apps", nargs="*", help="App directories for platforms (default: every app)")
+    parser.add_argument("--daemon", help="Daemon command to run instead of 'flutter daemon'")
+    parser.add_argument("--verbose", action="store_true", help="Print daemon events")
+    args = parser.parse_args()
+
+    command = args.daemon.split() if args.daemon else None
+    try:
+        run_command(args, FlutterDaemon(command))
+    except DaemonError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
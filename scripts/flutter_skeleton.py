@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Cached `flutter create` skeleton
+
+`flutter create` is run once per Flutter SDK version and platform profile
+with a placeholder project name; the resulting tree is cached and every app
+is stamped out from it in Python by rewriting the project name, package id,
+MainActivity path and labels. Machine-local files that `flutter pub get`
+regenerates anyway (.dart_tool/, ephemeral dirs, Generated.xcconfig,
+local.properties) are left out of the snapshot.
+
+A platform profile names the targets an app is created with. "all" is what
+`flutter create` emits by default; "android" is the only target the
+workflows build and leaves out ~70% of an app's files. $GLOVEN_PLATFORMS
+sets the default profile. --prune removes the platforms outside a profile
+from existing apps, the same way the profile's skeleton leaves them out.
+
+Usage:
+    flutter_skeleton.py <app_dir> <app_name> [org] [--platforms PROFILE]
+    flutter_skeleton.py --warm [--platforms PROFILE]
+    flutter_skeleton.py --prune [--platforms android] [app_dir ...]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import app_layout
+import template_sync
+
+SKELETON_NAME = "glovenskeleton"
+SKELETON_ORG = "org.gloven"
+DEFAULT_ORG = "org.gloven"
+
+ALL_PLATFORMS = ("android", "ios", "linux", "macos", "web", "windows")
+PLATFORM_PROFILES = {
+    "all": ALL_PLATFORMS,
+    "android": ("android",),
+}
+DEFAULT_PROFILE = os.environ.get("GLOVEN_PLATFORMS", "all")
+
+# Timeout (seconds) for a single `flutter create` run
+CREATE_TIMEOUT = 600
+
+CACHE_DIR = Path(os.environ.get("GLOVEN_CACHE_DIR", Path.home() / ".cache" / "gloven")) / "flutter_skeleton"
+
+# Paths `flutter pub get` writes per machine; never part of the snapshot
+GENERATED_PATHS = [
+    ".dart_tool",
+    ".flutter-plugins",
+    ".flutter-plugins-dependencies",
+    "build",
+    "android/local.properties",
+    "android/.gradle",
+    "ios/Flutter/Generated.xcconfig",
+    "ios/Flutter/flutter_export_environment.sh",
+    "ios/Flutter/ephemeral",
+    "macos/Flutter/ephemeral",
+    "linux/flutter/ephemeral",
+    "windows/flutter/ephemeral",
+]
+
+# Names that map onto the snapshot with plain string substitution
+VALID_APP_NAME = re.compile(r'^[a-z][a-z0-9]*$')
+
+def title_case(name):
+    """Flutter's display-name form of a project name (app01 -> App01)"""
+    return " ".join(part[:1].upper() + part[1:] for part in name.split("_"))
+
+def flutter_executable():
+    """flutter binary to run ($FLUTTER, default: flutter on PATH)"""
+    return os.environ.get("FLUTTER", "flutter")
+
+def flutter_sdk_version():
+    """Return the installed Flutter framework version"""
+    flutter = shutil.which(flutter_executable())
+    if flutter is None:
+        raise FileNotFoundError(f"{flutter_executable()} not found (set $FLUTTER or put flutter on PATH)")
+
+    # Read the version from the SDK checkout to avoid a tool cold start
+    sdk_root = Path(os.path.realpath(flutter)).parent.parent
+    version_json = sdk_root / "bin" / "cache" / "flutter.version.json"
+    if version_json.exists():
+        with open(version_json, 'r') as f:
+            return json.load(f)["frameworkVersion"]
+    version_file = sdk_root / "version"
+    if version_file.exists():
+        return version_file.read_text().strip()
+
+    result = subprocess.run(
+        [flutter, "--version", "--machine"],
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    return json.loads(result.stdout)["frameworkVersion"]
+
+def profile_platforms(profile):
+    """Platforms of a profile; raises ValueError for an unknown one"""
+    try:
+        return PLATFORM_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown platform profile {profile!r} (choose from {', '.join(PLATFORM_PROFILES)})")
+
+def check_default_profile():
+    """Exit with a clear message when $GLOVEN_PLATFORMS names no profile
+
+    argparse does not check defaults against choices, so every entry point
+    that falls back to DEFAULT_PROFILE calls this first.
+    """
+    if DEFAULT_PROFILE not in PLATFORM_PROFILES:
+        sys.exit(f"❌ GLOVEN_PLATFORMS={DEFAULT_PROFILE!r} is not a platform profile "
+                 f"(choose from {', '.join(PLATFORM_PROFILES)})")
+
+def _create_command(project, project_name, org, profile):
+    return [flutter_executable(), "create", "--org", org, "--project-name", project_name,
+            "--platforms", ",".join(profile_platforms(profile)), str(project)]
+
+def skeleton_dir(version, profile=DEFAULT_PROFILE):
+    """Cache directory of the snapshot for one Flutter version and platform profile"""
+    profile_platforms(profile)
+    return CACHE_DIR / version / profile / SKELETON_NAME
+
+def _is_generated(rel):
+    return any(rel == p or rel.startswith(p + "/") for p in GENERATED_PATHS)
+
+def ensure_skeleton(version=None, profile=DEFAULT_PROFILE):
+    """Return the cached snapshot, running `flutter create` on a miss"""
+    version = version or flutter_sdk_version()
+    target = skeleton_dir(version, profile)
+    if target.exists():
+        return target
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    work = Path(tempfile.mkdtemp(prefix="skeleton-", dir=target.parent))
+    project = work / SKELETON_NAME
+    try:
+        subprocess.run(
+            _create_command(project, SKELETON_NAME, SKELETON_ORG, profile),
+            check=True,
+            capture_output=True,
+            timeout=CREATE_TIMEOUT
+        )
+        for path in sorted(project.rglob("*"), reverse=True):
+            rel = path.relative_to(project).as_posix()
+            if _is_generated(rel):
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path)
+                elif path.exists() or path.is_symlink():
+                    path.unlink()
+
+        # Another worker may have won the race; keep whichever landed first
+        try:
+            os.rename(project, target)
+        except OSError:
+            if not target.exists():
+                raise
+    finally:
+        # A failed or timed-out create must not leave its half-made project behind
+        shutil.rmtree(work, ignore_errors=True)
+    return target
+
+def _replacements(app_name, org):
+    package_name = f"{org}.{app_name}"
+    return [
+        (f"{SKELETON_ORG}.{SKELETON_NAME}".encode(), package_name.encode()),
+        (SKELETON_NAME.encode(), app_name.encode()),
+        (title_case(SKELETON_NAME).encode(), title_case(app_name).encode()),
+    ]
+
+def _stamp_path(rel, app_name, org):
+    """Map a snapshot-relative path onto the app's path"""
+    kotlin_root = "android/app/src/main/kotlin/"
+    skeleton_pkg = kotlin_root + f"{SKELETON_ORG}.{SKELETON_NAME}".replace(".", "/") + "/"
+    if rel.startswith(skeleton_pkg):
+        rel = kotlin_root + f"{org}.{app_name}".replace(".", "/") + "/" + rel[len(skeleton_pkg):]
+    return rel.replace(SKELETON_NAME, app_name)
+
+def stamp_app(app_dir, app_name, org=DEFAULT_ORG, version=None, profile=DEFAULT_PROFILE):
+    """Create app_dir from the cached snapshot, as `flutter create` would"""
+    if not VALID_APP_NAME.match(app_name):
+        raise ValueError(f"{app_name!r} cannot be stamped from the skeleton")
+
+    source = ensure_skeleton(version, profile)
+    app_dir = Path(app_dir)
+    for src, rel, data in stamped_files(source, app_name, org):
+        dest = app_dir / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data)
+        shutil.copymode(src, dest)
+    return app_dir
+
+def stamped_files(source, app_name, org=DEFAULT_ORG):
+    """Yield (snapshot_path, app_relative_path, data) of an app stamped from a snapshot"""
+    source = Path(source)
+    replacements = _replacements(app_name, org)
+    for dirpath, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            src = Path(dirpath) / name
+            rel = src.relative_to(source).as_posix()
+            data = src.read_bytes()
+            if b'\0' not in data:
+                for old, new in replacements:
+                    data = data.replace(old, new)
+            yield src, _stamp_path(rel, app_name, org), data
+
+def create_app(app_dir, app_name, org=DEFAULT_ORG, profile=DEFAULT_PROFILE):
+    """Stamp an app from the snapshot, falling back to `flutter create`"""
+    try:
+        return stamp_app(app_dir, app_name, org, profile=profile)
+    except ValueError:
+        subprocess.run(
+            _create_command(app_dir, app_name, org, profile),
+            check=True,
+            capture_output=True,
+            timeout=CREATE_TIMEOUT
+        )
+        return Path(app_dir)
+
+def _prune_metadata(text, keep):
+    """Drop .metadata migration entries of platforms outside keep"""
+    lines, skipping = [], False
+    for line in text.split('\n'):
+        if line.startswith("    - platform: "):
+            platform = line.split(":", 1)[1].strip()
+            skipping = platform != "root" and platform not in keep
+        elif not line.startswith("      "):
+            skipping = False
+        if not skipping:
+            lines.append(line)
+    return '\n'.join(lines)
+
+def prune_app(app_dir, profile="android"):
+    """Remove platform directories outside a profile; returns the number of files removed"""
+    app_dir = Path(app_dir)
+    keep = profile_platforms(profile)
+    removed = 0
+    for platform in ALL_PLATFORMS:
+        path = app_dir / platform
+        if platform in keep or not path.is_dir():
+            continue
+        removed += sum(1 for p in path.rglob("*") if not p.is_dir())
+        shutil.rmtree(path)
+    metadata = app_dir / ".metadata"
+    if metadata.exists():
+        text = metadata.read_text()
+        pruned = _prune_metadata(text, keep)
+        if pruned != text:
+            template_sync.atomic_write_bytes(metadata, pruned.encode())
+    return removed
+
+def main():
+    check_default_profile()
+    parser = argparse.ArgumentParser(description="Create apps from the cached flutter create skeleton")
+    parser.add_argument("args", nargs="*", help="<app_dir> <app_name> [org], or app dirs with --prune")
+    parser.add_argument("--platforms", choices=sorted(PLATFORM_PROFILES), default=None,
+                        help=f"Platform profile (default: {DEFAULT_PROFILE}, android with --prune)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--warm", action="store_true", help="Only populate the skeleton cache")
+    mode.add_argument("--prune", action="store_true", help="Remove platforms outside the profile from apps")
+    args = parser.parse_args()
+
+    if args.prune:
+        profile = args.platforms or "android"
+        app_dirs = [Path(a) for a in args.args] or app_layout.list_app_dirs()
+        removed = sum(prune_app(d, profile) for d in app_dirs)
+        print(f"✅ Pruned {len(app_dirs)} apps to {profile}: {removed} files removed")
+    elif args.warm:
+        print(f"✅ Skeleton ready: {ensure_skeleton(profile=args.platforms or DEFAULT_PROFILE)}")
+    elif len(args.args) in (2, 3):
+        create_app(*args.args, profile=args.platforms or DEFAULT_PROFILE)
+        print(f"✅ {args.args[1]} created from skeleton")
+    else:
+        parser.print_usage()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Single source of truth for the 100-game catalog
+
+Records live in game_catalog.jsonl (one JSON object per line, in number
+order) and are parsed on first use, so importing a generator does not pay for
+the catalog. Lookups by number, type and name go through indexes built
+alongside the records. iter_games() streams the file one record at a time
+instead, for passes over the whole catalog that should not hold all of it.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import app_layout
+
+CATALOG_FILE = Path(__file__).parent / "game_catalog.jsonl"
+
+@dataclass(frozen=True, slots=True)
+class Game:
+    """One catalog entry"""
+    num: int
+    name: str
+    type: str
+    instructions: tuple
+
+    @property
+    def app_name(self):
+        return app_layout.app_name(self.num)
+
+    def as_dict(self):
+        """The dict shape the generators have always used"""
+        return {
+            "num": self.num,
+            "name": self.name,
+            "type": self.type,
+            "instructions": list(self.instructions),
+        }
+
+_games = None
+_by_num = None
+_by_type = None
+_by_name = None
+
+def iter_games(path=CATALOG_FILE):
+    """Yield every game in file order without loading the whole catalog"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield Game(record["num"], record["name"], record["type"],
+                           tuple(record["instructions"]))
+
+def iter_game_dicts(path=CATALOG_FILE):
+    """iter_games() in the dict shape of game_dicts()"""
+    return (g.as_dict() for g in iter_games(path))
+
+def _load():
+    global _games, _by_num, _by_type, _by_name
+    games = sorted(iter_games(), key=lambda g: g.num)
+
+    by_type = {}
+    for game in games:
+        by_type.setdefault(game.type, []).append(game)
+
+    _by_num = {g.num: g for g in games}
+    _by_name = {g.name: g for g in games}
+    _by_type = by_type
+    _games = games
+
+def all_games():
+    """Every game, ordered by number"""
+    if _games is None:
+        _load()
+    return _games
+
+def game_dicts():
+    """Every game as a {"num", "name", "type", "instructions"} dict"""
+    return [g.as_dict() for g in all_games()]
+
+def by_num(num):
+    """Game by app number, or None"""
+    all_games()
+    return _by_num.get(num)
+
+def by_name(name):
+    """Game by display name, or None"""
+    all_games()
+    return _by_name.get(name)
+
+def by_type(game_type):
+    """All games of one type (puzzle, action, ...)"""
+    all_games()
+    return list(_by_type.get(game_type, []))
+
+def types():
+    """Game types in catalog order"""
+    all_games()
+    return list(_by_type)
@@ -8,118 +8,19 @@ import os
 import shutil
 import subprocess
 import json
+import sys
 from pathlib import Path
 
-# Complete list of all 100 games with full details
-ALL_GAMES = [
-    # Puzzle (1-20)
-    {"num": 1, "name": "Number Slide Puzzle", "type": "puzzle", "category": "puzzle"},
-    {"num": 2, "name": "Color Match Challenge", "type": "puzzle", "category": "puzzle"},
-    {"num": 3, "name": "Word Chain", "type": "puzzle", "category": "puzzle"},
-    {"num": 4, "name": "Pattern Memory", "type": "puzzle", "category": "puzzle"},
-    {"num": 5, "name": "Block Rotation", "type": "puzzle", "category": "puzzle"},
-    {"num": 6, "name": "Sequence Master", "type": "puzzle", "category": "puzzle"},
-    {"num": 7, "name": "Logic Grid", "type": "puzzle", "category": "puzzle"},
-    {"num": 8, "name": "Tile Swap", "type": "puzzle", "category": "puzzle"},
-    {"num": 9, "name": "Path Finder", "type": "puzzle", "category": "puzzle"},
-    {"num": 10, "name": "Code Breaker", "type": "puzzle", "category": "puzzle"},
-    {"num": 11, "name": "Shape Matcher", "type": "puzzle", "category": "puzzle"},
-    {"num": 12, "name": "Number Sequence", "type": "puzzle", "category": "puzzle"},
-    {"num": 13, "name": "Color Sequence", "type": "puzzle", "category": "puzzle"},
-    {"num": 14, "name": "Pattern Repeater", "type": "puzzle", "category": "puzzle"},
-    {"num": 15, "name": "Memory Cards", "type": "puzzle", "category": "puzzle"},
-    {"num": 16, "name": "Sudoku Lite", "type": "puzzle", "category": "puzzle"},
-    {"num": 17, "name": "Cross Puzzle", "type": "puzzle", "category": "puzzle"},
-    {"num": 18, "name": "Link Connect", "type": "puzzle", "category": "puzzle"},
-    {"num": 19, "name": "Bubble Sort", "type": "puzzle", "category": "puzzle"},
-    {"num": 20, "name": "Grid Solver", "type": "puzzle", "category": "puzzle"},
-    # Arcade (21-40)
-    {"num": 21, "name": "Space Shooter", "type": "arcade", "category": "arcade"},
-    {"num": 22, "name": "Endless Runner", "type": "arcade", "category": "arcade"},
-    {"num": 23, "name": "Snake Classic", "type": "arcade", "category": "arcade"},
-    {"num": 24, "name": "Breakout Bricks", "type": "arcade", "category": "arcade"},
-    {"num": 25, "name": "Flappy Bird Clone", "type": "arcade", "category": "arcade"},
-    {"num": 26, "name": "Doodle Jump", "type": "arcade", "category": "arcade"},
-    {"num": 27, "name": "Fruit Slicer", "type": "arcade", "category": "arcade"},
-    {"num": 28, "name": "Ball Bounce", "type": "arcade", "category": "arcade"},
-    {"num": 29, "name": "Rocket Launch", "type": "arcade", "category": "arcade"},
-    {"num": 30, "name": "Asteroid Dodge", "type": "arcade", "category": "arcade"},
-    {"num": 31, "name": "Platform Jumper", "type": "arcade", "category": "arcade"},
-    {"num": 32, "name": "Car Racing", "type": "arcade", "category": "arcade"},
-    {"num": 33, "name": "Helicopter Fly", "type": "arcade", "category": "arcade"},
-    {"num": 34, "name": "Submarine Dive", "type": "arcade", "category": "arcade"},
-    {"num": 35, "name": "Jet Pack", "type": "arcade", "category": "arcade"},
-    {"num": 36, "name": "Space Invaders", "type": "arcade", "category": "arcade"},
-    {"num": 37, "name": "Pac-Man Style", "type": "arcade", "category": "arcade"},
-    {"num": 38, "name": "Tetris Style", "type": "arcade", "category": "arcade"},
-    {"num": 39, "name": "Pong Classic", "type": "arcade", "category": "arcade"},
-    {"num": 40, "name": "Pinball", "type": "arcade", "category": "arcade"},
-    # Strategy (41-55)
-    {"num": 41, "name": "Tower Defense", "type": "strategy", "category": "strategy"},
-    {"num": 42, "name": "Chess Lite", "type": "strategy", "category": "strategy"},
-    {"num": 43, "name": "Checkers", "type": "strategy", "category": "strategy"},
-    {"num": 44, "name": "Connect Four", "type": "strategy", "category": "strategy"},
-    {"num": 45, "name": "Tic Tac Toe Pro", "type": "strategy", "category": "strategy"},
-    {"num": 46, "name": "Reversi", "type": "strategy", "category": "strategy"},
-    {"num": 47, "name": "Minesweeper", "type": "strategy", "category": "strategy"},
-    {"num": 48, "name": "Battleship", "type": "strategy", "category": "strategy"},
-    {"num": 49, "name": "Risk Lite", "type": "strategy", "category": "strategy"},
-    {"num": 50, "name": "Card Solitaire", "type": "strategy", "category": "strategy"},
-    {"num": 51, "name": "Mahjong", "type": "strategy", "category": "strategy"},
-    {"num": 52, "name": "Dominoes", "type": "strategy", "category": "strategy"},
-    {"num": 53, "name": "Backgammon", "type": "strategy", "category": "strategy"},
-    {"num": 54, "name": "Go Lite", "type": "strategy", "category": "strategy"},
-    {"num": 55, "name": "Strategy Puzzle", "type": "strategy", "category": "strategy"},
-    # Action (56-70)
-    {"num": 56, "name": "Tap Reaction", "type": "action", "category": "action"},
-    {"num": 57, "name": "Swipe Fighter", "type": "action", "category": "action"},
-    {"num": 58, "name": "Tap Defender", "type": "action", "category": "action"},
-    {"num": 59, "name": "Quick Draw", "type": "action", "category": "action"},
-    {"num": 60, "name": "Target Practice", "type": "action", "category": "action"},
-    {"num": 61, "name": "Speed Tap", "type": "action", "category": "action"},
-    {"num": 62, "name": "Reaction Test", "type": "action", "category": "action"},
-    {"num": 63, "name": "Tap Timing", "type": "action", "category": "action"},
-    {"num": 64, "name": "Swipe Attack", "type": "action", "category": "action"},
-    {"num": 65, "name": "Multi Tap", "type": "action", "category": "action"},
-    {"num": 66, "name": "Rapid Fire", "type": "action", "category": "action"},
-    {"num": 67, "name": "Combo Master", "type": "action", "category": "action"},
-    {"num": 68, "name": "Beat Match", "type": "action", "category": "action"},
-    {"num": 69, "name": "Rhythm Tap", "type": "action", "category": "action"},
-    {"num": 70, "name": "Action Puzzle", "type": "action", "category": "action"},
-    # Casual (71-85)
-    {"num": 71, "name": "Bubble Pop", "type": "casual", "category": "casual"},
-    {"num": 72, "name": "Match Three", "type": "casual", "category": "casual"},
-    {"num": 73, "name": "Candy Crush Style", "type": "casual", "category": "casual"},
-    {"num": 74, "name": "Jewel Match", "type": "casual", "category": "casual"},
-    {"num": 75, "name": "Tile Match", "type": "casual", "category": "casual"},
-    {"num": 76, "name": "Color Pop", "type": "casual", "category": "casual"},
-    {"num": 77, "name": "Block Drop", "type": "casual", "category": "casual"},
-    {"num": 78, "name": "Falling Blocks", "type": "casual", "category": "casual"},
-    {"num": 79, "name": "Stack Builder", "type": "casual", "category": "casual"},
-    {"num": 80, "name": "Balance Game", "type": "casual", "category": "casual"},
-    {"num": 81, "name": "Catch Game", "type": "casual", "category": "casual"},
-    {"num": 82, "name": "Throw Game", "type": "casual", "category": "casual"},
-    {"num": 83, "name": "Aim Game", "type": "casual", "category": "casual"},
-    {"num": 84, "name": "Collect Game", "type": "casual", "category": "casual"},
-    {"num": 85, "name": "Sort Game", "type": "casual", "category": "casual"},
-    # Educational (86-95)
-    {"num": 86, "name": "Math Quiz", "type": "educational", "category": "educational"},
-    {"num": 87, "name": "Word Builder", "type": "educational", "category": "educational"},
-    {"num": 88, "name": "Geography Quiz", "type": "educational", "category": "educational"},
-    {"num": 89, "name": "History Quiz", "type": "educational", "category": "educational"},
-    {"num": 90, "name": "Science Quiz", "type": "educational", "category": "educational"},
-    {"num": 91, "name": "Language Learning", "type": "educational", "category": "educational"},
-    {"num": 92, "name": "Memory Trainer", "type": "educational", "category": "educational"},
-    {"num": 93, "name": "Logic Trainer", "type": "educational", "category": "educational"},
-    {"num": 94, "name": "Speed Math", "type": "educational", "category": "educational"},
-    {"num": 95, "name": "Brain Trainer", "type": "educational", "category": "educational"},
-    # Simulation (96-100)
-    {"num": 96, "name": "City Builder Lite", "type": "simulation", "category": "simulation"},
-    {"num": 97, "name": "Farm Simulator", "type": "simulation", "category": "simulation"},
-    {"num": 98, "name": "Pet Care", "type": "simulation", "category": "simulation"},
-    {"num": 99, "name": "Restaurant Manager", "type": "simulation", "category": "simulation"},
-    {"num": 100, "name": "Traffic Controller", "type": "simulation", "category": "simulation"},
-]
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app_layout
+import game_catalog
+
+def __getattr__(name):
+    """ALL_GAMES is loaded lazily from the shared game catalog"""
+    if name == "ALL_GAMES":
+        return [dict(game, category=game["type"]) for game in game_catalog.game_dicts()]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_game_instructions(game):
     """Get instructions for each game type"""
@@ -151,9 +52,9 @@ def create_complete_game(game_data):
     game_name = game_data["name"]
     game_type = game_data["type"]
     
-    app_name = f"app{app_num:02d}"
+    app_name = app_layout.app_name(app_num)
     package_name = f"org.gloven.{app_name}"
-    app_dir = Path(f"apps/{app_name}")
+    app_dir = app_layout.app_dir(app_name)
     
     print(f"Creating {app_num}/100: {game_name} ({game_type})...")
     
@@ -178,7 +79,7 @@ def main():
     print("Starting implementation...")
     print()
     
-    for game in ALL_GAMES:
+    for game in game_catalog.game_dicts():
         create_complete_game(game)
     
     print("\n✅ All 100 games generated!")
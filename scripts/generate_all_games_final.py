@@ -6,6 +6,8 @@ Final generator for all 100 unique games with complete implementations
 import os
 import subprocess
 import json
+import argparse
+import functools
 from pathlib import Path
 import sys
 
@@ -13,619 +15,95 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
 from create_complete_game_app import create_complete_game_app
+import app_layout
+import build_state
+import core_package
+import flutter_skeleton
+import game_catalog
+import generation_engine
+import pub_workspace
+import tracing
 
-# All 100 games with instructions
-ALL_GAMES = [
-    # Puzzle (1-20)
-    {"num": 1, "name": "Number Slide Puzzle", "type": "puzzle", "instructions": [
-        "Slide numbered tiles to arrange them in order",
-        "Tap a tile adjacent to the empty space to move it",
-        "Complete the puzzle in the fewest moves",
-        "Difficulty affects puzzle size (3x3, 4x4, 5x5)"
-    ]},
-    {"num": 2, "name": "Color Match Challenge", "type": "puzzle", "instructions": [
-        "Match colors in the correct sequence",
-        "Tap colors in the order shown",
-        "Remember the pattern as it gets longer",
-        "Each level adds more colors to remember"
-    ]},
-    {"num": 3, "name": "Word Chain", "type": "puzzle", "instructions": [
-        "Connect words by their last and first letters",
-        "Each word must start with the last letter of previous",
-        "Create the longest chain possible",
-        "Use hints when stuck"
-    ]},
-    {"num": 4, "name": "Pattern Memory", "type": "puzzle", "instructions": [
-        "Watch the pattern sequence carefully",
-        "Repeat the pattern by tapping in order",
-        "Pattern gets longer each round",
-        "Concentrate and remember the sequence"
-    ]},
-    {"num": 5, "name": "Block Rotation", "type": "puzzle", "instructions": [
-        "Rotate blocks to fit the puzzle",
-        "Tap to rotate a block 90 degrees",
-        "Fill all empty spaces to complete",
-        "Think ahead before rotating"
-    ]},
-    {"num": 6, "name": "Sequence Master", "type": "puzzle", "instructions": [
-        "Complete number sequences",
-        "Find the pattern and fill missing numbers",
-        "Tap the correct number to continue",
-        "Difficulty affects sequence complexity"
-    ]},
-    {"num": 7, "name": "Logic Grid", "type": "puzzle", "instructions": [
-        "Solve logic puzzles using clues",
-        "Use deduction to fill the grid",
-        "Each clue eliminates possibilities",
-        "Think logically to solve"
-    ]},
-    {"num": 8, "name": "Tile Swap", "type": "puzzle", "instructions": [
-        "Swap adjacent tiles to form patterns",
-        "Tap two tiles to swap them",
-        "Create matching rows or columns",
-        "Plan your moves carefully"
-    ]},
-    {"num": 9, "name": "Path Finder", "type": "puzzle", "instructions": [
-        "Find path through the maze",
-        "Swipe to move through the grid",
-        "Reach the goal in minimum moves",
-        "Avoid obstacles and dead ends"
-    ]},
-    {"num": 10, "name": "Code Breaker", "type": "puzzle", "instructions": [
-        "Crack the color/number code",
-        "Guess the code and get feedback",
-        "Use clues to eliminate possibilities",
-        "Solve in the fewest attempts"
-    ]},
-    {"num": 11, "name": "Shape Matcher", "type": "puzzle", "instructions": [
-        "Match shapes by rotation",
-        "Rotate shapes to fit together",
-        "Complete the pattern",
-        "Visualize the rotation needed"
-    ]},
-    {"num": 12, "name": "Number Sequence", "type": "puzzle", "instructions": [
-        "Complete number patterns",
-        "Identify the sequence rule",
-        "Tap the next number",
-        "Patterns get more complex"
-    ]},
-    {"num": 13, "name": "Color Sequence", "type": "puzzle", "instructions": [
-        "Remember color order",
-        "Watch the sequence carefully",
-        "Tap colors in the same order",
-        "Sequence length increases"
-    ]},
-    {"num": 14, "name": "Pattern Repeater", "type": "puzzle", "instructions": [
-        "Repeat shown patterns",
-        "Watch the pattern animation",
-        "Tap to recreate the pattern",
-        "Accuracy matters"
-    ]},
-    {"num": 15, "name": "Memory Cards", "type": "puzzle", "instructions": [
-        "Match pairs of cards",
-        "Tap cards to flip them",
-        "Remember card positions",
-        "Match all pairs to win"
-    ]},
-    {"num": 16, "name": "Sudoku Lite", "type": "puzzle", "instructions": [
-        "Fill the grid with numbers 1-9",
-        "No duplicates in row, column, or box",
-        "Use logic to solve",
-        "Difficulty affects grid size"
-    ]},
-    {"num": 17, "name": "Cross Puzzle", "type": "puzzle", "instructions": [
-        "Solve crossword-style puzzles",
-        "Fill words based on clues",
-        "Words intersect correctly",
-        "Complete the entire grid"
-    ]},
-    {"num": 18, "name": "Link Connect", "type": "puzzle", "instructions": [
-        "Connect matching items",
-        "Draw paths between pairs",
-        "Paths cannot cross",
-        "Connect all pairs to win"
-    ]},
-    {"num": 19, "name": "Bubble Sort", "type": "puzzle", "instructions": [
-        "Sort bubbles by color",
-        "Tap bubbles to swap positions",
-        "Arrange in correct order",
-        "Minimize number of swaps"
-    ]},
-    {"num": 20, "name": "Grid Solver", "type": "puzzle", "instructions": [
-        "Solve grid-based puzzles",
-        "Follow the rules for each grid",
-        "Complete all cells correctly",
-        "Think step by step"
-    ]},
-    # Arcade (21-40) - Continuing with key games
-    {"num": 21, "name": "Space Shooter", "type": "arcade", "instructions": [
-        "Shoot asteroids in space",
-        "Tap to shoot, swipe to move your ship",
-        "Destroy all asteroids to advance",
-        "Avoid collisions with asteroids"
-    ]},
-    {"num": 22, "name": "Endless Runner", "type": "arcade", "instructions": [
-        "Run and dodge obstacles",
-        "Swipe up to jump, down to slide",
-        "Run as far as possible",
-        "Speed increases over time"
-    ]},
-    {"num": 23, "name": "Snake Classic", "type": "arcade", "instructions": [
-        "Control the snake",
-        "Swipe to change direction",
-        "Eat food to grow",
-        "Don't hit walls or yourself"
-    ]},
-    {"num": 24, "name": "Breakout Bricks", "type": "arcade", "instructions": [
-        "Break all bricks",
-        "Move paddle to bounce ball",
-        "Don't let ball fall",
-        "Clear all bricks to win"
-    ]},
-    {"num": 25, "name": "Flappy Bird Clone", "type": "arcade", "instructions": [
-        "Tap to fly",
-        "Navigate through pipes",
-        "Don't hit obstacles",
-        "Go as far as possible"
-    ]},
-    {"num": 26, "name": "Doodle Jump", "type": "arcade", "instructions": [
-        "Jump on platforms",
-        "Tap to jump higher",
-        "Avoid falling off",
-        "Reach the highest platform"
-    ]},
-    {"num": 27, "name": "Fruit Slicer", "type": "arcade", "instructions": [
-        "Slice falling fruits",
-        "Swipe to slice",
-        "Don't slice bombs",
-        "Slice as many fruits as possible"
-    ]},
-    {"num": 28, "name": "Ball Bounce", "type": "arcade", "instructions": [
-        "Keep ball bouncing",
-        "Tap to bounce the ball",
-        "Don't let it fall",
-        "Bounce as many times as possible"
-    ]},
-    {"num": 29, "name": "Rocket Launch", "type": "arcade", "instructions": [
-        "Launch rocket safely",
-        "Tap to boost rocket",
-        "Avoid obstacles",
-        "Reach maximum height"
-    ]},
-    {"num": 30, "name": "Asteroid Dodge", "type": "arcade", "instructions": [
-        "Dodge asteroids",
-        "Swipe to move your ship",
-        "Survive as long as possible",
-        "Asteroids get faster over time"
-    ]},
-    {"num": 31, "name": "Platform Jumper", "type": "arcade", "instructions": [
-        "Jump between platforms",
-        "Tap to jump",
-        "Don't fall off",
-        "Reach the top platform"
-    ]},
-    {"num": 32, "name": "Car Racing", "type": "arcade", "instructions": [
-        "Race car on track",
-        "Swipe left/right to steer",
-        "Avoid obstacles",
-        "Complete the race"
-    ]},
-    {"num": 33, "name": "Helicopter Fly", "type": "arcade", "instructions": [
-        "Fly helicopter",
-        "Tap to go up, release to go down",
-        "Avoid obstacles",
-        "Fly as far as possible"
-    ]},
-    {"num": 34, "name": "Submarine Dive", "type": "arcade", "instructions": [
-        "Navigate submarine",
-        "Swipe to move",
-        "Collect treasures",
-        "Avoid sea creatures"
-    ]},
-    {"num": 35, "name": "Jet Pack", "type": "arcade", "instructions": [
-        "Use jetpack to fly",
-        "Hold to boost up",
-        "Avoid obstacles",
-        "Fly as high as possible"
-    ]},
-    {"num": 36, "name": "Space Invaders", "type": "arcade", "instructions": [
-        "Shoot invading aliens",
-        "Tap to shoot, swipe to move",
-        "Destroy all aliens",
-        "Don't let them reach bottom"
-    ]},
-    {"num": 37, "name": "Pac-Man Style", "type": "arcade", "instructions": [
-        "Collect dots, avoid ghosts",
-        "Swipe to move",
-        "Eat power pellets to chase ghosts",
-        "Collect all dots to win"
-    ]},
-    {"num": 38, "name": "Tetris Style", "type": "arcade", "instructions": [
-        "Stack falling blocks",
-        "Tap to rotate, swipe to move",
-        "Complete rows to clear them",
-        "Don't let blocks reach top"
-    ]},
-    {"num": 39, "name": "Pong Classic", "type": "arcade", "instructions": [
-        "Classic pong game",
-        "Swipe to move paddle",
-        "Hit ball back",
-        "Score points by passing opponent"
-    ]},
-    {"num": 40, "name": "Pinball", "type": "arcade", "instructions": [
-        "Digital pinball",
-        "Tap flippers to hit ball",
-        "Hit targets for points",
-        "Keep ball in play"
-    ]},
-    # Strategy (41-55)
-    {"num": 41, "name": "Tower Defense", "type": "strategy", "instructions": [
-        "Defend your base with towers",
-        "Place towers strategically",
-        "Upgrade towers to increase power",
-        "Survive all waves to win"
-    ]},
-    {"num": 42, "name": "Chess Lite", "type": "strategy", "instructions": [
-        "Simplified chess game",
-        "Tap piece then tap destination",
-        "Checkmate opponent to win",
-        "Think several moves ahead"
-    ]},
-    {"num": 43, "name": "Checkers", "type": "strategy", "instructions": [
-        "Classic checkers game",
-        "Tap piece then tap destination",
-        "Jump opponent pieces",
-        "King pieces can move diagonally"
-    ]},
-    {"num": 44, "name": "Connect Four", "type": "strategy", "instructions": [
-        "Connect 4 in a row",
-        "Tap column to drop piece",
-        "Block opponent while planning",
-        "First to connect 4 wins"
-    ]},
-    {"num": 45, "name": "Tic Tac Toe Pro", "type": "strategy", "instructions": [
-        "Advanced tic-tac-toe",
-        "Tap to place X or O",
-        "Get 3 in a row to win",
-        "Think strategically"
-    ]},
-    {"num": 46, "name": "Reversi", "type": "strategy", "instructions": [
-        "Flip opponent pieces",
-        "Place piece to flip line",
-        "Most pieces at end wins",
-        "Plan your moves carefully"
-    ]},
-    {"num": 47, "name": "Minesweeper", "type": "strategy", "instructions": [
-        "Find mines safely",
-        "Tap to reveal, long press to flag",
-        "Numbers show nearby mines",
-        "Clear all safe squares"
-    ]},
-    {"num": 48, "name": "Battleship", "type": "strategy", "instructions": [
-        "Sink opponent ships",
-        "Tap grid to attack",
-        "Place your ships strategically",
-        "Sink all enemy ships to win"
-    ]},
-    {"num": 49, "name": "Risk Lite", "type": "strategy", "instructions": [
-        "Strategy conquest game",
-        "Tap territories to attack",
-        "Roll dice for battles",
-        "Conquer all territories"
-    ]},
-    {"num": 50, "name": "Card Solitaire", "type": "strategy", "instructions": [
-        "Classic solitaire",
-        "Move cards to build stacks",
-        "Use foundation piles",
-        "Clear all cards to win"
-    ]},
-    {"num": 51, "name": "Mahjong", "type": "strategy", "instructions": [
-        "Match tiles",
-        "Tap matching pairs",
-        "Clear all tiles",
-        "Plan your moves"
-    ]},
-    {"num": 52, "name": "Dominoes", "type": "strategy", "instructions": [
-        "Play dominoes",
-        "Match numbers on ends",
-        "Play all your tiles",
-        "Lowest score wins"
-    ]},
-    {"num": 53, "name": "Backgammon", "type": "strategy", "instructions": [
-        "Classic backgammon",
-        "Move pieces based on dice",
-        "Bear off all pieces",
-        "First to bear off wins"
-    ]},
-    {"num": 54, "name": "Go Lite", "type": "strategy", "instructions": [
-        "Simplified Go game",
-        "Place stones on intersections",
-        "Capture opponent stones",
-        "Control more territory"
-    ]},
-    {"num": 55, "name": "Strategy Puzzle", "type": "strategy", "instructions": [
-        "Strategic thinking puzzle",
-        "Plan your moves ahead",
-        "Solve the puzzle",
-        "Think strategically"
-    ]},
-    # Action (56-70)
-    {"num": 56, "name": "Tap Reaction", "type": "action", "instructions": [
-        "Tap when the signal appears",
-        "React as quickly as possible",
-        "Faster reactions = higher score",
-        "Difficulty affects signal speed"
-    ]},
-    {"num": 57, "name": "Swipe Fighter", "type": "action", "instructions": [
-        "Swipe to fight",
-        "Swipe in different directions for moves",
-        "Defeat enemies",
-        "Chain combos for bonus"
-    ]},
-    {"num": 58, "name": "Tap Defender", "type": "action", "instructions": [
-        "Tap to defend",
-        "Tap enemies to defeat them",
-        "Protect your base",
-        "Survive all waves"
-    ]},
-    {"num": 59, "name": "Quick Draw", "type": "action", "instructions": [
-        "Fast reaction game",
-        "Tap when signal appears",
-        "React quickly",
-        "Fastest reactions win"
-    ]},
-    {"num": 60, "name": "Target Practice", "type": "action", "instructions": [
-        "Hit targets",
-        "Tap targets to hit them",
-        "Aim for accuracy",
-        "Hit all targets to advance"
-    ]},
-    {"num": 61, "name": "Speed Tap", "type": "action", "instructions": [
-        "Tap as fast as possible",
-        "Tap the button rapidly",
-        "Count your taps in time limit",
-        "Most taps wins"
-    ]},
-    {"num": 62, "name": "Reaction Test", "type": "action", "instructions": [
-        "Test reaction time",
-        "Tap when screen changes color",
-        "Measure your reaction speed",
-        "Faster is better"
-    ]},
-    {"num": 63, "name": "Tap Timing", "type": "action", "instructions": [
-        "Tap at right time",
-        "Wait for perfect moment",
-        "Timing is everything",
-        "Perfect timing = bonus points"
-    ]},
-    {"num": 64, "name": "Swipe Attack", "type": "action", "instructions": [
-        "Swipe to attack",
-        "Swipe in attack direction",
-        "Defeat all enemies",
-        "Chain attacks for combos"
-    ]},
-    {"num": 65, "name": "Multi Tap", "type": "action", "instructions": [
-        "Tap multiple targets",
-        "Tap all targets quickly",
-        "Don't miss any",
-        "Speed and accuracy matter"
-    ]},
-    {"num": 66, "name": "Rapid Fire", "type": "action", "instructions": [
-        "Rapid tapping",
-        "Tap as fast as you can",
-        "Build up speed",
-        "Maximum speed wins"
-    ]},
-    {"num": 67, "name": "Combo Master", "type": "action", "instructions": [
-        "Create combos",
-        "Tap in sequence",
-        "Longer combos = more points",
-        "Master the combo system"
-    ]},
-    {"num": 68, "name": "Beat Match", "type": "action", "instructions": [
-        "Match beats",
-        "Tap to the rhythm",
-        "Follow the beat",
-        "Perfect timing scores"
-    ]},
-    {"num": 69, "name": "Rhythm Tap", "type": "action", "instructions": [
-        "Tap to rhythm",
-        "Follow the music",
-        "Tap on beat",
-        "Perfect rhythm = high score"
-    ]},
-    {"num": 70, "name": "Action Puzzle", "type": "action", "instructions": [
-        "Action + puzzle combo",
-        "Solve puzzles quickly",
-        "Time pressure adds challenge",
-        "Fast thinking required"
-    ]},
-    # Casual (71-85)
-    {"num": 71, "name": "Bubble Pop", "type": "casual", "instructions": [
-        "Pop bubbles by tapping",
-        "Match colors for bonus",
-        "Clear the screen",
-        "Time limit increases difficulty"
-    ]},
-    {"num": 72, "name": "Match Three", "type": "casual", "instructions": [
-        "Match 3 items",
-        "Swap adjacent items",
-        "Create matches of 3+",
-        "Clear board to advance"
-    ]},
-    {"num": 73, "name": "Candy Crush Style", "type": "casual", "instructions": [
-        "Match candies",
-        "Swipe to swap",
-        "Match 3 or more",
-        "Complete objectives"
-    ]},
-    {"num": 74, "name": "Jewel Match", "type": "casual", "instructions": [
-        "Match jewels",
-        "Tap to swap",
-        "Create matches",
-        "Clear all jewels"
-    ]},
-    {"num": 75, "name": "Tile Match", "type": "casual", "instructions": [
-        "Match tiles",
-        "Tap matching tiles",
-        "Clear the board",
-        "Plan your matches"
-    ]},
-    {"num": 76, "name": "Color Pop", "type": "casual", "instructions": [
-        "Pop by color",
-        "Tap same colored items",
-        "Clear groups",
-        "Bigger groups = more points"
-    ]},
-    {"num": 77, "name": "Block Drop", "type": "casual", "instructions": [
-        "Drop blocks",
-        "Tap to drop",
-        "Fill rows to clear",
-        "Don't stack too high"
-    ]},
-    {"num": 78, "name": "Falling Blocks", "type": "casual", "instructions": [
-        "Stack falling blocks",
-        "Rotate and position",
-        "Complete rows",
-        "Keep stacking"
-    ]},
-    {"num": 79, "name": "Stack Builder", "type": "casual", "instructions": [
-        "Build stack",
-        "Tap to place block",
-        "Balance carefully",
-        "Build as high as possible"
-    ]},
-    {"num": 80, "name": "Balance Game", "type": "casual", "instructions": [
-        "Balance objects",
-        "Tap to add weight",
-        "Keep balanced",
-        "Don't let it tip"
-    ]},
-    {"num": 81, "name": "Catch Game", "type": "casual", "instructions": [
-        "Catch falling items",
-        "Move basket to catch",
-        "Catch good items",
-        "Avoid bad items"
-    ]},
-    {"num": 82, "name": "Throw Game", "type": "casual", "instructions": [
-        "Throw objects",
-        "Swipe to throw",
-        "Hit targets",
-        "Aim accurately"
-    ]},
-    {"num": 83, "name": "Aim Game", "type": "casual", "instructions": [
-        "Aim and shoot",
-        "Tap to aim, release to shoot",
-        "Hit targets",
-        "Accuracy matters"
-    ]},
-    {"num": 84, "name": "Collect Game", "type": "casual", "instructions": [
-        "Collect items",
-        "Move to collect",
-        "Collect all items",
-        "Avoid obstacles"
-    ]},
-    {"num": 85, "name": "Sort Game", "type": "casual", "instructions": [
-        "Sort items",
-        "Drag to sort",
-        "Organize by category",
-        "Complete sorting"
-    ]},
-    # Educational (86-95)
-    {"num": 86, "name": "Math Quiz", "type": "educational", "instructions": [
-        "Answer math questions",
-        "Tap the correct answer",
-        "Test your math skills",
-        "Difficulty affects question complexity"
-    ]},
-    {"num": 87, "name": "Word Builder", "type": "educational", "instructions": [
-        "Build words",
-        "Tap letters to form words",
-        "Longer words = more points",
-        "Expand your vocabulary"
-    ]},
-    {"num": 88, "name": "Geography Quiz", "type": "educational", "instructions": [
-        "Answer geography questions",
-        "Tap correct answer",
-        "Learn about the world",
-        "Test your knowledge"
-    ]},
-    {"num": 89, "name": "History Quiz", "type": "educational", "instructions": [
-        "Answer history questions",
-        "Choose correct answer",
-        "Learn history",
-        "Difficulty affects era"
-    ]},
-    {"num": 90, "name": "Science Quiz", "type": "educational", "instructions": [
-        "Answer science questions",
-        "Tap correct answer",
-        "Learn science facts",
-        "Test your knowledge"
-    ]},
-    {"num": 91, "name": "Language Learning", "type": "educational", "instructions": [
-        "Learn languages",
-        "Match words to translations",
-        "Practice vocabulary",
-        "Build language skills"
-    ]},
-    {"num": 92, "name": "Memory Trainer", "type": "educational", "instructions": [
-        "Train your memory",
-        "Remember sequences",
-        "Improve memory skills",
-        "Challenge yourself"
-    ]},
-    {"num": 93, "name": "Logic Trainer", "type": "educational", "instructions": [
-        "Train logic skills",
-        "Solve logic puzzles",
-        "Improve reasoning",
-        "Think logically"
-    ]},
-    {"num": 94, "name": "Speed Math", "type": "educational", "instructions": [
-        "Fast math practice",
-        "Answer quickly",
-        "Improve speed",
-        "Beat the clock"
-    ]},
-    {"num": 95, "name": "Brain Trainer", "type": "educational", "instructions": [
-        "Brain exercises",
-        "Various brain challenges",
-        "Improve cognitive skills",
-        "Train your brain"
-    ]},
-    # Simulation (96-100)
-    {"num": 96, "name": "City Builder Lite", "type": "simulation", "instructions": [
-        "Build your city",
-        "Tap to place buildings",
-        "Manage resources",
-        "Grow your city"
-    ]},
-    {"num": 97, "name": "Farm Simulator", "type": "simulation", "instructions": [
-        "Manage your farm",
-        "Plant and harvest crops",
-        "Take care of animals",
-        "Grow your farm"
-    ]},
-    {"num": 98, "name": "Pet Care", "type": "simulation", "instructions": [
-        "Care for pets",
-        "Feed and play with pets",
-        "Keep pets happy",
-        "Raise healthy pets"
-    ]},
-    {"num": 99, "name": "Restaurant Manager", "type": "simulation", "instructions": [
-        "Manage restaurant",
-        "Serve customers",
-        "Manage kitchen",
-        "Grow your restaurant"
-    ]},
-    {"num": 100, "name": "Traffic Controller", "type": "simulation", "instructions": [
-        "Control traffic",
-        "Tap to change lights",
-        "Keep traffic flowing",
-        "Avoid jams"
-    ]},
-]
+def __getattr__(name):
+    """ALL_GAMES is loaded lazily from the shared game catalog"""
+    if name == "ALL_GAMES":
+        return game_catalog.game_dicts()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def generate_game(game, store_dir=None, workspace=False, shared_core=False,
+                  platforms=flutter_skeleton.DEFAULT_PROFILE):
+    """Worker entry point: generate one app from its game dict"""
+    create_complete_game_app(
+        game['num'],
+        game['name'],
+        game['type'],
+        game['instructions'],
+        store_dir=store_dir,
+        workspace=workspace,
+        shared_core=shared_core,
+        platforms=platforms
+    )
+    return game['num']
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate all 100 games")
+    parser.add_argument("--store", nargs="?", const=".blobstore", default=None,
+                        help="Deduplicate generated apps into a blob store (default: .blobstore)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the apps whose inputs changed and exit")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate every app regardless of recorded fingerprints")
+    parser.add_argument("--workers", type=int, default=generation_engine.default_workers(),
+                        help="Number of apps generated concurrently (default: CPU count)")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="Retries per failed app (default: 1)")
+    parser.add_argument("--workspace", action="store_true",
+                        help="Make the apps members of one root pub workspace")
+    parser.add_argument("--shared-core", action="store_true",
+                        help="Move the common runtime into the packages/gloven_core path package")
+    parser.add_argument("--platforms", choices=sorted(flutter_skeleton.PLATFORM_PROFILES),
+                        default=flutter_skeleton.DEFAULT_PROFILE,
+                        help="Platform profile of the apps (default: %(default)s; android is all we ship)")
+    parser.add_argument("--trace", help="Record per-stage spans into this directory (see tracing.py)")
+    parser.add_argument("--layout", type=app_layout.parse_spec, metavar="MODE[:WIDTH[:BUCKET_SIZE]]",
+                        help="Directory layout of a new fleet, e.g. bucketed:5:1000 (see app_layout.py)")
+    args = parser.parse_args()
+    if args.platforms == flutter_skeleton.DEFAULT_PROFILE:
+        flutter_skeleton.check_default_profile()
+    if args.trace:
+        tracing.start(args.trace)
+    if args.layout:
+        if app_layout.list_app_dirs() and args.layout != app_layout.load_layout():
+            parser.error("apps/ already has apps; use app_layout.py migrate to change its layout")
+        app_layout.save_layout(args.layout)
+    
+    # The catalog is streamed; only the stale games are kept
+    catalog_size = 0
+    def catalog():
+        nonlocal catalog_size
+        for game in game_catalog.iter_game_dicts():
+            catalog_size += 1
+            yield game
+    
+    state = build_state.load_state()
+    shared_digest = build_state.shared_inputs_digest()
+    # Workspace members, shared-core apps and narrower platform profiles
+    # differ from standalone all-platform apps, so the modes are inputs too
+    modes = [name for name, on in (("workspace", args.workspace), ("shared-core", args.shared_core),
+                                   (f"platforms={args.platforms}", args.platforms != "all")) if on]
+    if modes:
+        shared_digest = build_state.hash_bytes(f"{shared_digest}:{','.join(modes)}".encode())
+    if args.force:
+        stale = [(game, build_state.app_fingerprint(game, shared_digest)) for game in catalog()]
+    else:
+        stale = build_state.stale_games(catalog(), state, shared_digest)
+    
+    if args.dry_run:
+        print(f"{len(stale)}/{catalog_size} apps are stale:")
+        for game, _ in stale:
+            print(f"  {build_state.app_name(game)}: {game['name']}")
+        return
+    
     print("=" * 80)
     print("GENERATING 100 UNIQUE GAMES WITH COMPLETE IMPLEMENTATIONS")
     print("=" * 80)
@@ -641,38 +119,55 @@ def main():
     print("  ✅ Excellent UX")
     print("  ✅ Play Store ready")
     print()
-    print("This will take 60-90 minutes...")
+    if args.shared_core:
+        core_package.write_package(workspace=args.workspace)
+    if args.workspace:
+        members = [app_layout.app_dir(build_state.app_name(game)) for game in game_catalog.iter_game_dicts()]
+        pub_workspace.write_root_pubspec(members + pub_workspace.package_dirs())
+    if not stale:
+        print("All apps are up to date. Use --force to regenerate anyway.")
+        return
+    print(f"{len(stale)}/{catalog_size} apps changed since the last run")
     print()
     
     success_count = 0
     failed = []
+    fingerprints = {build_state.app_name(game): (game, fingerprint) for game, fingerprint in stale}
     
-    for game in ALL_GAMES:
-        try:
-            print(f"Creating {game['num']}/100: {game['name']}...")
-            create_complete_game_app(
-                game['num'],
-                game['name'],
-                game['type'],
-                game['instructions']
-            )
+    results = generation_engine.run_jobs(
+        functools.partial(generate_game, store_dir=args.store, workspace=args.workspace,
+                          shared_core=args.shared_core, platforms=args.platforms),
+        [game for game, _ in stale],
+        workers=args.workers,
+        retries=args.retries,
+        key=build_state.app_name
+    )
+    for result in generation_engine.report_progress(results, len(stale)):
+        game, fingerprint = fingerprints[result.key]
+        if result.ok:
+            build_state.record_app(state, game, fingerprint)
+            build_state.save_state(state)
             success_count += 1
-        except Exception as e:
-            print(f"❌ Failed to create {game['name']}: {e}")
+        else:
+            print(f"❌ Failed to create {game['name']}: {result.error}")
             failed.append(game['name'])
     
     print()
     print("=" * 80)
-    print(f"✅ Generated {success_count}/100 games successfully")
+    print(f"✅ Generated {success_count}/{len(stale)} games successfully")
     if failed:
         print(f"❌ Failed: {len(failed)} games")
         for name in failed:
             print(f"   - {name}")
     print("=" * 80)
+    if args.trace:
+        tracing.report(args.trace)
     print()
-    print("Next: Run 'flutter pub get' in each app directory")
+    if args.workspace:
+        print("Next: Run 'flutter pub get' once at the repository root")
+    else:
+        print("Next: Run 'flutter pub get' in each app directory")
     print("Then: Test and build all games")
 
 if __name__ == "__main__":
     main()
-
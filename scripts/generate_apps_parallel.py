@@ -1,61 +1,84 @@
 #!/usr/bin/env python3
 """
 Parallel Flutter app generator
-Generates 100 Flutter apps more efficiently using multiprocessing
+Generates 100 Flutter apps on a bounded worker pool, streaming results as
+each app finishes (see generation_engine.py)
 """
 
-import subprocess
-import multiprocessing
+import argparse
 import os
+import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app_layout
+import generation_engine
+import update_build_gradle
+
+# Per-stage timeouts (seconds) handed to create_app_template.sh
+STAGE_TIMEOUTS = {
+    "STAGE_TIMEOUT_CREATE": 600,  # first app may have to build the skeleton cache
+}
+
 def create_app(app_number):
-    """Create a single Flutter app"""
+    """Create a single Flutter app; raises on failure"""
     script_path = Path(__file__).parent / "create_app_template.sh"
-    try:
-        result = subprocess.run(
-            [str(script_path), str(app_number)],
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout per app
-        )
-        if result.returncode == 0:
-            return (app_number, True, "Success")
-        else:
-            return (app_number, False, result.stderr)
-    except subprocess.TimeoutExpired:
-        return (app_number, False, "Timeout")
-    except Exception as e:
-        return (app_number, False, str(e))
+    env = dict(os.environ, **{k: str(v) for k, v in STAGE_TIMEOUTS.items()})
+    env["SKIP_GRADLE_PATCH"] = "1"  # patched in one batch after the pool
+    result = subprocess.run(
+        [str(script_path), str(app_number)],
+        capture_output=True,
+        text=True,
+        env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"exit code {result.returncode}")
+    return "Success"
 
 def main():
     """Generate all 100 apps in parallel"""
-    num_workers = min(10, multiprocessing.cpu_count() * 2)  # Use up to 10 workers
+    parser = argparse.ArgumentParser(description="Generate Flutter apps in parallel")
+    parser.add_argument("--workers", type=int, default=generation_engine.default_workers(),
+                        help="Number of concurrent app generations (default: CPU count)")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="Retries per failed app (default: 1)")
+    parser.add_argument("--count", type=int, default=100, help="Number of apps (default: 100)")
+    args = parser.parse_args()
+    
+    print(f"Generating {args.count} Flutter apps using {args.workers} workers...")
     
-    print(f"Generating 100 Flutter apps using {num_workers} workers...")
-    print("This may take a while...")
+    results = generation_engine.run_jobs(
+        create_app,
+        range(1, args.count + 1),
+        workers=args.workers,
+        retries=args.retries,
+        key=app_layout.app_name,
+        use_threads=True
+    )
+    results = list(generation_engine.report_progress(results, args.count))
     
-    with multiprocessing.Pool(processes=num_workers) as pool:
-        results = pool.map(create_app, range(1, 101))
+    # Patch every build.gradle.kts in this process instead of one python3 per app
+    updated, total = update_build_gradle.update_all("apps")
+    print(f"Patched {updated}/{total} build.gradle.kts files")
     
     # Report results
-    successful = [r for r in results if r[1]]
-    failed = [r for r in results if not r[1]]
+    successful = [r for r in results if r.ok]
+    failed = sorted((r for r in results if not r.ok), key=lambda r: r.key)
     
     print(f"\n{'='*60}")
     print(f"Generation complete!")
-    print(f"Successful: {len(successful)}/100")
-    print(f"Failed: {len(failed)}/100")
+    print(f"Successful: {len(successful)}/{args.count}")
+    print(f"Failed: {len(failed)}/{args.count}")
     
     if failed:
         print("\nFailed apps:")
-        for app_num, _, error in failed:
-            print(f"  App {app_num:02d}: {error[:100]}")
+        for r in failed:
+            print(f"  {r.key}: {r.error[:100]}")
     
     return len(failed) == 0
 
 if __name__ == "__main__":
     success = main()
     sys.exit(0 if success else 1)
-
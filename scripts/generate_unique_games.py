@@ -6,167 +6,21 @@ Each game has unique mechanics, instructions, and gameplay
 
 import os
 import shutil
-import subprocess
 import json
+import sys
 from pathlib import Path
 
-# 100 unique games with detailed descriptions
-GAMES_DATA = [
-    # Puzzle Games (1-20)
-    {"num": 1, "name": "Number Slide Puzzle", "type": "puzzle", "instructions": [
-        "Slide numbered tiles to arrange them in order",
-        "Tap a tile adjacent to the empty space to move it",
-        "Complete the puzzle in the fewest moves",
-        "Difficulty affects puzzle size (3x3, 4x4, 5x5)"
-    ]},
-    {"num": 2, "name": "Color Match Challenge", "type": "puzzle", "instructions": [
-        "Match colors in the correct sequence",
-        "Tap colors in the order shown",
-        "Remember the pattern as it gets longer",
-        "Each level adds more colors to remember"
-    ]},
-    {"num": 3, "name": "Word Chain", "type": "puzzle", "instructions": [
-        "Connect words by their last and first letters",
-        "Each word must start with the last letter of previous",
-        "Create the longest chain possible",
-        "Use hints when stuck"
-    ]},
-    {"num": 4, "name": "Pattern Memory", "type": "puzzle", "instructions": [
-        "Watch the pattern sequence carefully",
-        "Repeat the pattern by tapping in order",
-        "Pattern gets longer each round",
-        "Concentrate and remember the sequence"
-    ]},
-    {"num": 5, "name": "Block Rotation", "type": "puzzle", "instructions": [
-        "Rotate blocks to fit the puzzle",
-        "Tap to rotate a block 90 degrees",
-        "Fill all empty spaces to complete",
-        "Think ahead before rotating"
-    ]},
-    {"num": 6, "name": "Sequence Master", "type": "puzzle", "instructions": [
-        "Complete number sequences",
-        "Find the pattern and fill missing numbers",
-        "Tap the correct number to continue",
-        "Difficulty affects sequence complexity"
-    ]},
-    {"num": 7, "name": "Logic Grid", "type": "puzzle", "instructions": [
-        "Solve logic puzzles using clues",
-        "Use deduction to fill the grid",
-        "Each clue eliminates possibilities",
-        "Think logically to solve"
-    ]},
-    {"num": 8, "name": "Tile Swap", "type": "puzzle", "instructions": [
-        "Swap adjacent tiles to form patterns",
-        "Tap two tiles to swap them",
-        "Create matching rows or columns",
-        "Plan your moves carefully"
-    ]},
-    {"num": 9, "name": "Path Finder", "type": "puzzle", "instructions": [
-        "Find path through the maze",
-        "Swipe to move through the grid",
-        "Reach the goal in minimum moves",
-        "Avoid obstacles and dead ends"
-    ]},
-    {"num": 10, "name": "Code Breaker", "type": "puzzle", "instructions": [
-        "Crack the color/number code",
-        "Guess the code and get feedback",
-        "Use clues to eliminate possibilities",
-        "Solve in the fewest attempts"
-    ]},
-    {"num": 11, "name": "Shape Matcher", "type": "puzzle", "instructions": [
-        "Match shapes by rotation",
-        "Rotate shapes to fit together",
-        "Complete the pattern",
-        "Visualize the rotation needed"
-    ]},
-    {"num": 12, "name": "Number Sequence", "type": "puzzle", "instructions": [
-        "Complete number patterns",
-        "Identify the sequence rule",
-        "Tap the next number",
-        "Patterns get more complex"
-    ]},
-    {"num": 13, "name": "Color Sequence", "type": "puzzle", "instructions": [
-        "Remember color order",
-        "Watch the sequence carefully",
-        "Tap colors in the same order",
-        "Sequence length increases"
-    ]},
-    {"num": 14, "name": "Pattern Repeater", "type": "puzzle", "instructions": [
-        "Repeat shown patterns",
-        "Watch the pattern animation",
-        "Tap to recreate the pattern",
-        "Accuracy matters"
-    ]},
-    {"num": 15, "name": "Memory Cards", "type": "puzzle", "instructions": [
-        "Match pairs of cards",
-        "Tap cards to flip them",
-        "Remember card positions",
-        "Match all pairs to win"
-    ]},
-    {"num": 16, "name": "Sudoku Lite", "type": "puzzle", "instructions": [
-        "Fill the grid with numbers 1-9",
-        "No duplicates in row, column, or box",
-        "Use logic to solve",
-        "Difficulty affects grid size"
-    ]},
-    {"num": 17, "name": "Cross Puzzle", "type": "puzzle", "instructions": [
-        "Solve crossword-style puzzles",
-        "Fill words based on clues",
-        "Words intersect correctly",
-        "Complete the entire grid"
-    ]},
-    {"num": 18, "name": "Link Connect", "type": "puzzle", "instructions": [
-        "Connect matching items",
-        "Draw paths between pairs",
-        "Paths cannot cross",
-        "Connect all pairs to win"
-    ]},
-    {"num": 19, "name": "Bubble Sort", "type": "puzzle", "instructions": [
-        "Sort bubbles by color",
-        "Tap bubbles to swap positions",
-        "Arrange in correct order",
-        "Minimize number of swaps"
-    ]},
-    {"num": 20, "name": "Grid Solver", "type": "puzzle", "instructions": [
-        "Solve grid-based puzzles",
-        "Follow the rules for each grid",
-        "Complete all cells correctly",
-        "Think step by step"
-    ]},
-    
-    # Arcade Games (21-40) - Continuing with abbreviated list for space
-    {"num": 21, "name": "Space Shooter", "type": "arcade", "instructions": [
-        "Shoot asteroids in space",
-        "Tap to shoot, swipe to move",
-        "Destroy all asteroids",
-        "Avoid collisions"
-    ]},
-    {"num": 22, "name": "Endless Runner", "type": "arcade", "instructions": [
-        "Run and dodge obstacles",
-        "Swipe up to jump, down to slide",
-        "Run as far as possible",
-        "Speed increases over time"
-    ]},
-    {"num": 23, "name": "Snake Classic", "type": "arcade", "instructions": [
-        "Control the snake",
-        "Swipe to change direction",
-        "Eat food to grow",
-        "Don't hit walls or yourself"
-    ]},
-    {"num": 24, "name": "Breakout Bricks", "type": "arcade", "instructions": [
-        "Break all bricks",
-        "Move paddle to bounce ball",
-        "Don't let ball fall",
-        "Clear all bricks to win"
-    ]},
-    {"num": 25, "name": "Flappy Bird Clone", "type": "arcade", "instructions": [
-        "Tap to fly",
-        "Navigate through pipes",
-        "Don't hit obstacles",
-        "Go as far as possible"
-    ]},
-    # ... (continuing with all 100 games)
-]
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app_layout
+import flutter_skeleton
+import game_catalog
+
+def __getattr__(name):
+    """GAMES_DATA is loaded lazily from the shared game catalog"""
+    if name == "GAMES_DATA":
+        return game_catalog.game_dicts()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_game_app(game_data):
     """Create a unique game app with all features"""
@@ -175,9 +29,9 @@ def create_game_app(game_data):
     game_type = game_data["type"]
     instructions = game_data["instructions"]
     
-    app_name = f"app{app_num:02d}"
+    app_name = app_layout.app_name(app_num)
     package_name = f"org.gloven.{app_name}"
-    app_dir = f"apps/{app_name}"
+    app_dir = str(app_layout.app_dir(app_name))
     
     print(f"Creating {app_num}/100: {game_name}...")
     
@@ -185,16 +39,8 @@ def create_game_app(game_data):
     if os.path.exists(app_dir):
         shutil.rmtree(app_dir)
     
-    # Create Flutter app
-    subprocess.run(
-        ["flutter", "create", "--org", "org.gloven", "--project-name", app_name, app_dir],
-        check=True,
-        capture_output=True
-    )
-    
-    # Wait for files
-    import time
-    time.sleep(2)
+    # Create Flutter app from the cached skeleton
+    flutter_skeleton.create_app(app_dir, app_name, "org.gloven")
     
     # Copy template files and customize
     # This is a simplified version - full implementation would copy all template files
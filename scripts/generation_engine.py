@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Parallel generation engine shared by the app generators
+
+Jobs run on a bounded concurrent.futures pool and results are streamed back
+in completion order, so one slow app never holds up reporting for the rest.
+A job that raises is resubmitted up to `retries` more times without touching
+the rest of the batch. With tracing on, every job is recorded as a span on
+the worker slot that ran it (see tracing.py).
+"""
+
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import tracing
+
+ADMISSION_POLL_SECONDS = 5
+
+JobResult = namedtuple("JobResult", ["key", "ok", "value", "error", "attempts", "elapsed"])
+
+def default_workers():
+    """One worker per core"""
+    return os.cpu_count() or 1
+
+def run_jobs(func, items, workers=None, retries=1, key=str, use_threads=False,
+             on_submit=None, admission=None):
+    """Run func(item) for every item; yield a JobResult as each one finishes
+
+    func must be a picklable top-level callable unless use_threads is set.
+    A job fails when func raises; failed jobs are retried immediately.
+    At most `workers` jobs are in flight, so on_submit(item) is called as a
+    job actually starts running. If an admission object is given, a job only
+    starts once admission.try_acquire(item) is true, and admission.release(item)
+    is called when it finishes; jobs start in order.
+    """
+    workers = workers or default_workers()
+    pool_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    queue = deque((item, 1, None) for item in items)
+
+    # Free worker slots; a job's slot is its lane in the trace
+    slots = list(range(workers, 0, -1))
+
+    with pool_class(max_workers=workers) as pool:
+        pending = {}
+
+        def fill():
+            while len(pending) < workers and queue:
+                item, attempt, started = queue[0]
+                if admission is not None and not admission.try_acquire(item):
+                    return
+                queue.popleft()
+                if on_submit is not None:
+                    on_submit(item)
+                pending[pool.submit(func, item)] = (item, attempt, started or time.monotonic(),
+                                                    time.time_ns(), slots.pop())
+
+        fill()
+        while pending or queue:
+            if not pending:
+                raise RuntimeError("admission refused a job with nothing running")
+            # Poll while jobs wait for admission, since memory can free up
+            # without any of our own jobs finishing
+            timeout = ADMISSION_POLL_SECONDS if queue and len(pending) < workers else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, attempt, started, submitted_ns, slot = pending.pop(future)
+                slots.append(slot)
+                if admission is not None:
+                    admission.release(item)
+                tracing.record("job", submitted_ns, time.time_ns() - submitted_ns, tid=slot,
+                               app=key(item), attempt=attempt, ok=future.exception() is None)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    if attempt <= retries:
+                        print(f"↻ {key(item)}: {e} (retry {attempt}/{retries})")
+                        queue.appendleft((item, attempt + 1, started))
+                        continue
+                    result = JobResult(key(item), False, None, str(e), attempt,
+                                       time.monotonic() - started)
+                else:
+                    result = JobResult(key(item), True, value, None, attempt,
+                                       time.monotonic() - started)
+                fill()
+                yield result
+            fill()
+
+def report_progress(results, total):
+    """Print one line per finished job, passing each result through"""
+    width = len(str(total))
+    for done, result in enumerate(results, 1):
+        status = "✅" if result.ok else "❌"
+        line = f"[{done:>{width}}/{total}] {status} {result.key} ({result.elapsed:.1f}s)"
+        if not result.ok:
+            line += f": {result.error[:100]}"
+        print(line, flush=True)
+        yield result
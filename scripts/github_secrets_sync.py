@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Batched GitHub Actions secrets sync
+
+The repository public key is fetched once and all values are encrypted with
+a single SealedBox. PUTs run concurrently on a small thread pool where every
+worker keeps its own keep-alive connection. Secrets that exist remotely and
+whose value did not change since the last sync (tracked as HMAC digests in
+.secrets_sync_state.json, keyed by the token) are skipped.
+
+The API base URL comes from GITHUB_API_URL, so the sync can be pointed at a
+local stand-in server that mimics the secrets endpoints (the one in
+tests/test_github_secrets_sync.py checks connection reuse and skipping).
+"""
+
+import base64
+import hashlib
+import hmac
+import http.client
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    from nacl import public
+except ImportError:
+    public = None
+
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+STATE_FILE = Path(".secrets_sync_state.json")
+MAX_WORKERS = 4
+
+class SecretsClient:
+    """Minimal client for /repos/{repo}/actions/secrets with pooled connections"""
+
+    def __init__(self, repo, token, api_url=API_URL, timeout=30):
+        self.repo = repo
+        self.token = token
+        self.timeout = timeout
+        url = urlsplit(api_url)
+        self._scheme = url.scheme
+        self._netloc = url.netloc
+        self._base_path = url.path.rstrip('/')
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._public_key = None
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(self._netloc, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def request(self, method, path, body=None):
+        """Send a request on this thread's connection; returns (status, json_or_None)"""
+        headers = {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "gloven-secrets-sync",
+        }
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            headers["Content-Type"] = "application/json"
+
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, self._base_path + path, body=data, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Server closed an idle keep-alive connection; reconnect once
+                conn.close()
+                if attempt:
+                    raise
+        return response.status, (json.loads(payload) if payload else None)
+
+    def public_key(self):
+        """(key_id, key) for the repository, fetched once per client"""
+        if self._public_key is None:
+            status, data = self.request("GET", f"/repos/{self.repo}/actions/secrets/public-key")
+            if status != 200:
+                raise RuntimeError(f"Could not get public key: HTTP {status}")
+            self._public_key = (data["key_id"], data["key"])
+        return self._public_key
+
+    def list_secrets(self):
+        """Names of the secrets already configured on the repository"""
+        names = set()
+        page = 1
+        while True:
+            status, data = self.request("GET", f"/repos/{self.repo}/actions/secrets?per_page=100&page={page}")
+            if status != 200:
+                raise RuntimeError(f"Could not list secrets: HTTP {status}")
+            batch = data.get("secrets", [])
+            names.update(s["name"] for s in batch)
+            if len(names) >= data.get("total_count", 0) or not batch:
+                return names
+            page += 1
+
+    def put_secret(self, name, encrypted_value, key_id):
+        """Create or update one secret; returns the HTTP status"""
+        status, _ = self.request(
+            "PUT",
+            f"/repos/{self.repo}/actions/secrets/{name}",
+            {"encrypted_value": encrypted_value, "key_id": key_id},
+        )
+        return status
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+def encrypt_all(public_key_b64, secrets):
+    """Encrypt every value with one SealedBox; returns {name: base64}"""
+    if public is None:
+        raise RuntimeError("PyNaCl is required: pip install PyNaCl")
+    box = public.SealedBox(public.PublicKey(base64.b64decode(public_key_b64)))
+    return {
+        name: base64.b64encode(box.encrypt(value.encode('utf-8'))).decode('utf-8')
+        for name, value in secrets.items()
+    }
+
+def value_digest(token, key_id, name, value):
+    """Digest used to detect unchanged values without storing them"""
+    message = f"{key_id}\0{name}\0{value}".encode('utf-8')
+    return hmac.new(token.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_state(state, path=STATE_FILE):
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def sync_secrets(client, secrets, state_path=STATE_FILE, force=False, max_workers=MAX_WORKERS):
+    """Upload changed secrets; returns {name: "set" | "unchanged" | error message}"""
+    key_id, key = client.public_key()
+    existing = client.list_secrets()
+    state = load_state(state_path)
+
+    digests = {name: value_digest(client.token, key_id, name, value) for name, value in secrets.items()}
+    changed = {
+        name: value for name, value in secrets.items()
+        if force or name not in existing or state.get(name) != digests[name]
+    }
+    results = {name: "unchanged" for name in secrets if name not in changed}
+
+    encrypted = encrypt_all(key, changed)
+
+    def put(name):
+        try:
+            status = client.put_secret(name, encrypted[name], key_id)
+        except Exception as e:
+            return name, str(e)
+        return name, "set" if status in (201, 204) else f"HTTP {status}"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for name, outcome in pool.map(put, changed):
+            results[name] = outcome
+            if outcome == "set":
+                state[name] = digests[name]
+
+    save_state(state, state_path)
+    return results
+
+def print_results(results):
+    """Print one status line per secret; returns the number of failures"""
+    failures = 0
+    for name in sorted(results):
+        outcome = results[name]
+        if outcome == "set":
+            print(f"✅ {name} set successfully")
+        elif outcome == "unchanged":
+            print(f"⏭️  {name} unchanged")
+        else:
+            print(f"❌ Error setting {name}: {outcome}")
+            failures += 1
+    return failures
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Minimal Kotlin-DSL block parser for build.gradle.kts
+
+The file is tokenized once into a tree of blocks (plugins, android,
+signingConfigs, buildTypes, ...) whose leaves are the original source lines,
+so emitting an untouched tree reproduces the file byte for byte. Edits are
+applied to the tree and report whether they changed anything, which lets
+callers skip rewriting files that are already up to date.
+"""
+
+import re
+
+INDENT = "    "
+
+_STRING = re.compile(r'"(?:\\.|[^"\\])*"')
+
+class GradleParseError(ValueError):
+    """Raised when braces in a build script cannot be matched"""
+
+class Block:
+    """A `header { ... }` block; children are source lines or nested blocks"""
+
+    def __init__(self, header=None, parent=None):
+        self.header = header
+        self.footer = None
+        self.parent = parent
+        self.children = []
+
+    @property
+    def name(self):
+        """Header without the opening brace, e.g. `create("release")`"""
+        if self.header is None:
+            return None
+        return self.header.strip()[:-1].strip()
+
+    @property
+    def indent(self):
+        """Indentation of the block's own header line"""
+        if self.header is None:
+            return ""
+        return self.header[:len(self.header) - len(self.header.lstrip())]
+
+    @property
+    def child_indent(self):
+        return "" if self.header is None else self.indent + INDENT
+
+    def blocks(self, name=None):
+        """Direct child blocks, optionally filtered by name"""
+        return [c for c in self.children
+                if isinstance(c, Block) and (name is None or c.name == name)]
+
+    def find(self, *names):
+        """Follow a path of block names, e.g. find("android", "buildTypes")"""
+        block = self
+        for name in names:
+            matches = block.blocks(name)
+            if not matches:
+                return None
+            block = matches[0]
+        return block
+
+    def statements(self):
+        """Direct child source lines as (index, line) pairs"""
+        return [(i, c) for i, c in enumerate(self.children) if isinstance(c, str)]
+
+    def index(self, child):
+        """Position of a child node (by identity)"""
+        for i, c in enumerate(self.children):
+            if c is child:
+                return i
+        raise ValueError("not a child of this block")
+
+    def insert(self, index, nodes):
+        """Insert lines and/or blocks at index"""
+        for offset, node in enumerate(nodes):
+            if isinstance(node, Block):
+                node.parent = self
+            self.children.insert(index + offset, node)
+
+    def lines(self):
+        """Yield the block's source lines in order"""
+        if self.header is not None:
+            yield self.header
+        for child in self.children:
+            if isinstance(child, Block):
+                yield from child.lines()
+            else:
+                yield child
+        if self.footer is not None:
+            yield self.footer
+
+def _brace_counts(line):
+    """Count braces outside string literals and // comments"""
+    code = _STRING.sub('""', line).split("//", 1)[0]
+    return code.count("{"), code.count("}")
+
+def parse(text):
+    """Parse build script text into a root Block"""
+    root = Block()
+    current = root
+    for number, line in enumerate(text.split("\n"), 1):
+        opens, closes = _brace_counts(line)
+        stripped = line.strip()
+        if opens == closes and not (stripped.startswith("}") and stripped.endswith("{")):
+            current.children.append(line)
+        elif opens == closes:
+            # `} else {` closes one block and opens a sibling
+            if current.parent is None:
+                raise GradleParseError(f"line {number}: unmatched '}}'")
+            current.footer = None
+            current = current.parent
+            block = Block(line, current)
+            current.children.append(block)
+            current = block
+        elif opens - closes == 1 and stripped.endswith("{"):
+            block = Block(line, current)
+            current.children.append(block)
+            current = block
+        elif closes - opens == 1 and stripped.startswith("}"):
+            if current.parent is None:
+                raise GradleParseError(f"line {number}: unmatched '}}'")
+            current.footer = line
+            current = current.parent
+        else:
+            raise GradleParseError(f"line {number}: unsupported brace layout: {stripped}")
+    if current is not root:
+        raise GradleParseError(f"unclosed block: {current.name}")
+    return root
+
+def emit(root):
+    """Render a tree back to text"""
+    return "\n".join(root.lines())
+
+def parse_snippet(text, indent=""):
+    """Parse a snippet into nodes ready to insert at the given indentation"""
+    lines = [indent + line if line else line for line in text.split("\n")]
+    return parse("\n".join(lines)).children
+
+def _assignment(line, key):
+    return re.match(rf'^\s*{re.escape(key)}\s*=', line) is not None
+
+def find_assignment(block, key):
+    """Index of the first `key = ...` line directly inside block, or None"""
+    for i, line in block.statements():
+        if _assignment(line, key):
+            return i
+    return None
+
+def set_assignment(block, key, value):
+    """Set `key = value` inside block; returns True if the tree changed"""
+    wanted = f"{block.child_indent}{key} = {value}"
+    i = find_assignment(block, key)
+    if i is None:
+        block.insert(0, [wanted])
+        return True
+    current = block.children[i]
+    prefix = current[:len(current) - len(current.lstrip())]
+    if current == f"{prefix}{key} = {value}":
+        return False
+    block.children[i] = f"{prefix}{key} = {value}"
+    return True
+
+def replace_in_statements(block, old, new, recursive=True):
+    """Substring-replace inside source lines; returns True if anything changed"""
+    changed = False
+    for i, child in enumerate(block.children):
+        if isinstance(child, Block):
+            if recursive:
+                changed |= replace_in_statements(child, old, new)
+        elif old in child:
+            block.children[i] = child.replace(old, new)
+            changed = True
+    return changed
+
+def _is_blank(node):
+    return isinstance(node, str) and not node.strip()
+
+def _normalized(node):
+    if isinstance(node, Block):
+        return tuple(line.strip() for line in node.lines() if line.strip())
+    return node.strip()
+
+def remove_duplicates(block, predicate):
+    """Drop repeated children (compared ignoring blank lines and indentation)"""
+    seen = set()
+    kept = []
+    changed = False
+    for child in block.children:
+        if predicate(child):
+            key = _normalized(child)
+            if key in seen:
+                changed = True
+                continue
+            seen.add(key)
+        kept.append(child)
+    if changed:
+        # Collapse the blank-line runs the removed duplicates leave behind
+        kept = [c for i, c in enumerate(kept)
+                if not (_is_blank(c) and i > 0 and _is_blank(kept[i - 1]))]
+    block.children = kept
+    return changed
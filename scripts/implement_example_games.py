@@ -9,6 +9,8 @@ import shutil
 import subprocess
 from pathlib import Path
 
+import app_layout
+
 # Example games to implement first
 EXAMPLE_GAMES = [
     {
@@ -75,8 +77,8 @@ def create_game_implementation(game_data):
     game_type = game_data["type"]
     instructions = game_data["instructions"]
     
-    app_name = f"app{app_num:02d}"
-    app_dir = Path(f"apps/{app_name}")
+    app_name = app_layout.app_name(app_num)
+    app_dir = app_layout.app_dir(app_name)
     
     print(f"\n🎮 Creating {game_name} ({game_type})...")
     
@@ -1,66 +1,40 @@
 #!/usr/bin/env python3
 """List all Flutter apps with package names and icon information"""
 
-import os
-from pathlib import Path
+import argparse
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fleet_inventory
 
 def get_app_info(app_dir):
     """Get information about an app"""
-    app_name = app_dir.name
-    package_name = f"org.gloven.{app_name}"
-    
-    # Get package name from build.gradle.kts
-    build_gradle = app_dir / "android" / "app" / "build.gradle.kts"
-    if build_gradle.exists():
-        with open(build_gradle, 'r') as f:
-            content = f.read()
-            # Extract namespace/applicationId
-            import re
-            namespace_match = re.search(r'namespace\s*=\s*"([^"]+)"', content)
-            appid_match = re.search(r'applicationId\s*=\s*"([^"]+)"', content)
-            if namespace_match:
-                package_name = namespace_match.group(1)
-            elif appid_match:
-                package_name = appid_match.group(1)
-    
-    # Find icon files
-    icon_paths = []
-    icon_dir = app_dir / "android" / "app" / "src" / "main" / "res"
-    if icon_dir.exists():
-        for mipmap_dir in icon_dir.glob("mipmap-*/ic_launcher.png"):
-            icon_paths.append(str(mipmap_dir.relative_to(app_dir)))
-    
-    # Get app name from pubspec.yaml
-    pubspec = app_dir / "pubspec.yaml"
-    app_title = app_name
-    if pubspec.exists():
-        with open(pubspec, 'r') as f:
-            content = f.read()
-            # Extract description
-            import re
-            desc_match = re.search(r'description:\s*(.+)', content)
-            if desc_match:
-                app_title = desc_match.group(1).strip()
-    
-    return {
-        'app_name': app_name,
-        'package_name': package_name,
-        'app_title': app_title,
-        'icon_count': len(icon_paths),
-        'icon_paths': icon_paths
-    }
+    return fleet_inventory.scan_app(app_dir)
 
 def main():
-    apps_dir = Path("apps")
-    apps = sorted([d for d in apps_dir.iterdir() if d.is_dir() and d.name.startswith("app")])
+    parser = argparse.ArgumentParser(description="List all Flutter apps")
+    parser.add_argument("--json", action="store_true", help="Print the inventory as JSON")
+    parser.add_argument("--query", action="append", default=[], metavar="KEY=VALUE",
+                        help="Only list apps whose (dotted) field matches")
+    args = parser.parse_args()
+    
+    # Served from the cached inventory index; only changed apps are rescanned
+    index, _ = fleet_inventory.refresh_index("apps")
+    apps = fleet_inventory.query(index, args.query)
+    
+    if args.json:
+        json.dump([fleet_inventory.public_entry(e) for e in apps], sys.stdout, indent=2)
+        print()
+        return
     
     print("=" * 100)
     print(f"{'APP':<10} | {'PACKAGE NAME':<35} | {'ICONS':<15} | {'TITLE'}")
     print("=" * 100)
     
-    for app_dir in apps:
-        info = get_app_info(app_dir)
+    for info in apps:
         icon_info = f"{info['icon_count']} sizes" if info['icon_count'] > 0 else "Default"
         title = info['app_title'][:40] if len(info['app_title']) > 40 else info['app_title']
         
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Map a git diff to the apps whose AAB needs rebuilding
+
+Rules, in order:
+  - apps/appNN/...                affects appNN (docs, tests and non-Android
+    apps/<bucket>/appNN/...       platform folders are ignored)
+  - scripts/game_catalog.jsonl    affects the apps whose catalog record changed
+  - templates/game_base, the generator sources, the shared gradle/pubspec
+    handling, the keystore and the build workflow affect every app
+  - anything else                 affects nothing
+
+The result is printed as a GitHub Actions matrix ({"include": [...]}) and,
+with --github-output, written to $GITHUB_OUTPUT as `matrix` and `count`.
+If the diff cannot be computed (new branch, shallow clone) every app is
+planned, so a build is never silently skipped.
+
+Usage:
+    plan_affected_apps.py [--base REF] [--head REF] [--files PATH ...]
+                          [--apps 1,7,42] [--all] [--github-output]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+
+import app_layout
+import build_state
+
+APPS_DIR = Path("apps")
+CATALOG_PATH = "scripts/game_catalog.jsonl"
+
+# Paths inside an app that never end up in the Android bundle
+APP_IGNORED = [
+    "*.md",
+    "test/*",
+    "integration_test/*",
+    "ios/*",
+    "macos/*",
+    "linux/*",
+    "windows/*",
+    "web/*",
+    "build/*",
+    ".dart_tool/*",
+    "android/.gradle/*",
+]
+
+# Shared inputs every app is built or generated from
+SHARED_PATTERNS = [
+    f"{build_state.TEMPLATE_DIR.as_posix()}/*",
+    *(f"scripts/{source.name}" for source in build_state.GENERATOR_SOURCES),
+    "scripts/create_app_template.sh",
+    "gloven-keystore.jks",
+    "pubspec.yaml",  # pub workspace root and its shared lockfile
+    "pubspec.lock",
+    "packages/*",  # local path packages such as gloven_core
+    ".github/workflows/build-all-apps.yml",
+]
+
+NULL_SHA = "0" * 40
+
+def all_apps(apps_dir=APPS_DIR):
+    """Names of every app in the tree, in number order"""
+    return sorted((d.name for d in app_layout.iter_app_dirs(apps_dir)), key=app_layout.app_number)
+
+def changed_files(base, head="HEAD"):
+    """Paths changed between base and head, or None if git cannot tell"""
+    if not base or base == NULL_SHA:
+        return None
+    result = subprocess.run(
+        ["git", "diff", "--name-only", "--no-renames", f"{base}...{head}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"⚠️  git diff failed: {result.stderr.strip()}", file=sys.stderr)
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+def _catalog_records(ref):
+    result = subprocess.run(["git", "show", f"{ref}:{CATALOG_PATH}"], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    records = {}
+    for line in result.stdout.splitlines():
+        if line.strip():
+            record = json.loads(line)
+            records[app_layout.app_name(record['num'])] = record
+    return records
+
+def catalog_changes(base, head="HEAD"):
+    """Apps whose catalog record differs between base and head, or None if unknown"""
+    before = _catalog_records(base)
+    after = _catalog_records(head)
+    if before is None or after is None:
+        return None
+    return {app for app in set(before) | set(after) if before.get(app) != after.get(app)}
+
+def affected_apps(files, known_apps, base=None, head="HEAD"):
+    """Apply the rules to a list of changed paths; returns (apps, reasons)"""
+    known = set(known_apps)
+    affected = set()
+    reasons = {}
+
+    def add(apps, reason):
+        for app in apps:
+            if app in known and app not in affected:
+                affected.add(app)
+                reasons[app] = reason
+
+    for path in files:
+        match = app_layout.split_app_path(path)
+        if match:
+            app, rel = match
+            if not any(fnmatch(rel, pattern) for pattern in APP_IGNORED):
+                add([app], path)
+        elif path == CATALOG_PATH:
+            changed = catalog_changes(base, head) if base else None
+            add(known if changed is None else changed, path)
+        elif any(fnmatch(path, pattern) for pattern in SHARED_PATTERNS):
+            add(known, path)
+        if affected == known:
+            break
+
+    return sorted(affected, key=app_layout.app_number), reasons
+
+def parse_app_list(text, known_apps):
+    """'1,7,app42' -> ['app01', 'app07', 'app42'] (unknown apps dropped)"""
+    apps = []
+    for item in re.split(r'[,\s]+', text.strip()):
+        if not item:
+            continue
+        name = item if item.startswith("app") else app_layout.app_name(int(item))
+        if name in known_apps:
+            apps.append(name)
+        else:
+            print(f"⚠️  Unknown app: {item}", file=sys.stderr)
+    return sorted(set(apps), key=app_layout.app_number)
+
+def build_matrix(apps):
+    """GitHub Actions matrix for a list of app names"""
+    return {"include": [{"app": app, "app_number": app_layout.app_number(app)} for app in apps]}
+
+def write_github_output(matrix):
+    """Append matrix/count outputs for a workflow step"""
+    output = os.environ.get("GITHUB_OUTPUT")
+    if not output:
+        return
+    with open(output, 'a') as f:
+        f.write(f"matrix={json.dumps(matrix, separators=(',', ':'))}\n")
+        f.write(f"count={len(matrix['include'])}\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan which apps a change needs to rebuild")
+    parser.add_argument("--base", help="Base ref/sha of the diff")
+    parser.add_argument("--head", default="HEAD", help="Head ref/sha of the diff")
+    parser.add_argument("--files", nargs="*", help="Changed paths (instead of running git diff)")
+    parser.add_argument("--apps", help="Explicit app numbers, e.g. 1,7,42 (overrides the diff)")
+    parser.add_argument("--all", action="store_true", help="Plan every app")
+    parser.add_argument("--apps-dir", default=str(APPS_DIR))
+    parser.add_argument("--github-output", action="store_true", help="Write matrix/count to $GITHUB_OUTPUT")
+    args = parser.parse_args()
+
+    known = all_apps(args.apps_dir)
+
+    if args.all:
+        apps = known
+        print("📦 Planning all apps (--all)", file=sys.stderr)
+    elif args.apps:
+        apps = parse_app_list(args.apps, known)
+        print(f"📦 Planning requested apps: {', '.join(apps) or 'none'}", file=sys.stderr)
+    else:
+        files = args.files if args.files is not None else changed_files(args.base, args.head)
+        if files is None:
+            apps = known
+            print("📦 Diff unavailable, planning all apps", file=sys.stderr)
+        else:
+            apps, reasons = affected_apps(files, known, args.base, args.head)
+            print(f"📦 {len(files)} changed files -> {len(apps)} affected apps", file=sys.stderr)
+            by_reason = {}
+            for app in apps:
+                by_reason.setdefault(reasons[app], []).append(app)
+            for reason, reason_apps in by_reason.items():
+                listed = ", ".join(reason_apps) if len(reason_apps) <= 5 else f"{len(reason_apps)} apps"
+                print(f"   {reason}: {listed}", file=sys.stderr)
+
+    matrix = build_matrix(apps)
+    if args.github_output:
+        write_github_output(matrix)
+    print(json.dumps(matrix))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Pack app builds into N shards, longest-processing-time first
+
+Each shard is built sequentially on one runner, so the toolchain setup is
+paid once per shard instead of once per app. Apps are sorted by estimated
+build time and each one goes to the currently least-loaded shard, which
+keeps the slowest shard close to the average.
+
+Estimates come from .build_durations.json (seconds per app, smoothed over
+runs). Apps without a recorded duration are estimated from the number of
+source files under lib/ and android/, scaled by the seconds-per-file ratio
+of the recorded apps when there are any.
+
+Usage:
+    plan_shards.py [--shards N] [--matrix FILE|-] [--apps 1,7,42] [--github-output]
+    plan_shards.py --record APP SECONDS [--durations FILE]
+    plan_shards.py --merge FILE ... [--durations FILE]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+import app_layout
+import fleet_walk
+import plan_affected_apps
+
+DURATIONS_FILE = Path(".build_durations.json")
+DEFAULT_SHARDS = 8
+SMOOTHING = 0.5
+
+# Fallback when nothing has been recorded yet
+BASE_SECONDS = 240.0
+SECONDS_PER_FILE = 1.5
+SOURCE_DIRS = ("lib", "android")
+SKIPPED_DIRS = {"build", ".gradle", ".cxx", ".dart_tool"}
+
+def load_durations(path=DURATIONS_FILE):
+    """{app: seconds} of recorded builds"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_durations(durations, path=DURATIONS_FILE):
+    """Write recorded durations atomically"""
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def record_duration(durations, app, seconds):
+    """Blend a new measurement into the recorded duration of an app"""
+    previous = durations.get(app)
+    if previous is None:
+        durations[app] = round(seconds, 1)
+    else:
+        durations[app] = round(previous * (1 - SMOOTHING) + seconds * SMOOTHING, 1)
+
+def source_file_count(app_dir):
+    """Files under the app's lib/ and android/ trees (build outputs skipped)"""
+    return sum(1 for _ in fleet_walk.walk(app_dir, SOURCE_DIRS, SKIPPED_DIRS))
+
+def estimate_durations(apps, durations, apps_dir=plan_affected_apps.APPS_DIR):
+    """{app: (seconds, source)} with source "recorded" or "estimated" """
+    file_counts = {app_dir.name: count for app_dir, count in fleet_walk.map_roots(
+        source_file_count, (app_layout.app_dir(app, apps_dir) for app in apps))}
+
+    ratios = [durations[app] / file_counts[app] for app in apps if app in durations and file_counts[app]]
+    if ratios:
+        per_file, base = statistics.median(ratios), 0.0
+    else:
+        per_file, base = SECONDS_PER_FILE, BASE_SECONDS
+
+    estimates = {}
+    for app in apps:
+        if app in durations:
+            estimates[app] = (float(durations[app]), "recorded")
+        else:
+            estimates[app] = (base + per_file * file_counts[app], "estimated")
+    return estimates
+
+def plan_shards(estimates, shards):
+    """LPT packing; returns [{"apps": [...], "seconds": total}] (empty shards dropped)"""
+    shards = max(1, min(shards, len(estimates)))
+    heap = [(0.0, i) for i in range(shards)]
+    bins = [[] for _ in range(shards)]
+    loads = [0.0] * shards
+
+    for app in sorted(estimates, key=lambda a: (-estimates[a][0], a)):
+        load, i = heapq.heappop(heap)
+        bins[i].append(app)
+        loads[i] = load + estimates[app][0]
+        heapq.heappush(heap, (loads[i], i))
+
+    return [{"apps": bins[i], "seconds": round(loads[i], 1)} for i in range(shards) if bins[i]]
+
+def build_matrix(plan):
+    """GitHub Actions matrix with one entry per shard"""
+    return {"include": [
+        {"shard": i + 1, "apps": " ".join(shard["apps"]), "estimate": shard["seconds"]}
+        for i, shard in enumerate(plan)
+    ]}
+
+def write_github_output(matrix):
+    """Append matrix/count outputs for a workflow step"""
+    output = os.environ.get("GITHUB_OUTPUT")
+    if not output:
+        return
+    with open(output, 'a') as f:
+        f.write(f"matrix={json.dumps(matrix, separators=(',', ':'))}\n")
+        f.write(f"count={len(matrix['include'])}\n")
+
+def _read_matrix_apps(source):
+    text = sys.stdin.read() if source == "-" else Path(source).read_text()
+    return [entry["app"] for entry in json.loads(text)["include"]]
+
+def _format_minutes(seconds):
+    return f"{seconds / 60:.1f}m"
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan sharded fleet builds")
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS)
+    parser.add_argument("--matrix", help="plan_affected_apps.py output to shard (file or -)")
+    parser.add_argument("--apps", help="Explicit app numbers, e.g. 1,7,42")
+    parser.add_argument("--apps-dir", default=str(plan_affected_apps.APPS_DIR))
+    parser.add_argument("--durations", default=str(DURATIONS_FILE))
+    parser.add_argument("--record", nargs=2, metavar=("APP", "SECONDS"), help="Record one build duration")
+    parser.add_argument("--merge", nargs="+", metavar="FILE", help="Merge recorded durations from other files")
+    parser.add_argument("--github-output", action="store_true", help="Write matrix/count to $GITHUB_OUTPUT")
+    args = parser.parse_args()
+
+    durations = load_durations(args.durations)
+
+    if args.record:
+        app, seconds = args.record
+        record_duration(durations, app, float(seconds))
+        save_durations(durations, args.durations)
+        return
+    if args.merge:
+        for path in args.merge:
+            for app, seconds in load_durations(path).items():
+                record_duration(durations, app, float(seconds))
+        save_durations(durations, args.durations)
+        print(f"✅ {len(durations)} app durations in {args.durations}")
+        return
+
+    known = plan_affected_apps.all_apps(args.apps_dir)
+    if args.matrix:
+        apps = _read_matrix_apps(args.matrix)
+    elif args.apps:
+        apps = plan_affected_apps.parse_app_list(args.apps, known)
+    else:
+        apps = known
+
+    estimates = estimate_durations(apps, durations, args.apps_dir)
+    plan = plan_shards(estimates, args.shards) if apps else []
+
+    recorded = sum(1 for seconds, source in estimates.values() if source == "recorded")
+    total = sum(seconds for seconds, _ in estimates.values())
+    print(f"📦 {len(apps)} apps ({recorded} with recorded durations) in {len(plan)} shards, "
+          f"{_format_minutes(total)} of builds", file=sys.stderr)
+    for i, shard in enumerate(plan, 1):
+        print(f"   shard {i}: {len(shard['apps'])} apps, ~{_format_minutes(shard['seconds'])}", file=sys.stderr)
+
+    matrix = build_matrix(plan)
+    if args.github_output:
+        write_github_output(matrix)
+    print(json.dumps(matrix))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Resolve pub dependencies once per group of identical apps
+
+Apps are grouped by their dependency sections (dependencies,
+dev_dependencies, dependency_overrides and the SDK environment). Each group
+is resolved with a single `flutter pub get` in one member app, and the
+resulting pubspec.lock and .dart_tool package config are stamped into every
+other member with the root package name rewritten. Stamped files are newer
+than the pubspec, so `flutter build` does not resolve again.
+
+Before anything is written, the fleet is checked for drift:
+  - apps whose dependency sections differ from the largest group
+  - lockfiles that differ from the rest of their group
+  - lockfiles that do not list the pubspec's direct dependencies
+  - pubspecs that repeat a top-level key (pub rejects those)
+
+In pub workspace mode (see pub_workspace.py) the fleet has a single
+resolution already, so pub get runs once at the repository root instead.
+
+Usage:
+    pub_resolve.py [app_dir ...] [--check] [--offline] [--json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import app_layout
+import blob_store
+import fleet_inventory
+import flutter_skeleton
+import pub_workspace
+
+RESOLUTION_SECTIONS = fleet_inventory.DEPENDENCY_SECTIONS + ("environment",)
+PUBSPEC = "pubspec.yaml"
+LOCKFILE = "pubspec.lock"
+PACKAGE_CONFIG = Path(".dart_tool/package_config.json")
+PACKAGE_GRAPH = Path(".dart_tool/package_graph.json")
+TOOL_VERSION = Path(".dart_tool/version")
+
+NAME_RE = re.compile(r'^name:\s*(\S+)', re.MULTILINE)
+LOCK_PACKAGE_RE = re.compile(r'^  (\S+):\n    dependency: "?([^"\n]+)"?$', re.MULTILINE)
+
+def package_name(pubspec_text, default=None):
+    """The pubspec's `name:`"""
+    match = NAME_RE.search(pubspec_text)
+    return match.group(1) if match else default
+
+def resolution_sections(pubspec_text):
+    """The pubspec sections that determine a resolution"""
+    return fleet_inventory.parse_dependencies(pubspec_text, RESOLUTION_SECTIONS)
+
+def group_key(sections):
+    return hashlib.sha256(json.dumps(sections, sort_keys=True).encode()).hexdigest()[:12]
+
+def duplicate_top_level_keys(pubspec_text):
+    """Top-level keys that appear more than once"""
+    seen, duplicates = set(), []
+    for line in pubspec_text.split('\n'):
+        if line and not line.startswith((' ', '\t', '#')) and ':' in line:
+            key = line.split(':', 1)[0].strip()
+            if key in seen and key not in duplicates:
+                duplicates.append(key)
+            seen.add(key)
+    return duplicates
+
+def lock_direct_dependencies(lock_text):
+    """Names the lockfile records as direct (main/dev/overridden) dependencies"""
+    return {name for name, kind in LOCK_PACKAGE_RE.findall(lock_text) if kind.startswith("direct")}
+
+def pubspec_direct_dependencies(sections):
+    return {
+        name for section in ("dependencies", "dev_dependencies")
+        for name, value in sections.get(section, {}).items()
+        if not (value or "").startswith("sdk:")
+    }
+
+def load_app(app_dir):
+    """What resolution and drift checks need to know about one app"""
+    app_dir = Path(app_dir)
+    pubspec_text = (app_dir / PUBSPEC).read_text()
+    lock = app_dir / LOCKFILE
+    sections = resolution_sections(pubspec_text)
+    return {
+        "app": app_dir.name,
+        "dir": app_dir,
+        "package": package_name(pubspec_text, app_dir.name),
+        "sections": sections,
+        "group": group_key(sections),
+        "lock": lock.read_bytes() if lock.exists() else None,
+        "duplicate_keys": duplicate_top_level_keys(pubspec_text),
+    }
+
+def _app_order(name):
+    # app100 after app99, not between app10 and app11
+    return app_layout.app_number(name) or 0, name
+
+def group_apps(apps):
+    """{group_key: [app, ...]} ordered from the largest group down, members by app number"""
+    groups = {}
+    for app in sorted(apps, key=lambda app: _app_order(app["app"])):
+        groups.setdefault(app["group"], []).append(app)
+    return dict(sorted(groups.items(), key=lambda item: (-len(item[1]), _app_order(item[1][0]["app"]))))
+
+def _section_diff(sections, reference):
+    changes = []
+    for section in sorted(set(sections) | set(reference)):
+        ours, theirs = sections.get(section, {}), reference.get(section, {})
+        for name in sorted(set(ours) | set(theirs)):
+            if ours.get(name) != theirs.get(name):
+                changes.append(f"{section}.{name}: {ours.get(name)} (majority: {theirs.get(name)})")
+    return changes
+
+def find_drift(groups):
+    """List of {"app", "kind", "detail"} drift findings"""
+    findings = []
+    majority = next(iter(groups.values()), [])
+
+    for key, members in groups.items():
+        if members is not majority:
+            changes = _section_diff(members[0]["sections"], majority[0]["sections"])
+            for app in members:
+                findings.append({"app": app["app"], "kind": "dependencies", "detail": "; ".join(changes)})
+
+        locks = {}
+        for app in members:
+            if app["lock"] is not None:
+                locks.setdefault(app["lock"], []).append(app["app"])
+        if len(locks) > 1:
+            common = max(locks.values(), key=len)
+            for lock_apps in locks.values():
+                if lock_apps is not common:
+                    for name in lock_apps:
+                        findings.append({"app": name, "kind": "lockfile",
+                                         "detail": f"differs from {len(common)} other apps in its group"})
+
+    for members in groups.values():
+        for app in members:
+            if app["duplicate_keys"]:
+                findings.append({"app": app["app"], "kind": "pubspec",
+                                 "detail": f"repeated top-level keys: {', '.join(app['duplicate_keys'])}"})
+            if app["lock"] is None:
+                findings.append({"app": app["app"], "kind": "lockfile", "detail": "missing"})
+                continue
+            missing = pubspec_direct_dependencies(app["sections"]) - lock_direct_dependencies(app["lock"].decode())
+            if missing:
+                findings.append({"app": app["app"], "kind": "lockfile",
+                                 "detail": f"stale, missing direct dependencies: {', '.join(sorted(missing))}"})
+    return sorted(findings, key=lambda f: (_app_order(f["app"]), f["kind"]))
+
+def resolve(app, offline=False):
+    """Run pub get in one app; raises RuntimeError on failure"""
+    cmd = [flutter_skeleton.flutter_executable(), "pub", "get"] + (["--offline"] if offline else [])
+    result = subprocess.run(cmd, cwd=app["dir"], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"pub get failed in {app['app']}:\n{(result.stdout + result.stderr)[-2000:]}")
+
+def resolve_workspace(offline=False):
+    """Run pub get once at the workspace root"""
+    resolve({"app": pub_workspace.WORKSPACE_NAME, "dir": pub_workspace.ROOT_PUBSPEC.parent}, offline)
+
+def _rename_root(data, old, new):
+    """Rewrite the root package name in package_config/package_graph JSON"""
+    for package in data.get("packages", []):
+        if package.get("name") == old:
+            package["name"] = new
+    if "roots" in data:
+        data["roots"] = [new if name == old else name for name in data["roots"]]
+    return data
+
+def _write_if_changed(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists() and path.read_bytes() == data:
+        os.utime(path)  # keep it newer than the pubspec
+        return False
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+def stamp(source, target):
+    """Copy source's resolution into target; returns True if any file changed"""
+    changed = _write_if_changed(target["dir"] / LOCKFILE, (source["dir"] / LOCKFILE).read_bytes())
+    for rel in (PACKAGE_CONFIG, PACKAGE_GRAPH):
+        path = source["dir"] / rel
+        if path.exists():
+            data = _rename_root(json.loads(path.read_text()), source["package"], target["package"])
+            changed |= _write_if_changed(target["dir"] / rel, (json.dumps(data, indent=2) + "\n").encode())
+    version = source["dir"] / TOOL_VERSION
+    if version.exists():
+        changed |= _write_if_changed(target["dir"] / TOOL_VERSION, version.read_bytes())
+    return changed
+
+def resolve_groups(groups, offline=False, workers=4):
+    """Resolve every group once and stamp its members; returns {group_key: error or None}"""
+    def run(members):
+        source = members[0]
+        # pub get rewrites pubspec.lock in place, which would write through a hardlinked blob
+        blob_store.detach_app(source["dir"])
+        resolve(source, offline)
+        return sum(stamp(source, target) for target in members[1:])
+
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {key: pool.submit(run, members) for key, members in groups.items()}
+        for key, future in futures.items():
+            try:
+                outcomes[key] = (future.result(), None)
+            except (RuntimeError, OSError) as e:
+                outcomes[key] = (0, str(e))
+    return outcomes
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve pub dependencies once per app group")
+    parser.add_argument("apps", nargs="*", help="App directories (default: every app)")
+    parser.add_argument("--check", action="store_true", help="Only report groups and drift")
+    parser.add_argument("--offline", action="store_true", help="Pass --offline to pub get")
+    parser.add_argument("--json", action="store_true", help="Print groups and drift as JSON")
+    args = parser.parse_args()
+
+    if pub_workspace.is_workspace_root():
+        print("📦 Pub workspace: one resolution at the repository root")
+        if not args.check:
+            resolve_workspace(args.offline)
+            print("✅ Workspace resolved")
+        return
+
+    app_dirs = [Path(a) for a in args.apps] or fleet_inventory.list_app_dirs()
+    apps = [load_app(d) for d in app_dirs if (d / PUBSPEC).exists()]
+    groups = group_apps(apps)
+    drift = find_drift(groups)
+
+    if args.json:
+        json.dump({
+            "groups": {key: [a["app"] for a in members] for key, members in groups.items()},
+            "drift": drift,
+        }, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"📦 {len(apps)} apps in {len(groups)} dependency groups")
+        for key, members in groups.items():
+            names = [a["app"] for a in members]
+            listed = ", ".join(names) if len(names) <= 5 else f"{names[0]} … {names[-1]}"
+            print(f"   {key}: {len(names)} apps ({listed})")
+        if drift:
+            grouped = {}
+            for finding in drift:
+                grouped.setdefault((finding["kind"], finding["detail"]), []).append(finding["app"])
+            print(f"\n⚠️  {len(drift)} drift findings:")
+            for (kind, detail), names in grouped.items():
+                listed = ", ".join(names) if len(names) <= 5 else f"{len(names)} apps ({names[0]} … {names[-1]})"
+                print(f"   {kind:<13} {detail}\n   {'':<13} → {listed}")
+
+    if args.check:
+        sys.exit(1 if drift else 0)
+
+    outcomes = resolve_groups(groups, args.offline)
+    failed = 0
+    for key, (stamped, error) in outcomes.items():
+        if error:
+            failed += 1
+            print(f"❌ {key}: {error}")
+        else:
+            print(f"✅ {key}: resolved in {groups[key][0]['app']}, {stamped} apps updated")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Pubspec editing and pub workspace mode for the app fleet
+
+App pubspecs are edited as a list of top-level blocks (a key line plus the
+indented, blank and comment lines under it), so adding dependencies never
+creates a second `dependencies:` key and every other line round-trips
+unchanged.
+
+In workspace mode the repository root gets a pubspec.yaml whose
+`workspace:` lists every apps/appNN package (plus local packages under
+packages/), and each member declares `resolution: workspace`. A single
+`flutter pub get` at the root then resolves the whole fleet into one
+pubspec.lock and one package config. Members of a workspace share one
+resolution, so their constraints must agree; `enable --align` rewrites
+them to the template's.
+
+Usage:
+    pub_workspace.py check
+    pub_workspace.py enable [--align]
+    pub_workspace.py disable
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import fleet_inventory
+import template_sync
+
+TEMPLATE_PUBSPEC = Path(__file__).parent.parent / "templates" / "game_base" / "pubspec.yaml"
+ROOT_PUBSPEC = Path("pubspec.yaml")
+WORKSPACE_NAME = "gloven_workspace"
+MEMBER_RESOLUTION_FILES = ("pubspec.lock", ".dart_tool/package_config.json")
+PACKAGES_DIR = Path("packages")
+
+def split_blocks(text):
+    """[(key, lines)] for each top-level key; key is None for a leading preamble"""
+    blocks = [(None, [])]
+    for line in text.split('\n'):
+        if line and not line.startswith((' ', '\t', '#')) and ':' in line:
+            blocks.append((line.split(':', 1)[0].strip(), [line]))
+        else:
+            blocks[-1][1].append(line)
+    return blocks
+
+def join_blocks(blocks):
+    return '\n'.join(line for _, lines in blocks for line in lines)
+
+def find_block(blocks, key):
+    """Index of the first block for key, or None"""
+    for i, (block_key, _) in enumerate(blocks):
+        if block_key == key:
+            return i
+    return None
+
+def _entries(body):
+    """Group block body lines into [(name, lines)] per entry"""
+    entries = []
+    for line in body:
+        if line.startswith("  ") and not line.startswith("   ") and not line.strip().startswith('#'):
+            entries.append((line.strip().split(':', 1)[0], [line]))
+        elif entries and line.strip():
+            entries[-1][1].append(line)
+    return entries
+
+def merge_duplicate_blocks(blocks, key):
+    """Fold repeated top-level `key:` blocks into the first one
+
+    Entries the first block already has win over later repeats.
+    """
+    first = find_block(blocks, key)
+    if first is None:
+        return blocks
+    target = blocks[first][1]
+    result = []
+    for i, (block_key, lines) in enumerate(blocks):
+        if block_key == key and i != first:
+            for name, entry in _entries(lines[1:]):
+                if _entry_index(target, name) is None:
+                    _insert_entries(target, entry)
+        else:
+            result.append((block_key, lines))
+    return result
+
+def _entry_index(lines, name):
+    for i, line in enumerate(lines):
+        if line.startswith("  ") and not line.startswith("   ") and line.strip().split(':', 1)[0] == name:
+            return i
+    return None
+
+def _insert_entries(lines, entries):
+    """Insert entry lines after the last non-blank line of a block"""
+    end = len(lines)
+    while end > 1 and not lines[end - 1].strip():
+        end -= 1
+    lines[end:end] = entries
+
+def _render_entry(name, value):
+    """Entry lines for a scalar constraint or a {key: value} source mapping"""
+    if isinstance(value, dict):
+        return [f"  {name}:"] + [f"    {k}: {v}" for k, v in value.items()]
+    return [f"  {name}: {value}"]
+
+def set_entries(blocks, key, entries, override=False):
+    """Ensure `key:` has every name: value in entries; returns True if changed
+
+    Values are constraints or mappings such as {"path": "../pkg"}. Existing
+    entries keep their value unless override is set.
+    """
+    index = find_block(blocks, key)
+    if index is None:
+        blocks.append((key, [f"{key}:", ""]))
+        index = len(blocks) - 1
+    lines = blocks[index][1]
+    changed = False
+    missing = []
+    for name, value in entries.items():
+        wanted = _render_entry(name, value)
+        i = _entry_index(lines, name)
+        if i is None:
+            missing += wanted
+            continue
+        end = i + 1
+        while end < len(lines) and lines[end].startswith("   "):
+            end += 1
+        current = [line.split('#', 1)[0].rstrip() for line in lines[i:end]]
+        keeps_source = len(current) > 1 and not isinstance(value, dict)  # sdk/path/git entries
+        if override and current != wanted and not keeps_source:
+            lines[i:end] = wanted
+            changed = True
+    if missing:
+        _insert_entries(lines, missing)
+        changed = True
+    return changed
+
+def set_scalar(blocks, key, value, after=None):
+    """Set a top-level `key: value`, inserted after the `after` block if new"""
+    line = f"{key}: {value}"
+    index = find_block(blocks, key)
+    if index is not None:
+        if blocks[index][1][0] == line:
+            return False
+        blocks[index][1][0] = line
+        return True
+    anchor = find_block(blocks, after) if after else None
+    if anchor is None:
+        blocks.append((key, [line, ""]))
+        return True
+    # Go right below the anchor's entries; comments after them stay below us
+    anchor_lines = blocks[anchor][1]
+    end = max(i for i, l in enumerate(anchor_lines) if l.strip() and not l.lstrip().startswith('#')) + 1
+    blocks.insert(anchor + 1, (key, [line] + anchor_lines[end:]))
+    del anchor_lines[end:]
+    return True
+
+def remove_block(blocks, key):
+    """Drop a top-level key; comments and blank lines under it are kept"""
+    index = find_block(blocks, key)
+    if index is None:
+        return False
+    trailing = [l for l in blocks[index][1][1:] if not l.strip() or l.lstrip().startswith('#')]
+    del blocks[index]
+    blocks[index - 1][1].extend(trailing)
+    return True
+
+def template_dependencies(template=TEMPLATE_PUBSPEC):
+    """Hosted dependencies of the game template as {name: constraint}"""
+    deps = fleet_inventory.parse_dependencies(Path(template).read_text()).get("dependencies", {})
+    return {name: value for name, value in deps.items() if value and not value.startswith("sdk:")}
+
+def template_sdk(template=TEMPLATE_PUBSPEC):
+    environment = fleet_inventory.parse_dependencies(Path(template).read_text(), ("environment",))
+    return environment.get("environment", {}).get("sdk", "^3.10.4")
+
+def update_app_pubspec(path, dependencies=None, workspace=False):
+    """Add the game dependencies (and workspace resolution) to an app pubspec
+
+    In workspace mode constraints are aligned to the given ones, since all
+    members share one resolution. Returns True if the file was rewritten.
+    """
+    path = Path(path)
+    text = path.read_text()
+    dependencies = template_dependencies() if dependencies is None else dependencies
+    blocks = merge_duplicate_blocks(split_blocks(text), "dependencies")
+    set_entries(blocks, "dependencies", dependencies, override=workspace)
+    if workspace:
+        set_scalar(blocks, "resolution", "workspace", after="environment")
+    else:
+        remove_block(blocks, "resolution")
+    new_text = join_blocks(blocks)
+    if new_text == text:
+        return False
+    template_sync.atomic_write_bytes(path, new_text.encode())
+    return True
+
+def set_workspace_resolution(path, workspace=True):
+    """Add or drop `resolution: workspace` alone; returns True if rewritten"""
+    path = Path(path)
+    text = path.read_text()
+    blocks = split_blocks(text)
+    if workspace:
+        set_scalar(blocks, "resolution", "workspace", after="environment")
+    else:
+        remove_block(blocks, "resolution")
+    new_text = join_blocks(blocks)
+    if new_text == text:
+        return False
+    template_sync.atomic_write_bytes(path, new_text.encode())
+    return True
+
+def package_dirs(packages_dir=PACKAGES_DIR):
+    """Local path packages (packages/*/pubspec.yaml) that join the workspace"""
+    return sorted(p.parent for p in Path(packages_dir).glob("*/pubspec.yaml"))
+
+def drop_member_resolution(app_dir):
+    """Remove per-app resolution files that a workspace root replaces"""
+    for rel in MEMBER_RESOLUTION_FILES:
+        (Path(app_dir) / rel).unlink(missing_ok=True)
+
+def render_root_pubspec(members, sdk=None):
+    """Root pubspec.yaml text declaring the workspace members"""
+    lines = [
+        f"name: {WORKSPACE_NAME}",
+        "publish_to: 'none'",
+        "",
+        "environment:",
+        f"  sdk: {sdk or template_sdk()}",
+        "",
+        "workspace:",
+    ]
+    lines += [f"  - {Path(member).as_posix()}" for member in members]
+    return "\n".join(lines) + "\n"
+
+def write_root_pubspec(members, path=ROOT_PUBSPEC):
+    """Write the workspace root pubspec; returns True if it changed"""
+    text = render_root_pubspec(members)
+    path = Path(path)
+    if path.exists() and path.read_text() == text:
+        return False
+    tmp = Path(f"{path}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+    return True
+
+def is_workspace_root(path=ROOT_PUBSPEC):
+    path = Path(path)
+    return path.exists() and find_block(split_blocks(path.read_text()), "workspace") is not None
+
+def constraint_conflicts(app_dirs):
+    """{package: {constraint: [apps]}} for packages whose constraints differ"""
+    seen = {}
+    for app_dir in app_dirs:
+        sections = fleet_inventory.parse_dependencies((Path(app_dir) / "pubspec.yaml").read_text())
+        for section in ("dependencies", "dev_dependencies"):
+            for name, value in sections.get(section, {}).items():
+                seen.setdefault(name, {}).setdefault(value, []).append(Path(app_dir).name)
+    return {name: values for name, values in sorted(seen.items()) if len(values) > 1}
+
+def enable(apps_dir="apps", align=False):
+    """Turn the fleet into a pub workspace; returns the number of updated apps
+
+    Without align only duplicate blocks are merged and the workspace
+    resolution is declared; with it constraints are set to the template's.
+    """
+    app_dirs = fleet_inventory.list_app_dirs(apps_dir)
+    dependencies = template_dependencies() if align else {}
+    updated = 0
+    for app_dir in app_dirs:
+        if update_app_pubspec(app_dir / "pubspec.yaml", dependencies, workspace=True):
+            updated += 1
+        drop_member_resolution(app_dir)
+    for package_dir in package_dirs():
+        set_workspace_resolution(package_dir / "pubspec.yaml")
+        drop_member_resolution(package_dir)
+    write_root_pubspec(app_dirs + package_dirs())
+    return updated
+
+def disable(apps_dir="apps"):
+    """Make every app resolve on its own again; returns the number of updated apps"""
+    updated = sum(set_workspace_resolution(app_dir / "pubspec.yaml", False)
+                  for app_dir in fleet_inventory.list_app_dirs(apps_dir))
+    for package_dir in package_dirs():
+        set_workspace_resolution(package_dir / "pubspec.yaml", False)
+    if is_workspace_root():
+        ROOT_PUBSPEC.unlink()
+        Path("pubspec.lock").unlink(missing_ok=True)
+    return updated
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage pub workspace mode for the fleet")
+    parser.add_argument("command", choices=("check", "enable", "disable"))
+    parser.add_argument("--align", action="store_true",
+                        help="Rewrite app constraints to the template's before enabling")
+    parser.add_argument("--apps-dir", default="apps")
+    args = parser.parse_args()
+
+    if args.command == "disable":
+        updated = disable(args.apps_dir)
+        print(f"✅ Workspace disabled ({updated} apps updated). Run pub_resolve.py to resolve apps again.")
+        return
+
+    conflicts = constraint_conflicts(fleet_inventory.list_app_dirs(args.apps_dir))
+    for name, values in conflicts.items():
+        summary = ", ".join(f"{value} ({len(apps)} apps)" for value, apps in values.items())
+        print(f"⚠️  {name}: {summary}")
+
+    if args.command == "check":
+        state = "enabled" if is_workspace_root() else "disabled"
+        print(f"Workspace mode is {state}; {len(conflicts)} conflicting constraints")
+        sys.exit(1 if conflicts else 0)
+
+    if conflicts and not args.align:
+        print("❌ Workspace members must share one resolution; re-run with --align")
+        sys.exit(1)
+    updated = enable(args.apps_dir, args.align)
+    print(f"✅ Workspace enabled ({updated} apps updated). Run 'flutter pub get' at the repository root.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Template drift report for the app fleet
+
+Hand edits make apps drift from what the generator would write today, and a
+hundred recursive diffs do not show which edits the apps share. Every app
+file is compared by content hash with its expected version:
+  - generated   lib/main.dart and lib/screens/*, rendered from the app's
+                catalog record
+  - template    lib/models, lib/providers and lib/utils from
+                templates/game_base/lib (not expected in shared-core apps)
+  - skeleton    the rest of the `flutter create` tree, from a cached
+                flutter_skeleton snapshot (found for the installed Flutter,
+                or given with --skeleton)
+  - majority    files rewritten after stamping (pubspec.yaml,
+                build.gradle.kts, AndroidManifest.xml), and everything else
+                when there is no snapshot: the version most apps of the same
+                platform profile have
+
+Before hashing, an app's own name (app07, App07, org.gloven.app07, "Gloven
+App 7") is replaced by a placeholder. Per-app stamping is then not drift,
+and the same hand edit made in several apps hashes the same. Deviations (a
+file that differs, is missing or is extra) are grouped by path, kind and
+both digests, and every group is shown once with its apps.
+
+Raw file digests come from the fleet_walk hash cache. .template_drift.json
+keeps each file's placeholder digest next to its raw one, so a rerun only
+reads files that changed. Exits 1 when any app drifted.
+
+Usage:
+    template_drift.py [--diff] [--json] [--skeleton DIR] [app_dir ...]
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+import app_layout
+import core_package
+import create_complete_game_app as generator
+import fleet_inventory
+import fleet_walk
+import flutter_skeleton
+import game_catalog
+import template_sync
+
+CACHE_FILE = Path(".template_drift.json")
+# Bump when placeholder substitution changes
+CACHE_VERSION = 1
+PLACEHOLDER = "{app}"
+DIFF_LINES = 40
+
+# Machine-local files and build inputs written outside the generator
+IGNORED_PATHS = [*flutter_skeleton.GENERATED_PATHS, "pubspec.lock", "android/key.properties"]
+
+# Stamped from the snapshot, then rewritten per app, so judged by the majority
+REWRITTEN = {
+    "pubspec.yaml",
+    fleet_inventory.BUILD_GRADLE,
+    "android/app/src/main/AndroidManifest.xml",
+}
+
+Deviation = namedtuple("Deviation", ["path", "kind", "source", "expected", "actual"])
+
+def _ignored(rel):
+    return any(rel == p or rel.startswith(p + "/") for p in IGNORED_PATHS)
+
+def app_profile(app_dir):
+    """Platform profile an app was created or pruned to"""
+    others = [p for p in flutter_skeleton.ALL_PLATFORMS if p != "android"]
+    return "all" if all((Path(app_dir) / p).is_dir() for p in others) else "android"
+
+def placeholders(name):
+    """Normalizer replacing an app's own name in file contents with a placeholder"""
+    num = app_layout.app_number(name)
+    title = flutter_skeleton.title_case(name).encode()
+    label = re.compile(rb"Gloven App 0*" + str(num).encode() + rb"\b")
+
+    def normalize(data):
+        if b'\0' in data:
+            return data
+        data = data.replace(name.encode(), PLACEHOLDER.encode()).replace(title, b"{App}")
+        return label.sub(b"Gloven App {num}", data)
+    return normalize
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def scan_app(app_dir, hashes, cached):
+    """{relative_path: [raw_digest, placeholder_digest]} of an app's files"""
+    app_dir = Path(app_dir)
+    normalize = placeholders(app_dir.name)
+    files = {}
+    for rel, st in fleet_walk.walk(app_dir):
+        if _ignored(rel):
+            continue
+        raw = hashes.digest(app_dir / rel, st)
+        entry = cached.get(rel)
+        if entry is None or entry[0] != raw:
+            entry = [raw, _sha256(normalize((app_dir / rel).read_bytes()))]
+        files[rel] = entry
+    return files
+
+def expected_generated(app_dir):
+    """{relative_path: (source, bytes)} of the files the generator owns in an app"""
+    app_dir = Path(app_dir)
+    game = game_catalog.by_num(app_layout.app_number(app_dir.name))
+    if game is None:
+        return {}
+    shared_core = core_package.uses_core(app_dir)
+    instructions = list(game.instructions)
+    files = {
+        f"lib/screens/{name}": ("generated", code.encode())
+        for name, code in generator.render_game_screens(
+            game.name, game.type, instructions, game.num, shared_core).items()
+    }
+    files["lib/main.dart"] = ("generated", generator.render_main_dart(
+        game.name, game.type, instructions, shared_core).encode())
+    if not shared_core:
+        for src, dest in template_sync.sync_pairs(app_dir):
+            files[dest.relative_to(app_dir).as_posix()] = ("template", src.read_bytes())
+    return files
+
+def find_skeletons(skeleton=None):
+    """{profile: snapshot dir}, from --skeleton or the cache of the installed Flutter"""
+    if skeleton:
+        return {profile: Path(skeleton) for profile in flutter_skeleton.PLATFORM_PROFILES}
+    try:
+        version = flutter_skeleton.flutter_sdk_version()
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError, KeyError):
+        return {}
+    found = {}
+    for profile in flutter_skeleton.PLATFORM_PROFILES:
+        path = flutter_skeleton.skeleton_dir(version, profile)
+        if path.is_dir():
+            found[profile] = path
+    return found
+
+def skeleton_digests(source):
+    """{placeholder path: placeholder digest} of a snapshot as stamped into any app"""
+    name = app_layout.app_name(0)
+    normalize = placeholders(name)
+    return {
+        rel.replace(name, PLACEHOLDER): _sha256(normalize(data))
+        for _, rel, data in flutter_skeleton.stamped_files(source, name)
+        if not _ignored(rel)
+    }
+
+def majority(apps):
+    """{placeholder path: digest} of the files more than half of the given apps have"""
+    counts = {}
+    for files in apps.values():
+        for rel, digest in files.items():
+            counts.setdefault(rel, Counter())[digest] += 1
+    return {rel: counter.most_common(1)[0][0] for rel, counter in counts.items()
+            if sum(counter.values()) * 2 > len(apps)}
+
+def audit(app_dirs, skeleton=None, cache_path=CACHE_FILE, hashes=None):
+    """Scan the apps and compare them with their expected files
+
+    Returns (groups, stats); groups maps a Deviation to the names of the apps
+    it occurs in, largest groups first.
+    """
+    cache = _load_cache(cache_path)
+    app_dirs = {Path(d).name: Path(d) for d in app_dirs}
+    apps = {}
+    changed = False
+    with hashes or fleet_walk.HashCache() as file_hashes:
+        for app_dir, files in fleet_walk.map_roots(
+                lambda d: scan_app(d, file_hashes, cache["apps"].get(d.name, {})), app_dirs.values()):
+            changed = changed or files != cache["apps"].get(app_dir.name)
+            cache["apps"][app_dir.name] = files
+            apps[app_dir.name] = {rel.replace(app_dir.name, PLACEHOLDER): digest
+                                  for rel, (_, digest) in files.items()}
+    if changed:
+        _save_cache(cache, cache_path)
+
+    profiles = {name: app_profile(app_dir) for name, app_dir in app_dirs.items()}
+    snapshots = {profile: skeleton_digests(path) for profile, path in find_skeletons(skeleton).items()}
+    majorities = {
+        profile: majority({name: files for name, files in apps.items() if profiles[name] == profile})
+        for profile in set(profiles.values())
+    }
+
+    groups = {}
+    for name, files in apps.items():
+        expected = {}
+        normalize = placeholders(name)
+        for rel, (source, data) in expected_generated(app_dirs[name]).items():
+            expected[rel] = (source, _sha256(normalize(data)))
+        snapshot = snapshots.get(profiles[name])
+        for rel, digest in (snapshot or {}).items():
+            if rel not in expected and rel not in REWRITTEN:
+                expected[rel] = ("skeleton", digest)
+        for rel, digest in majorities[profiles[name]].items():
+            if rel not in expected and (snapshot is None or rel in REWRITTEN):
+                expected[rel] = ("majority", digest)
+
+        deviations = []
+        for rel, (source, digest) in expected.items():
+            actual = files.get(rel)
+            if actual is None:
+                deviations.append(Deviation(rel, "missing", source, digest, None))
+            elif actual != digest:
+                deviations.append(Deviation(rel, "modified", source, digest, actual))
+        for rel, actual in files.items():
+            if rel not in expected:
+                source = "majority" if snapshot is None else "skeleton"
+                deviations.append(Deviation(rel, "extra", source, None, actual))
+        for deviation in deviations:
+            groups.setdefault(deviation, []).append(name)
+
+    for names in groups.values():
+        names.sort(key=app_layout.app_number)
+    stats = {
+        "apps": len(apps),
+        "files": sum(len(files) for files in apps.values()),
+        "drifted": len({name for names in groups.values() for name in names}),
+        "baseline": "skeleton" if snapshots else "majority",
+    }
+    ordered = sorted(groups.items(), key=lambda item: (-len(item[1]), item[0].path, item[0].kind))
+    return dict(ordered), stats
+
+def _load_cache(path):
+    try:
+        with open(path, 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+    if cache.get("version") != CACHE_VERSION:
+        cache = {"version": CACHE_VERSION, "apps": {}}
+    return cache
+
+def _save_cache(cache, path):
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(cache, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+def _expected_text(deviation, app_dir, skeleton=None):
+    """Placeholder form of the expected file of a deviation"""
+    rel = deviation.path.replace(PLACEHOLDER, app_dir.name)
+    normalize = placeholders(app_dir.name)
+    if deviation.source in ("generated", "template"):
+        return normalize(expected_generated(app_dir)[rel][1])
+    if deviation.source == "skeleton":
+        source = find_skeletons(skeleton).get(app_profile(app_dir))
+        name = app_layout.app_name(0)
+        for _, stamped, data in flutter_skeleton.stamped_files(source, name):
+            if stamped.replace(name, PLACEHOLDER) == deviation.path:
+                return placeholders(name)(data)
+        return b""
+    # majority: any app whose file has the expected digest
+    for example in app_layout.iter_app_dirs():
+        path = example / deviation.path.replace(PLACEHOLDER, example.name)
+        if path.is_file():
+            data = placeholders(example.name)(path.read_bytes())
+            if _sha256(data) == deviation.expected:
+                return data
+    return b""
+
+def format_diff(deviation, app_dir, skeleton=None):
+    """Unified diff of one deviation as it appears in one of its apps"""
+    actual_path = app_dir / deviation.path.replace(PLACEHOLDER, app_dir.name)
+    actual = placeholders(app_dir.name)(actual_path.read_bytes()) if deviation.actual else b""
+    expected = _expected_text(deviation, app_dir, skeleton) if deviation.expected else b""
+    if b'\0' in actual or b'\0' in expected:
+        return ["    (binary file)"]
+    lines = list(difflib.unified_diff(
+        expected.decode(errors="replace").splitlines(), actual.decode(errors="replace").splitlines(),
+        f"expected/{deviation.path}", f"actual/{deviation.path}", lineterm=""))
+    if len(lines) > DIFF_LINES:
+        lines = lines[:DIFF_LINES] + [f"... {len(lines) - DIFF_LINES} more lines"]
+    return [f"    {line}" for line in lines]
+
+def main():
+    parser = argparse.ArgumentParser(description="Report how apps drifted from their generated files")
+    parser.add_argument("apps", nargs="*", help="App directories (default: every app)")
+    parser.add_argument("--skeleton", help="flutter create snapshot to compare with (default: the cached one)")
+    parser.add_argument("--diff", action="store_true", help="Show one diff per unique deviation")
+    parser.add_argument("--json", action="store_true", help="Print the deviation groups as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    app_dirs = [Path(a) for a in args.apps] or app_layout.list_app_dirs()
+    groups, stats = audit(app_dirs, args.skeleton)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump({"stats": stats, "groups": [dict(d._asdict(), apps=names) for d, names in groups.items()]},
+                  sys.stdout, indent=2)
+        print()
+    else:
+        print(f"🔍 {stats['apps']} apps, {stats['files']} files checked against the "
+              f"{stats['baseline']} baseline in {elapsed:.2f}s")
+        if groups:
+            print(f"⚠️  {stats['drifted']} apps drifted, {len(groups)} unique deviations:")
+            by_name = {d.name: d for d in app_dirs}
+            for deviation, names in groups.items():
+                listed = ", ".join(names) if len(names) <= 5 else f"{len(names)} apps ({names[0]} … {names[-1]})"
+                print(f"   {deviation.kind:<9} {deviation.path}  [{deviation.source}]\n   {'':<9} → {listed}")
+                if args.diff and deviation.kind != "extra":
+                    print("\n".join(format_diff(deviation, by_name[names[0]], args.skeleton)))
+        else:
+            print("✅ No drift")
+    sys.exit(1 if groups else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Sync templates/game_base/lib files into the app fleet
+
+Files are compared by size and then content hash (through the fleet's
+shared hash cache, see fleet_walk.py) and skipped when already identical.
+Changed files are written through a temp file and an atomic rename (or
+hardlinked to the template when requested, for files that are never edited
+per app). The whole fleet is synced at once on a thread pool.
+
+Usage:
+    template_sync.py [--hardlink] [--workers N] [app_dir ...]
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import app_layout
+import fleet_walk
+
+TEMPLATE_LIB = Path("templates/game_base/lib")
+SHARED_SUBDIRS = ("models", "providers", "utils")
+
+def _temp_path(dest):
+    fd, tmp = tempfile.mkstemp(prefix=f".{dest.name}.", suffix=".tmp", dir=dest.parent)
+    os.close(fd)
+    return Path(tmp)
+
+def atomic_write_bytes(path, data):
+    """Write data to path via a temp file and rename
+
+    The rename gives path a new inode, so a file hardlinked to a blob store
+    object (see blob_store.py) is replaced instead of written through. The
+    old file's permissions are kept, made writable for the owner.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode) | stat.S_IWUSR
+    except FileNotFoundError:
+        mode = 0o644
+    tmp = _temp_path(path)
+    try:
+        tmp.write_bytes(data)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def write_text_if_changed(path, text):
+    """Atomically write text unless the file already has it; returns True if written"""
+    path = Path(path)
+    data = text.encode('utf-8')
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    atomic_write_bytes(path, data)
+    return True
+
+def _digest(path, hashes):
+    return hashes.digest(path) if hashes else fleet_walk.hash_file(path)
+
+def sync_file(src, dest, hardlink=False, hashes=None):
+    """Bring dest in line with src; returns "unchanged", "linked" or "copied"
+
+    With a fleet_walk.HashCache, template files are hashed once for the
+    whole fleet instead of once per app.
+    """
+    src, dest = Path(src), Path(dest)
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        dest_stat = None
+
+    if dest_stat is not None:
+        if hardlink and os.path.samefile(src, dest):
+            return "unchanged"
+        if not hardlink and dest_stat.st_size == src.stat().st_size \
+                and _digest(dest, hashes) == _digest(src, hashes):
+            return "unchanged"
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temp_path(dest)
+    try:
+        if hardlink:
+            tmp.unlink()
+            try:
+                os.link(src, tmp)
+                os.replace(tmp, dest)
+                return "linked"
+            except OSError:
+                pass
+        shutil.copyfile(src, tmp)
+        shutil.copymode(src, tmp)
+        os.replace(tmp, dest)
+        return "copied"
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def sync_pairs(app_dir, template_lib=TEMPLATE_LIB, subdirs=SHARED_SUBDIRS, pattern="*.dart"):
+    """(src, dest) pairs for one app"""
+    pairs = []
+    for subdir in subdirs:
+        for src in sorted((Path(template_lib) / subdir).glob(pattern)):
+            pairs.append((src, Path(app_dir) / "lib" / subdir / src.name))
+    return pairs
+
+def sync_app(app_dir, template_lib=TEMPLATE_LIB, subdirs=SHARED_SUBDIRS, hardlink=False, hashes=None):
+    """Sync one app's shared template files; returns outcome counts"""
+    counts = {}
+    for src, dest in sync_pairs(app_dir, template_lib, subdirs):
+        outcome = sync_file(src, dest, hardlink, hashes)
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return counts
+
+def sync_fleet(app_dirs, template_lib=TEMPLATE_LIB, subdirs=SHARED_SUBDIRS, hardlink=False, workers=None,
+               hashes=None):
+    """Sync every app at once on a thread pool; returns total outcome counts"""
+    pairs = [pair for app_dir in app_dirs for pair in sync_pairs(app_dir, template_lib, subdirs)]
+    counts = {}
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        for outcome in pool.map(lambda pair: sync_file(*pair, hardlink, hashes), pairs):
+            counts[outcome] = counts.get(outcome, 0) + 1
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync template files into all apps")
+    parser.add_argument("apps", nargs="*", help="App directories (default: every app)")
+    parser.add_argument("--hardlink", action="store_true",
+                        help="Hardlink template files instead of copying them")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    app_dirs = [Path(a) for a in args.apps] or app_layout.list_app_dirs()
+    with fleet_walk.HashCache() as hashes:
+        counts = sync_fleet(app_dirs, hardlink=args.hardlink, workers=args.workers, hashes=hashes)
+    print(f"✅ Synced {len(app_dirs)} apps: " + ", ".join(f"{v} {k}" for k, v in sorted(counts.items())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Span tracing for the generator and builder
+
+Stages are wrapped in `with tracing.span("stage", app="app01"):`. While
+tracing is on, every finished span is appended as one JSON line to
+<trace_dir>/events-<pid>.jsonl with:
+  - wall time
+  - the thread's CPU time
+  - bytes the thread wrote (/proc/thread-self/io)
+  - CPU time (not wall time) of child processes reaped during the span
+
+Tracing is off unless $GLOVEN_TRACE names a trace directory. start() sets
+it, so pool workers and subprocesses inherit it and trace into the same
+directory. When tracing is off, span() costs one environment lookup.
+
+Subprocess time ("child s" in the summary) is the user + system CPU time
+of reaped children from RUSAGE_CHILDREN, not their wall time: a `flutter
+build` that mostly waits on a Gradle daemon shows up small, and a child
+still running when the span ends is not counted at all. RUSAGE_CHILDREN is
+per process, so spans that overlap in threads of one process can each see
+the others' children.
+
+The events export to Chrome trace-event JSON (chrome://tracing, Perfetto)
+and summarize into a per-stage table.
+
+The generator and build_fleet.py take --trace DIR, which turns tracing on
+and ends the run with the summary and DIR/trace.json. start() clears the
+events of earlier runs from DIR, so reusing a directory does not merge runs.
+
+Usage:
+    tracing.py summary <trace_dir> [--chrome trace.json] [--by-app]
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import build_admission
+
+TRACE_ENV = "GLOVEN_TRACE"
+THREAD_IO = Path("/proc/thread-self/io")
+
+_local = threading.local()
+_files = {}
+_files_lock = threading.Lock()
+
+def trace_dir():
+    """Directory spans are written to, or None when tracing is off"""
+    path = os.environ.get(TRACE_ENV)
+    return Path(path) if path else None
+
+def start(path):
+    """Turn tracing on for this process and the processes it starts
+
+    Event files of an earlier run in the same directory are removed first.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    with _files_lock:
+        for key in [key for key in _files if key[1] == path.resolve()]:
+            _files.pop(key).close()
+    for old in path.glob("events-*.jsonl"):
+        old.unlink()
+    os.environ[TRACE_ENV] = str(path.resolve())
+    return path
+
+def _thread_write_bytes():
+    try:
+        with open(THREAD_IO, 'r') as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def _child_cpu():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def _write(event):
+    directory = trace_dir()
+    pid = os.getpid()
+    with _files_lock:
+        f = _files.get((pid, directory))
+        if f is None:
+            directory.mkdir(parents=True, exist_ok=True)
+            f = _files[(pid, directory)] = open(directory / f"events-{pid}.jsonl", 'a')
+        f.write(json.dumps(event, separators=(',', ':')) + "\n")
+        f.flush()
+
+def record(name, start_ns, duration_ns, tid=None, **args):
+    """Write a span measured elsewhere (start in time.time_ns())"""
+    if trace_dir() is None:
+        return
+    _write({
+        "name": name,
+        "ts": start_ns // 1000,
+        "dur": duration_ns // 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_native_id() if tid is None else tid,
+        "args": args,
+    })
+
+@contextmanager
+def span(name, **args):
+    """Trace the enclosed block as one span; nested spans inherit app="""
+    if trace_dir() is None:
+        yield
+        return
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    if "app" not in args and stack:
+        args["app"] = stack[-1].get("app")
+    stack.append(args)
+
+    wall_ns = time.time_ns()
+    perf_ns = time.perf_counter_ns()
+    cpu = time.thread_time()
+    written = _thread_write_bytes()
+    child_cpu = _child_cpu()
+    try:
+        yield
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        stack.pop()
+        record(
+            name, wall_ns, time.perf_counter_ns() - perf_ns,
+            cpu_ms=round((time.thread_time() - cpu) * 1000, 2),
+            write_bytes=_thread_write_bytes() - written,
+            child_cpu_ms=round((_child_cpu() - child_cpu) * 1000, 2),
+            depth=len(stack),
+            **args
+        )
+
+def load_events(path):
+    """All spans recorded in a trace directory, oldest first"""
+    events = []
+    for events_file in sorted(Path(path).glob("events-*.jsonl")):
+        with open(events_file, 'r') as f:
+            for line in f:
+                if line.strip():
+                    events.append(json.loads(line))
+    return sorted(events, key=lambda e: e["ts"])
+
+def export_chrome(events, out_path):
+    """Write Chrome trace-event JSON"""
+    trace = {
+        "traceEvents": [{"ph": "X", "cat": "gloven", **event} for event in events],
+        "displayTimeUnit": "ms",
+    }
+    tmp = Path(f"{out_path}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(trace, f)
+    os.replace(tmp, out_path)
+
+def summarize(events, by_app=False):
+    """Per-stage (or per-stage and app) totals, largest wall time first"""
+    groups = {}
+    for event in events:
+        key = (event["name"], event["args"].get("app")) if by_app else (event["name"], None)
+        groups.setdefault(key, []).append(event)
+    rows = []
+    for (name, app), spans in groups.items():
+        durations = [e["dur"] / 1000 for e in spans]
+        rows.append({
+            "stage": name,
+            "app": app,
+            "count": len(spans),
+            "wall_ms": round(sum(durations), 1),
+            "mean_ms": round(statistics.fmean(durations), 1),
+            "p95_ms": round(sorted(durations)[int(0.95 * (len(durations) - 1))], 1),
+            "cpu_ms": round(sum(e["args"].get("cpu_ms", 0) for e in spans), 1),
+            "child_cpu_ms": round(sum(e["args"].get("child_cpu_ms", 0) for e in spans), 1),
+            "write_bytes": sum(e["args"].get("write_bytes", 0) for e in spans),
+            "errors": sum(1 for e in spans if "error" in e["args"]),
+        })
+    return sorted(rows, key=lambda r: -r["wall_ms"])
+
+def format_summary(rows):
+    """Summary rows as a fixed-width table"""
+    header = (f"{'stage':<22} {'app':<7} {'count':>6} {'wall s':>9} {'mean ms':>9} {'p95 ms':>9} "
+              f"{'cpu s':>8} {'child s':>8} {'written':>10} {'err':>4}")
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['stage']:<22} {r['app'] or '':<7} {r['count']:>6} {r['wall_ms'] / 1000:>9.2f} "
+            f"{r['mean_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['cpu_ms'] / 1000:>8.2f} "
+            f"{r['child_cpu_ms'] / 1000:>8.2f} {build_admission.format_size(r['write_bytes']):>10} "
+            f"{r['errors']:>4}"
+        )
+    return "\n".join(lines)
+
+def report(path, chrome_name="trace.json"):
+    """Print the stage summary of a trace directory and export its Chrome trace"""
+    events = load_events(path)
+    print()
+    print(format_summary(summarize(events)))
+    export_chrome(events, Path(path) / chrome_name)
+    print(f"📊 {len(events)} spans, Chrome trace in {Path(path) / chrome_name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize or export a trace directory")
+    parser.add_argument("command", choices=("summary",))
+    parser.add_argument("trace_dir")
+    parser.add_argument("--chrome", help="Also write Chrome trace-event JSON to this file")
+    parser.add_argument("--by-app", action="store_true", help="One row per stage and app")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    events = load_events(args.trace_dir)
+    rows = summarize(events, args.by_app)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(format_summary(rows))
+    if args.chrome:
+        export_chrome(events, args.chrome)
+        print(f"✅ {len(events)} spans written to {args.chrome}")
+
+if __name__ == "__main__":
+    main()
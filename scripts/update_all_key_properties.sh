@@ -9,19 +9,22 @@ KEY_ALIAS=${3:-"gloven-key"}
 echo "Updating key.properties for all 100 apps..."
 echo "Using passwords from arguments or defaults"
 
-for i in {1..100}; do
-    APP_DIR="apps/app$(printf "%02d" $i)"
+# Every app directory, whatever the fleet layout (see app_layout.py)
+while read APP_DIR; do
     if [ -d "$APP_DIR" ]; then
-        cat > "$APP_DIR/android/key.properties" << KEYPROPS
+        # Write and rename so files hardlinked into .blobstore are replaced, not edited
+        cat > "$APP_DIR/android/key.properties.tmp" << KEYPROPS
 storePassword=$KEYSTORE_PASSWORD
 keyPassword=$KEY_PASSWORD
 keyAlias=$KEY_ALIAS
 storeFile=gloven-keystore.jks
 KEYPROPS
+        mv -f "$APP_DIR/android/key.properties.tmp" "$APP_DIR/android/key.properties"
         # Copy keystore to app directory for local builds
-        cp gloven-keystore.jks "$APP_DIR/android/gloven-keystore.jks" 2>/dev/null || true
+        cp gloven-keystore.jks "$APP_DIR/android/gloven-keystore.jks.tmp" 2>/dev/null \
+            && mv -f "$APP_DIR/android/gloven-keystore.jks.tmp" "$APP_DIR/android/gloven-keystore.jks"
     fi
-done
+done < <(python3 "$(dirname $0)/app_layout.py" list)
 
 echo "✓ Updated key.properties for all apps"
 echo "⚠️  Note: For GitHub Actions, use GitHub Secrets instead"
@@ -1,139 +1,175 @@
 #!/usr/bin/env python3
-"""Update build.gradle.kts with signing configuration"""
+"""Update build.gradle.kts with signing configuration
+
+Edits are applied to the parsed block tree (see gradle_kts.py) and are
+idempotent: files that already have the right package and signing setup are
+left untouched. A `getByName("release")` signing config is rewritten to
+`create("release")`, since AGP only predefines "debug". Batch mode patches
+every app in one process.
+
+Usage:
+    update_build_gradle.py <file_path> <package_name>
+    update_build_gradle.py --batch [apps_dir]
+"""
 
-import re
 import sys
+from pathlib import Path
 
-def update_build_gradle(file_path, package_name):
-    """Update build.gradle.kts with signing config"""
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    # Add imports at the top if needed
-    imports_needed = '''import java.util.Properties
-import java.io.FileInputStream
+sys.path.insert(0, str(Path(__file__).parent))
 
-'''
-    
-    # Always update package name if needed
-    if f'namespace = "{package_name}"' not in content:
-        content = re.sub(r'namespace = "[^"]*"', f'namespace = "{package_name}"', content)
-        content = re.sub(r'applicationId = "[^"]*"', f'applicationId = "{package_name}"', content)
-    
-    # Check if we need to add imports
-    needs_imports = 'import java.util.Properties' not in content
-    
-    # Check if we need to update keystore properties code
-    needs_keystore_update = 'keystorePropertiesFile' not in content or 'java.util.Properties()' in content
-    
-    # Check if signing config already exists
-    has_signing_config = 'signingConfigs {' in content or 'signingConfigs.create' in content
-    
-    # Add keystore properties before android block (using imported classes)
-    keystore_props = '''val keystorePropertiesFile = rootProject.file("key.properties")
+import app_layout
+import gradle_kts
+import template_sync
+from gradle_kts import Block
+
+PACKAGE_PREFIX = "org.gloven"
+
+IMPORTS = [
+    "import java.util.Properties",
+    "import java.io.FileInputStream",
+]
+
+KEYSTORE_PROPS = '''val keystorePropertiesFile = rootProject.file("key.properties")
 val keystoreProperties = Properties()
 if (keystorePropertiesFile.exists()) {
     keystoreProperties.load(FileInputStream(keystorePropertiesFile))
 }
-
 '''
-    
-    # Insert signing configs before buildTypes
-    signing_config = '''    signingConfigs {
-        create("release") {
-            keyAlias = keystoreProperties["keyAlias"] as String?
-            keyPassword = keystoreProperties["keyPassword"] as String?
-            storeFile = keystoreProperties["storeFile"]?.let { file(it) }
-            storePassword = keystoreProperties["storePassword"] as String?
-        }
-    }
 
+RELEASE_CONFIG = 'create("release")'
+
+SIGNING_CONFIG = '''signingConfigs {
+    create("release") {
+        keyAlias = keystoreProperties["keyAlias"] as String?
+        keyPassword = keystoreProperties["keyPassword"] as String?
+        storeFile = keystoreProperties["storeFile"]?.let { file(it) }
+        storePassword = keystoreProperties["storePassword"] as String?
+    }
+}
 '''
-    
-    # Find buildTypes and insert signingConfigs before it (only if not already exists)
-    if not has_signing_config:
-        buildtypes_match = re.search(r'(\s+)buildTypes \{', content)
-        if buildtypes_match:
-            indent = buildtypes_match.group(1)
-            insert_pos = buildtypes_match.start()
-            # Adjust signing config indentation
-            signing_config_indented = re.sub(r'^    ', indent, signing_config, flags=re.MULTILINE)
-            content = content[:insert_pos] + signing_config_indented + content[insert_pos:]
-    elif not has_signing_config:
-        # If buildTypes not found, insert before the closing brace of android block
-        # Find the last } before flutter block
-        flutter_match = re.search(r'\nflutter \{', content)
-        if flutter_match:
-            # Find the matching } for android {
-            android_match = re.search(r'\nandroid \{', content)
-            if android_match:
-                # Count braces to find the end of android block
-                pos = android_match.end()
-                depth = 1
-                while pos < len(content) and depth > 0:
-                    if content[pos] == '{':
-                        depth += 1
-                    elif content[pos] == '}':
-                        depth -= 1
-                    pos += 1
-                # Insert before the closing brace
-                insert_pos = pos - 1
-                signing_config_indented = re.sub(r'^    ', '    ', signing_config, flags=re.MULTILINE)
-                content = content[:insert_pos] + signing_config_indented + content[insert_pos:]
-    
-    # Update signingConfig in buildTypes release
-    content = re.sub(
-        r'signingConfig = signingConfigs\.getByName\("debug"\)',
-        'signingConfig = signingConfigs.getByName("release")',
-        content
+
+def _is_statement(prefix):
+    return lambda node: isinstance(node, str) and node.strip().startswith(prefix)
+
+def _ensure_imports(root):
+    present = {line.strip() for _, line in root.statements()}
+    missing = [line for line in IMPORTS if line not in present]
+    if not missing:
+        return False
+    plugins = root.find("plugins")
+    index = root.index(plugins) + 1 if plugins else 0
+    next_is_blank = index < len(root.children) and root.children[index] == ""
+    root.insert(index, missing if next_is_blank else missing + [""])
+    return True
+
+def _ensure_keystore_properties(root):
+    changed = gradle_kts.replace_in_statements(root, "java.util.Properties()", "Properties()", recursive=False)
+    for block in root.blocks("if (keystorePropertiesFile.exists())"):
+        changed |= gradle_kts.replace_in_statements(block, "java.io.FileInputStream(", "FileInputStream(")
+    changed |= gradle_kts.remove_duplicates(root, _is_statement("val keystorePropertiesFile"))
+
+    if gradle_kts.find_assignment(root, "val keystorePropertiesFile") is not None:
+        return changed
+
+    # Drop partial leftovers before inserting the complete prelude
+    root.children = [
+        c for c in root.children
+        if not _is_statement("val keystoreProperties")(c)
+        and not (isinstance(c, Block) and c.name == "if (keystorePropertiesFile.exists())")
+    ]
+    android = root.find("android")
+    index = root.index(android) if android else len(root.children)
+    root.insert(index, gradle_kts.parse_snippet(KEYSTORE_PROPS))
+    return True
+
+def _ensure_signing_config(android):
+    # AGP only predefines "debug"; a release config must be created, not looked up
+    changed = False
+    for signing in android.blocks("signingConfigs"):
+        for block in signing.blocks('getByName("release")'):
+            block.header = block.header.replace('getByName("release")', RELEASE_CONFIG)
+            changed = True
+    changed |= gradle_kts.remove_duplicates(
+        android, lambda node: isinstance(node, Block) and node.name == "signingConfigs"
     )
-    
-    # Add imports if needed (after plugins block)
-    if needs_imports:
-        plugins_match = re.search(r'(plugins \{[^}]*\})', content, re.DOTALL)
-        if plugins_match:
-            insert_pos = plugins_match.end()
-            content = content[:insert_pos] + '\n' + imports_needed + content[insert_pos:]
-    
-    # Update keystore properties code if needed
-    if needs_keystore_update:
-        # Remove old keystore properties code if it exists (more comprehensive pattern)
-        patterns_to_remove = [
-            r'val keystorePropertiesFile = rootProject\.file\("key\.properties"\)\n',
-            r'val keystoreProperties = java\.util\.Properties\(\)\n',
-            r'val keystoreProperties = Properties\(\)\n',
-            r'if \(keystorePropertiesFile\.exists\(\)\) \{\s*\n\s*keystoreProperties\.load\([^)]+\)\s*\n\}\s*\n',
-            r'keystoreProperties\.load\(java\.io\.FileInputStream\(keystorePropertiesFile\)\)',
-            r'keystoreProperties\.load\(FileInputStream\(keystorePropertiesFile\)\)',
-        ]
-        for pattern in patterns_to_remove:
-            content = re.sub(pattern, '', content, flags=re.MULTILINE)
-        
-        # Remove duplicate keystorePropertiesFile lines
-        lines = content.split('\n')
-        seen_keystore = False
-        new_lines = []
-        for line in lines:
-            if 'val keystorePropertiesFile' in line:
-                if not seen_keystore:
-                    new_lines.append(line)
-                    seen_keystore = True
-            else:
-                new_lines.append(line)
-        content = '\n'.join(new_lines)
-        
-        # Add new keystore properties before android block (only if not already there)
-        if 'val keystorePropertiesFile = rootProject.file("key.properties")' not in content:
-            android_match = re.search(r'\nandroid \{', content)
-            if android_match:
-                content = content[:android_match.start()+1] + keystore_props + content[android_match.start()+1:]
-    
-    with open(file_path, 'w') as f:
-        f.write(content)
+    creates_release = any(
+        signing.find(RELEASE_CONFIG) is not None for signing in android.blocks("signingConfigs")
+    ) or any(f"signingConfigs.{RELEASE_CONFIG}" in line for line in android.lines())
+    if not creates_release:
+        snippet = gradle_kts.parse_snippet(SIGNING_CONFIG, android.child_indent)
+        signing = android.find("signingConfigs")
+        if signing is not None:
+            # Keep the configs already there (debug, ...) and add release to them
+            signing.insert(len(signing.children), [snippet[0].find(RELEASE_CONFIG)])
+        else:
+            build_types = android.find("buildTypes")
+            index = android.index(build_types) if build_types else len(android.children)
+            android.insert(index, snippet)
+        changed = True
+
+    release = android.find("buildTypes", "release")
+    if release is not None:
+        changed |= gradle_kts.replace_in_statements(
+            release,
+            'signingConfig = signingConfigs.getByName("debug")',
+            'signingConfig = signingConfigs.getByName("release")'
+        )
+    return changed
+
+def patch_build_gradle(content, package_name):
+    """Return (new_content, changed) for a build.gradle.kts source"""
+    root = gradle_kts.parse(content)
+    changed = False
+
+    android = root.find("android")
+    if android is not None:
+        changed |= gradle_kts.set_assignment(android, "namespace", f'"{package_name}"')
+        default_config = android.find("defaultConfig")
+        if default_config is not None:
+            changed |= gradle_kts.set_assignment(default_config, "applicationId", f'"{package_name}"')
+
+    changed |= _ensure_imports(root)
+    changed |= _ensure_keystore_properties(root)
+    if android is not None:
+        changed |= _ensure_signing_config(android)
+
+    return (gradle_kts.emit(root) if changed else content), changed
+
+def update_build_gradle(file_path, package_name):
+    """Update build.gradle.kts with signing config; returns True if rewritten"""
+    with open(file_path, 'r') as f:
+        content = f.read()
+
+    new_content, changed = patch_build_gradle(content, package_name)
+    if changed:
+        # Replaced, not rewritten in place: the file may be a blob store hardlink
+        template_sync.atomic_write_bytes(file_path, new_content.encode('utf-8'))
+    return changed
+
+def update_all(apps_dir="apps"):
+    """Patch every app's build file in this process"""
+    updated = 0
+    total = 0
+    for app_dir in app_layout.iter_app_dirs(apps_dir):
+        build_file = app_dir / "android" / "app" / "build.gradle.kts"
+        if not build_file.exists():
+            continue
+        total += 1
+        try:
+            if update_build_gradle(build_file, f"{PACKAGE_PREFIX}.{app_dir.name}"):
+                updated += 1
+                print(f"✅ Updated {app_dir.name}")
+        except gradle_kts.GradleParseError as e:
+            print(f"❌ {app_dir.name}: {e}")
+    return updated, total
 
 if __name__ == '__main__':
-    if len(sys.argv) != 3:
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "--batch":
+        updated, total = update_all(*sys.argv[2:])
+        print(f"{updated}/{total} build files updated")
+    elif len(sys.argv) == 3:
+        update_build_gradle(sys.argv[1], sys.argv[2])
+    else:
         print("Usage: update_build_gradle.py <file_path> <package_name>")
+        print("       update_build_gradle.py --batch [apps_dir]")
         sys.exit(1)
-    
-    update_build_gradle(sys.argv[1], sys.argv[2])
@@ -0,0 +1,76 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+import blob_store
+import build_fleet
+import pub_resolve
+import update_build_gradle
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+SEED_APP = REPO_DIR / "apps" / "app02"
+BUILD_GRADLE = "android/app/build.gradle.kts"
+
+@pytest.fixture
+def fleet(tmp_path, monkeypatch):
+    """A one-app flat tree ingested into a hardlinked store"""
+    monkeypatch.delenv("GLOVEN_LAYOUT", raising=False)
+    apps = tmp_path / "apps"
+    app_dir = apps / "app02"
+    shutil.copytree(SEED_APP, app_dir, ignore=shutil.ignore_patterns(*blob_store.IGNORED_DIRS))
+    store = tmp_path / ".blobstore"
+    blob_store.ingest_app(app_dir, store, link_mode="hardlink")
+    assert (app_dir / BUILD_GRADLE).stat().st_nlink > 1
+    return apps, app_dir, store
+
+def blob_problems(store, apps):
+    return [p for p in blob_store.verify(store, apps) if p[2].startswith("blob")]
+
+def test_gradle_patch_does_not_write_through(fleet):
+    apps, app_dir, store = fleet
+    build_file = app_dir / BUILD_GRADLE
+    assert update_build_gradle.update_build_gradle(build_file, "org.gloven.renamed")
+
+    assert "org.gloven.renamed" in build_file.read_text()
+    assert build_file.stat().st_nlink == 1
+    assert blob_problems(store, apps) == []
+    assert blob_store.verify(store, apps) == [("app02", BUILD_GRADLE, "differs from manifest")]
+
+    blob_store.ingest_app(app_dir, store, link_mode="hardlink")
+    assert blob_store.verify(store, apps) == []
+
+def test_batch_patch_does_not_write_through(fleet, monkeypatch):
+    apps, app_dir, store = fleet
+    monkeypatch.setattr(update_build_gradle, "PACKAGE_PREFIX", "org.example")
+    assert update_build_gradle.update_all(apps) == (1, 1)
+    assert blob_problems(store, apps) == []
+
+def test_signing_setup_does_not_write_through(fleet):
+    apps, app_dir, store = fleet
+    key_properties = app_dir / "android" / "key.properties"
+    key_properties.write_text("storePassword=old\n")
+    blob_store.ingest_app(app_dir, store, link_mode="hardlink")
+
+    signing = {"keyAlias": "a", "keyPassword": "b", "storePassword": "c", "storeFile": "k.jks"}
+    build_fleet.prepare_signing(app_dir, signing)
+
+    assert "storePassword=c" in key_properties.read_text()
+    assert oct(key_properties.stat().st_mode & 0o777) == oct(0o600)
+    assert blob_problems(store, apps) == []
+
+def test_pub_get_does_not_write_through(fleet, tmp_path, monkeypatch):
+    apps, app_dir, store = fleet
+    assert (app_dir / "pubspec.lock").stat().st_nlink > 1
+    # Like pub get, rewrite the lockfile in place
+    stub = tmp_path / "flutter"
+    stub.write_text(f"#!{sys.executable}\nopen('pubspec.lock', 'w').write('# resolved again\\n')\n")
+    stub.chmod(0o755)
+    monkeypatch.setenv("FLUTTER", str(stub))
+
+    groups = pub_resolve.group_apps([pub_resolve.load_app(app_dir)])
+    assert [error for _, error in pub_resolve.resolve_groups(groups).values()] == [None]
+
+    assert (app_dir / "pubspec.lock").read_text() == "# resolved again\n"
+    assert blob_problems(store, apps) == []
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+BUILD_FLEET = REPO_DIR / "scripts" / "build_fleet.py"
+SEED_APPS = ("app01", "app02")
+
+# Stand-in for the flutter tool: logs every call, writes a bundle for
+# `build appbundle` and fails the way AGP does on a release config that is
+# looked up instead of created. Apps listed in $STUB_FAIL fail to build.
+STUB_FLUTTER = '''#!{python}
+import json, os, sys
+from pathlib import Path
+
+args = sys.argv[1:]
+with open(os.environ["STUB_CALLS"], "a") as f:
+    f.write(json.dumps([Path.cwd().name] + args) + "\\n")
+if args[:2] == ["--version", "--machine"]:
+    print(json.dumps({{"frameworkVersion": "3.99.0"}}))
+elif args[:2] == ["pub", "get"]:
+    # An up-to-date lockfile is left as it is
+    lock = Path("pubspec.lock")
+    if not lock.exists():
+        lock.write_text("# stub lockfile\\n")
+elif args[:2] == ["build", "appbundle"]:
+    gradle = Path("android/app/build.gradle.kts").read_text()
+    if 'getByName("release") {{' in gradle or 'create("release")' not in gradle:
+        sys.exit("SigningConfig with name 'release' not found.")
+    if Path.cwd().name in os.environ.get("STUB_FAIL", "").split(","):
+        sys.exit("stub build failure")
+    aab = Path("build/app/outputs/bundle/release/app-release.aab")
+    aab.parent.mkdir(parents=True, exist_ok=True)
+    aab.write_text(f"{{Path.cwd().name}} {{args}}\\n")
+else:
+    sys.exit(f"unexpected flutter call: {{args}}")
+'''
+
+@pytest.fixture
+def workdir(tmp_path):
+    apps = tmp_path / "apps"
+    for app in SEED_APPS:
+        shutil.copytree(REPO_DIR / "apps" / app, apps / app,
+                        ignore=shutil.ignore_patterns("build", ".dart_tool", "key.properties"))
+    stub = tmp_path / "bin" / "flutter"
+    stub.parent.mkdir()
+    stub.write_text(STUB_FLUTTER.format(python=sys.executable))
+    stub.chmod(0o755)
+    (tmp_path / "keystore.jks").write_bytes(b"not a real keystore")
+    return tmp_path
+
+def run_fleet(workdir, *args, fail=()):
+    env = dict(os.environ)
+    env.pop("GLOVEN_LAYOUT", None)
+    env.update({
+        "FLUTTER": str(workdir / "bin" / "flutter"),
+        "STUB_CALLS": str(workdir / "calls.jsonl"),
+        "STUB_FAIL": ",".join(fail),
+        "GLOVEN_CACHE_DIR": str(workdir / "cache"),
+        "KEY_ALIAS": "gloven-key",
+        "KEY_PASSWORD": "key-secret",
+        "STORE_PASSWORD": "store-secret",
+        "KEYSTORE_PATH": str(workdir / "keystore.jks"),
+    })
+    return subprocess.run(
+        [sys.executable, str(BUILD_FLEET), *args, "--workers", "2", "--no-live", "--memory-budget", "64G"],
+        cwd=workdir, env=env, capture_output=True, text=True
+    )
+
+def builds(workdir):
+    """Apps `flutter build` ran in, in call order"""
+    calls = [json.loads(line) for line in (workdir / "calls.jsonl").read_text().splitlines()]
+    return [call[0] for call in calls if call[1:3] == ["build", "appbundle"]]
+
+def test_builds_signs_and_collects_bundles(workdir):
+    result = run_fleet(workdir, "all", "--no-cache")
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    for app in SEED_APPS:
+        assert (workdir / "signed_aabs" / f"{app}-release.aab").exists()
+        properties = (workdir / "apps" / app / "android" / "key.properties").read_text()
+        assert "storePassword=store-secret" in properties
+        assert f"storeFile={workdir / 'keystore.jks'}" in properties
+        gradle = (workdir / "apps" / app / "android" / "app" / "build.gradle.kts").read_text()
+        assert 'create("release")' in gradle
+    assert sorted(builds(workdir)) == list(SEED_APPS)
+    state = json.loads((workdir / ".build_fleet_state.json").read_text())
+    assert {app: entry["status"] for app, entry in state["apps"].items()} == {"app01": "ok", "app02": "ok"}
+
+def test_resume_retries_only_failed_apps(workdir):
+    result = run_fleet(workdir, "all", "--no-cache", fail=("app02",))
+    assert result.returncode == 1
+    assert "app02" in result.stdout and "--resume" in result.stdout
+    assert not (workdir / "signed_aabs" / "app02-release.aab").exists()
+
+    result = run_fleet(workdir, "all", "--no-cache", "--resume")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert builds(workdir).count("app01") == 1
+    assert builds(workdir).count("app02") == 2
+    assert (workdir / "signed_aabs" / "app02-release.aab").exists()
+
+def test_unchanged_apps_restore_from_cache(workdir):
+    assert run_fleet(workdir, "app01").returncode == 0
+    (workdir / "signed_aabs" / "app01-release.aab").unlink()
+
+    result = run_fleet(workdir, "app01")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "1 restored" in result.stdout
+    assert builds(workdir) == ["app01"]
+    assert (workdir / "signed_aabs" / "app01-release.aab").exists()
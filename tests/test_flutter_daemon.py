@@ -0,0 +1,73 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import flutter_daemon
+
+FAKE_DAEMON = Path(__file__).resolve().parent.parent / "scripts" / "fake_flutter_daemon.py"
+
+@pytest.fixture
+def daemon():
+    with flutter_daemon.FlutterDaemon([sys.executable, str(FAKE_DAEMON), "--delay", "0.01"]) as session:
+        yield session
+
+@pytest.fixture
+def projects(tmp_path):
+    """app1 .. app12, each with a different subset of platform directories"""
+    apps = []
+    for num in range(1, 13):
+        app = tmp_path / f"app{num}"
+        for platform in ("android", "ios", "web")[:num % 3 + 1]:
+            (app / platform).mkdir(parents=True)
+        apps.append(app)
+    return apps
+
+def test_connects_and_answers_calls(daemon):
+    assert daemon.protocol_version == "0.6.1"
+    assert daemon.call("daemon.version") == "0.6.1"
+    assert daemon.call("device.getDevices")[0]["id"] == "fake-device"
+    with pytest.raises(flutter_daemon.DaemonError):
+        daemon.call("daemon.nonexistent")
+
+def test_run_batch_bounds_requests_and_matches_replies(daemon, projects):
+    params = [{"projectRoot": str(app)} for app in projects]
+    results = list(daemon.run_batch("daemon.getSupportedPlatforms", params, max_in_flight=4))
+
+    assert len(results) == len(projects)
+    assert [r[0] for r in results] != params  # replies arrived out of order
+    for request, result, error in results:
+        num = int(Path(request["projectRoot"]).name[3:])
+        assert error is None
+        assert result["platforms"] == sorted(("android", "ios", "web")[:num % 3 + 1])
+    stats = daemon.call("fake.stats")
+    assert stats["max_outstanding"] == 4
+
+def test_events_are_multiplexed_to_subscribers(daemon, projects):
+    seen = []
+    lock = threading.Lock()
+
+    def record(event, params):
+        with lock:
+            seen.append((event, params.get("projectRoot")))
+
+    unsubscribe = daemon.subscribe(record)
+    list(daemon.run_batch("daemon.getSupportedPlatforms", [{"projectRoot": str(a)} for a in projects]))
+    unsubscribe()
+
+    assert sorted(root for event, root in seen if event == "app.progress") == sorted(map(str, projects))
+
+def test_supported_platforms_in_app_number_order(daemon, projects, tmp_path):
+    missing = tmp_path / "app13"
+    platforms = flutter_daemon.supported_platforms(daemon, projects + [missing])
+
+    assert list(platforms) == [f"app{num}" for num in range(1, 14)]
+    assert platforms["app3"] == ["android"]
+    assert isinstance(platforms["app13"], flutter_daemon.DaemonError)
+
+def test_pending_requests_fail_when_the_daemon_exits(daemon):
+    daemon.process.kill()
+    daemon.process.wait()
+    with pytest.raises(flutter_daemon.DaemonError):
+        daemon.call("daemon.version", timeout=5)
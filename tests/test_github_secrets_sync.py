@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import github_secrets_sync
+
+REPO = "owner/repo"
+KEY_ID = "key-1"
+
+class FakeSecretsAPI(ThreadingHTTPServer):
+    """Stand-in for the GitHub Actions secrets endpoints of one repository"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeSecretsHandler)
+        self.secrets = {}
+        self.puts = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+class FakeSecretsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        path = self.path.split("?")[0]
+        if path == f"/repos/{REPO}/actions/secrets/public-key":
+            self._reply(200, {"key_id": KEY_ID, "key": "unused"})
+        elif path == f"/repos/{REPO}/actions/secrets":
+            names = sorted(self.server.secrets)
+            self._reply(200, {"total_count": len(names), "secrets": [{"name": n} for n in names]})
+        else:
+            self._reply(404)
+
+    def do_PUT(self):
+        self.server.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        name = self.path.rsplit("/", 1)[-1]
+        with self.server.lock:
+            created = name not in self.server.secrets
+            self.server.secrets[name] = body["encrypted_value"]
+            self.server.puts += 1
+        self._reply(201 if created else 204)
+
+@pytest.fixture
+def api(monkeypatch):
+    # The stand-in has no real key; values are "encrypted" as themselves
+    monkeypatch.setattr(github_secrets_sync, "encrypt_all", lambda key, secrets: dict(secrets))
+    server = FakeSecretsAPI()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def sync(api, secrets, state_path):
+    client = github_secrets_sync.SecretsClient(REPO, "token", api_url=api.url)
+    try:
+        return github_secrets_sync.sync_secrets(client, secrets, state_path)
+    finally:
+        client.close()
+
+def test_sync_reuses_connections_and_skips_unchanged(api, tmp_path):
+    state = tmp_path / "state.json"
+    secrets = {f"SECRET_{i}": f"value-{i}" for i in range(10)}
+
+    assert set(sync(api, secrets, state).values()) == {"set"}
+    assert api.puts == 10
+    assert api.secrets == secrets
+    # Public key, list and PUTs share one keep-alive connection per worker
+    assert len(api.connections) <= github_secrets_sync.MAX_WORKERS + 1
+
+    assert set(sync(api, secrets, state).values()) == {"unchanged"}
+    assert api.puts == 10
+
+def test_sync_uploads_changed_and_missing_secrets(api, tmp_path):
+    state = tmp_path / "state.json"
+    sync(api, {"A": "1", "B": "2"}, state)
+    del api.secrets["B"]
+
+    assert sync(api, {"A": "changed", "B": "2"}, state) == {"A": "set", "B": "set"}
+    assert api.secrets == {"A": "changed", "B": "2"}
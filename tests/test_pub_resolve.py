@@ -0,0 +1,12 @@
+import pub_resolve
+
+def fake_app(name, group="g1", lock=None):
+    return {"app": name, "dir": None, "package": name, "sections": {"dependencies": {"flutter": {"sdk": "flutter"}}},
+            "group": group, "lock": lock, "duplicate_keys": []}
+
+def test_groups_and_drift_in_app_number_order():
+    apps = [fake_app(f"app{n:02d}") for n in (100, 11, 2, 10, 99)]
+    groups = pub_resolve.group_apps(apps)
+    assert [a["app"] for a in groups["g1"]] == ["app02", "app10", "app11", "app99", "app100"]
+    drift = pub_resolve.find_drift(groups)
+    assert [f["app"] for f in drift] == ["app02", "app10", "app11", "app99", "app100"]
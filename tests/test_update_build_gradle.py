@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import gradle_kts
+import update_build_gradle
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+PACKAGE = "org.gloven.app02"
+
+FLUTTER_DEFAULT = '''plugins {
+    id("com.android.application")
+}
+
+android {
+    namespace = "com.example.app02"
+
+    defaultConfig {
+        applicationId = "com.example.app02"
+    }
+
+    buildTypes {
+        release {
+            signingConfig = signingConfigs.getByName("debug")
+        }
+    }
+}
+'''
+
+def release_signing(content):
+    """Names of the blocks inside android { signingConfigs { ... } }"""
+    android = gradle_kts.parse(content).find("android")
+    return [block.name for signing in android.blocks("signingConfigs") for block in signing.blocks()]
+
+def patch(content):
+    new_content, changed = update_build_gradle.patch_build_gradle(content, PACKAGE)
+    again, changed_again = update_build_gradle.patch_build_gradle(new_content, PACKAGE)
+    assert (again, changed_again) == (new_content, False)
+    return new_content, changed
+
+def test_patches_flutter_default_build_file():
+    content, changed = patch(FLUTTER_DEFAULT)
+    assert changed
+    assert f'applicationId = "{PACKAGE}"' in content
+    assert release_signing(content) == ['create("release")']
+    assert 'signingConfig = signingConfigs.getByName("release")' in content
+    assert "import java.util.Properties" in content
+
+def test_rewrites_release_lookup_to_create():
+    # AGP predefines no "release" config, so getByName("release") fails the build
+    content, changed = patch((REPO_DIR / "apps" / "app02" / "android" / "app" / "build.gradle.kts").read_text())
+    assert changed
+    assert release_signing(content) == ['create("release")']
+    assert 'getByName("release") {' not in content
+    assert content.count("signingConfigs {") == 1
+
+def test_adds_release_next_to_other_signing_configs():
+    source = FLUTTER_DEFAULT.replace("    buildTypes {", '''    signingConfigs {
+        getByName("debug") {
+            storeFile = file("debug.keystore")
+        }
+    }
+
+    buildTypes {''')
+    content, _ = patch(source)
+    assert release_signing(content) == ['getByName("debug")', 'create("release")']
+
+def test_leaves_patched_file_untouched():
+    content, _ = patch(FLUTTER_DEFAULT)
+    assert update_build_gradle.patch_build_gradle(content, PACKAGE) == (content, False)